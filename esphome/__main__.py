@@ -29,6 +29,7 @@ from esphome.const import (
     CONF_ESPHOME,
     CONF_PLATFORMIO_OPTIONS,
     CONF_SUBSTITUTIONS,
+    ENV_PLATFORMIO_LOCK,
     PLATFORM_BK72XX,
     PLATFORM_RTL87XX,
     PLATFORM_ESP32,
@@ -37,7 +38,7 @@ from esphome.const import (
     SECRETS_FILES,
 )
 from esphome.core import CORE, EsphomeError, coroutine
-from esphome.helpers import indent, is_ip_address
+from esphome.helpers import get_int_env, indent, is_ip_address
 from esphome.util import (
     run_external_command,
     run_external_process,
@@ -49,6 +50,10 @@ from esphome.log import color, setup_log, Fore
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of lines of the config comment of each component in main.cpp,
+# 0 leaves the comments out and negative values do not limit them
+ENV_CONFIG_COMMENT_LINES = "ESPHOME_CONFIG_COMMENT_LINES"
+
 
 def choose_prompt(options, purpose: str = None):
     if not options:
@@ -169,18 +174,28 @@ def run_miniterm(config, port):
     return 0
 
 
+def config_comment(conf, max_lines=-1):
+    """Return the comment with the config of a component for main.cpp."""
+    conf_str = yaml_util.dump(conf)
+    if max_lines >= 0:
+        lines = conf_str.splitlines(keepends=True)
+        if len(lines) > max_lines:
+            conf_str = "".join(lines[:max_lines])
+            conf_str += f"... ({len(lines) - max_lines} more lines)\n"
+    conf_str = conf_str.replace("//", "")
+    # remove tailing \ to avoid multi-line comment warning
+    return conf_str.replace("\\\n", "\n")
+
+
 def wrap_to_code(name, comp):
     coro = coroutine(comp.to_code)
+    max_lines = get_int_env(ENV_CONFIG_COMMENT_LINES, -1)
 
     @functools.wraps(comp.to_code)
     async def wrapped(conf):
         cg.add(cg.LineComment(f"{name}:"))
-        if comp.config_schema is not None:
-            conf_str = yaml_util.dump(conf)
-            conf_str = conf_str.replace("//", "")
-            # remove tailing \ to avoid multi-line comment warning
-            conf_str = conf_str.replace("\\\n", "\n")
-            cg.add(cg.LineComment(indent(conf_str)))
+        if comp.config_schema is not None and max_lines != 0:
+            cg.add(cg.LineComment(indent(config_comment(conf, max_lines))))
         await coro(conf)
 
     if hasattr(coro, "priority"):
@@ -207,8 +222,7 @@ def generate_cpp_contents(config):
 def write_cpp_file():
     writer.write_platformio_project()
 
-    code_s = indent(CORE.cpp_main_section)
-    writer.write_cpp(code_s)
+    writer.write_cpp()
     return 0
 
 
@@ -352,6 +366,13 @@ def show_logs(config, args, port):
             port = mqtt.get_esphome_device_ip(
                 config, args.username, args.password, args.client_id
             )
+        elif not is_ip_address(port):
+            from esphome.resolver import get_resolver
+
+            # Skip the lookup when the address was resolved for the upload
+            cached = get_resolver().get_cached(port)
+            if cached is not None and not isinstance(cached, Exception):
+                port = cached[0]
 
         from esphome.components.api.client import run_logs
 
@@ -518,12 +539,58 @@ def command_dashboard(args):
     return dashboard.start_dashboard(args)
 
 
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(round(seconds), 60)
+    if minutes:
+        return f"{minutes}m{seconds:02d}s"
+    return f"{seconds}s"
+
+
+def _run_logged_process(log_file, *cmd) -> int:
+    import subprocess
+
+    log_file.write(f"$ {' '.join(cmd)}\n")
+    log_file.flush()
+    try:
+        proc = subprocess.run(
+            cmd, stdout=log_file, stderr=subprocess.STDOUT, check=False
+        )
+    except OSError as err:
+        log_file.write(f"Running command failed: {err}\n")
+        return 1
+    return proc.returncode
+
+
 def command_update_all(args):
+    from concurrent.futures import ThreadPoolExecutor
+    import threading
+
     import click
 
+    from esphome.core import get_data_dir
+    from esphome.resolver import CACHE_FILE, Resolver
+    from esphome.storage_json import StorageJSON, ext_storage_path
+
     success = {}
+    durations = {}
     files = list_yaml_files(args.configuration)
     twidth = 60
+    parallel = args.jobs > 1 or args.upload_jobs > 1
+    log_dir = args.log_dir
+    if parallel and log_dir is None:
+        # The output of parallel updates would be interleaved, keep it per device
+        log_dir = os.path.join(args.configuration[0], ".esphome", "update-all")
+    print_lock = threading.Lock()
+    # The upload commands use the addresses resolved here from the data
+    # directory of their configuration
+    data_dirs = {f: get_data_dir(os.path.dirname(f)) for f in files}
+    resolvers = {}
+    for data_dir in data_dirs.values():
+        if data_dir not in resolvers:
+            resolvers[data_dir] = Resolver(os.path.join(data_dir, CACHE_FILE))
+            resolvers[data_dir].load()
+    addresses = {}
+    not_uploaded = set(files)
 
     def print_bar(middle_text):
         middle_text = f" {middle_text} "
@@ -531,31 +598,123 @@ def command_update_all(args):
         half_line = "=" * ((twidth - width) // 2)
         click.echo(f"{half_line}{middle_text}{half_line}")
 
+    def run_step(f, step, *args_):
+        cmd = ("esphome", "--dashboard", step, f, *args_)
+        start = time.monotonic()
+        if log_dir is None:
+            rc = run_external_process(*cmd)
+        else:
+            log_path = os.path.join(log_dir, log_names[f])
+            with open(
+                log_path, "a" if step == "upload" else "w", encoding="utf-8"
+            ) as log_file:
+                rc = _run_logged_process(log_file, *cmd)
+        durations[f][step] = time.monotonic() - start
+        return rc == 0
+
+    def resolve_addresses():
+        """Resolve the devices left to upload in one batch when they expired."""
+        with print_lock:
+            remaining = list(not_uploaded)
+        for f in remaining:
+            if f in addresses:
+                continue
+            storage = StorageJSON.load(
+                ext_storage_path(os.path.basename(f), data_dirs[f])
+            )
+            if storage is not None and storage.address:
+                addresses[f] = storage.address
+        for data_dir, resolver in resolvers.items():
+            hosts = [
+                addresses[f]
+                for f in remaining
+                if f in addresses
+                and data_dirs[f] == data_dir
+                and not is_ip_address(addresses[f])
+            ]
+            if hosts:
+                resolver.resolve_many(hosts)
+                resolver.save()
+
+    def finish(f, result):
+        success[f] = result
+        with print_lock:
+            not_uploaded.discard(f)
+            if result:
+                print_bar(f"[{color(Fore.BOLD_GREEN, 'SUCCESS')}] {f}")
+            else:
+                print_bar(f"[{color(Fore.BOLD_RED, 'ERROR')}] {f}")
+
+    def upload(f):
+        resolve_addresses()
+        finish(f, run_step(f, "upload", "--device", "OTA"))
+
+    # Devices from different configuration dirs may have the same file name
+    log_names = {}
+    used_log_names = set()
     for f in files:
-        print(f"Updating {color(Fore.CYAN, f)}")
-        print("-" * twidth)
-        print()
-        rc = run_external_process(
-            "esphome", "--dashboard", "run", f, "--no-logs", "--device", "OTA"
+        durations[f] = {}
+        stem = os.path.splitext(os.path.basename(f))[0]
+        name = f"{stem}.log"
+        index = 1
+        while name in used_log_names:
+            index += 1
+            name = f"{stem}-{index}.log"
+        log_names[f] = name
+        used_log_names.add(name)
+    if log_dir is not None:
+        os.makedirs(log_dir, exist_ok=True)
+
+    if not parallel:
+        for f in files:
+            print(f"Updating {color(Fore.CYAN, f)}")
+            print("-" * twidth)
+            print()
+            # One process loads and validates the config only once
+            resolve_addresses()
+            finish(f, run_step(f, "run", "--no-logs", "--device", "OTA"))
+
+            print()
+            print()
+            print()
+    else:
+        print(
+            f"Updating {len(files)} devices with {args.jobs} compile and "
+            f"{args.upload_jobs} upload workers, logs are in {log_dir}"
         )
-        if rc == 0:
-            print_bar(f"[{color(Fore.BOLD_GREEN, 'SUCCESS')}] {f}")
-            success[f] = True
-        else:
-            print_bar(f"[{color(Fore.BOLD_RED, 'ERROR')}] {f}")
-            success[f] = False
-
-        print()
-        print()
+        # Parallel builds must not install PlatformIO packages at the same time
+        os.environ[ENV_PLATFORMIO_LOCK] = os.path.join(log_dir, "platformio.lock")
+        # Uploads are queued as soon as a device has been compiled
+        upload_pool = ThreadPoolExecutor(args.upload_jobs)
+        uploads = []
+
+        def compile_(f):
+            if run_step(f, "compile"):
+                uploads.append((f, upload_pool.submit(upload, f)))
+            else:
+                finish(f, False)
+
+        with ThreadPoolExecutor(args.jobs) as compile_pool:
+            compiles = [(f, compile_pool.submit(compile_, f)) for f in files]
+        upload_pool.shutdown()
+        # An error running a step, like opening its log, fails the device
+        for f, future in compiles + uploads:
+            if (err := future.exception()) is not None:
+                _LOGGER.error("Updating %s failed: %s", f, err)
+                finish(f, False)
         print()
 
     print_bar(f"[{color(Fore.BOLD_WHITE, 'SUMMARY')}]")
     failed = 0
     for f in files:
-        if success[f]:
-            print(f"  - {f}: {color(Fore.GREEN, 'SUCCESS')}")
+        timings = ", ".join(
+            f"{step} {_format_duration(duration)}"
+            for step, duration in durations[f].items()
+        )
+        if success.get(f, False):
+            print(f"  - {f}: {color(Fore.GREEN, 'SUCCESS')} ({timings})")
         else:
-            print(f"  - {f}: {color(Fore.BOLD_RED, 'FAILED')}")
+            print(f"  - {f}: {color(Fore.BOLD_RED, 'FAILED')} ({timings})")
             failed += 1
     return failed
 
@@ -879,6 +1038,24 @@ def parse_args(argv):
     parser_update.add_argument(
         "configuration", help="Your YAML configuration file directories.", nargs="+"
     )
+    parser_update.add_argument(
+        "--jobs",
+        "-j",
+        help="Number of devices to compile in parallel.",
+        type=int,
+        default=1,
+    )
+    parser_update.add_argument(
+        "--upload-jobs",
+        help="Number of devices to upload to in parallel.",
+        type=int,
+        default=1,
+    )
+    parser_update.add_argument(
+        "--log-dir",
+        help="Write the output of each device to a log file in this directory. "
+        "Defaults to .esphome/update-all when updating in parallel.",
+    )
 
     parser_idedata = subparsers.add_parser("idedata")
     parser_idedata.add_argument(
@@ -0,0 +1,121 @@
+"""Content addressed on-disk cache for rasterized assets.
+
+Decoding, resizing and encoding images, animations and fonts is expensive,
+but the result only depends on the source file and a few options. Encoded
+payloads are stored under the data dir, keyed by a hash over the source file
+contents, the options and the versions of ESPHome and Pillow. The least
+recently used entries are evicted once the cache exceeds its size limit.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from esphome.const import __version__
+from esphome.core import CORE
+from esphome.helpers import get_int_env, write_file
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_DIR = "asset_cache"
+CACHE_FILE_SUFFIX = ".bin"
+
+# Maximum size of the cache in MiB, 0 disables it
+ENV_ASSET_CACHE_SIZE = "ESPHOME_ASSET_CACHE_SIZE"
+DEFAULT_MAX_SIZE_MIB = 256
+
+
+def _max_size() -> int:
+    return get_int_env(ENV_ASSET_CACHE_SIZE, DEFAULT_MAX_SIZE_MIB) * 1024 * 1024
+
+
+def _cache_dir() -> Path:
+    return Path(CORE.data_dir) / CACHE_DIR
+
+
+def _cache_path(key: str) -> Path:
+    return _cache_dir() / f"{key}{CACHE_FILE_SUFFIX}"
+
+
+def _pillow_version() -> Optional[str]:
+    try:
+        from PIL import __version__ as pillow_version
+    except ImportError:
+        return None
+    return pillow_version
+
+
+def compute_key(domain: str, source: bytes, options: dict[str, Any]) -> str:
+    """Compute the cache key for an asset.
+
+    :param domain: The component the asset belongs to.
+    :param source: The contents of the source file.
+    :param options: All options that influence the encoded result.
+    """
+    header = {
+        "domain": domain,
+        "esphome": __version__,
+        "pillow": _pillow_version(),
+        "options": options,
+    }
+    h = hashlib.sha256()
+    h.update(json.dumps(header, sort_keys=True, default=str).encode())
+    h.update(hashlib.sha256(source).digest())
+    return h.hexdigest()
+
+
+def load(key: str) -> Optional[tuple[bytes, dict[str, Any]]]:
+    """Return the cached payload and metadata for the key, if present."""
+    if _max_size() <= 0:
+        return None
+    path = _cache_path(key)
+    try:
+        with open(path, "rb") as f_handle:
+            metadata = json.loads(f_handle.readline())
+            data = f_handle.read()
+        # Mark as recently used
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        _LOGGER.debug("Ignoring unreadable asset cache entry %s: %s", path, err)
+        return None
+    _LOGGER.debug("Using cached asset %s", key)
+    return data, metadata
+
+
+def store(key: str, data: bytes, metadata: dict[str, Any]) -> None:
+    """Store an encoded payload with its metadata and evict old entries if needed."""
+    max_size = _max_size()
+    if max_size <= 0:
+        return
+    header = json.dumps(metadata).encode() + b"\n"
+    write_file(_cache_path(key), header + bytes(data))
+    evict(max_size)
+
+
+def evict(max_size: int) -> None:
+    """Remove the least recently used entries until the cache fits in max_size bytes."""
+    entries = []
+    total = 0
+    for path in _cache_dir().glob(f"*{CACHE_FILE_SUFFIX}"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_size:
+            break
+        _LOGGER.debug("Evicting cached asset %s", path.name)
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
@@ -1,9 +1,12 @@
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import logging
 
-from esphome import automation, core
+from esphome import asset_cache, automation, core
 from esphome.components import font
 import esphome.components.image as espImage
 from esphome.components.image import CONF_USE_TRANSPARENCY
+from esphome.components.image.encoding import encode_frame
 import esphome.config_validation as cv
 import esphome.codegen as cg
 from esphome.const import (
@@ -14,7 +17,8 @@ from esphome.const import (
     CONF_RESIZE,
     CONF_TYPE,
 )
-from esphome.core import CORE, HexInt
+from esphome.core import CORE
+from esphome.helpers import get_int_env
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,11 +27,16 @@ CODEOWNERS = ["@syndlex"]
 DEPENDENCIES = ["display"]
 MULTI_CONF = True
 
+DOMAIN = "animation"
+
 CONF_LOOP = "loop"
 CONF_START_FRAME = "start_frame"
 CONF_END_FRAME = "end_frame"
 CONF_FRAME = "frame"
 
+# Number of processes used to encode the frames of an animation
+ENV_ANIMATION_WORKERS = "ESPHOME_ANIMATION_WORKERS"
+
 animation_ns = cg.esphome_ns.namespace("animation")
 
 Animation_ = animation_ns.class_("Animation", espImage.Image_)
@@ -121,10 +130,40 @@ async def animation_action_to_code(config, action_id, template_arg, args):
     return var
 
 
-async def to_code(config):
+def _encode_frames(path, image_type, transparent, size, resize, start, stop) -> bytes:
+    """Encode the frames start..stop of an animation file, runs in worker processes."""
+    from PIL import Image
+
+    image = Image.open(path)
+    data = []
+    for frame_index in range(start, stop):
+        image.seek(frame_index)
+        if resize is None and image.size != size:
+            raise core.EsphomeError(
+                f"Unexpected number of pixels in {path} frame {frame_index}: "
+                f"({image.size[0] * image.size[1]} != {size[0] * size[1]})"
+            )
+        data.append(encode_frame(image, image_type, transparent, resize))
+    return b"".join(data)
+
+
+def _encode_animation(path, frames, image_type, transparent, size, resize) -> bytes:
+    encode = functools.partial(
+        _encode_frames, path, image_type, transparent, size, resize
+    )
+    workers = min(get_int_env(ENV_ANIMATION_WORKERS, 1), frames)
+    if workers <= 1:
+        return encode(0, frames)
+
+    # Split the frames in contiguous ranges, each worker only has to open the file once
+    bounds = [frames * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(workers) as executor:
+        return b"".join(executor.map(encode, bounds[:-1], bounds[1:]))
+
+
+def _load_animation(config, path):
     from PIL import Image
 
-    path = CORE.relative_config_path(config[CONF_FILE])
     try:
         image = Image.open(path)
     except Exception as e:
@@ -136,150 +175,54 @@ async def to_code(config):
         new_width_max, new_height_max = config[CONF_RESIZE]
         ratio = min(new_width_max / width, new_height_max / height)
         width, height = int(width * ratio), int(height * ratio)
-    else:
-        if width > 500 or height > 500:
-            _LOGGER.warning(
-                'The image "%s" you requested is very big. Please consider'
-                " using the resize parameter.",
-                path,
-            )
 
-    transparent = config[CONF_USE_TRANSPARENCY]
+    data = _encode_animation(
+        path,
+        frames,
+        config[CONF_TYPE],
+        config[CONF_USE_TRANSPARENCY],
+        (width, height),
+        (width, height) if CONF_RESIZE in config else None,
+    )
+    return data, width, height, frames
 
-    if config[CONF_TYPE] == "GRAYSCALE":
-        data = [0 for _ in range(height * width * frames)]
-        pos = 0
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            frame = image.convert("LA", dither=Image.Dither.NONE)
-            if CONF_RESIZE in config:
-                frame = frame.resize([width, height])
-            pixels = list(frame.getdata())
-            if len(pixels) != height * width:
-                raise core.EsphomeError(
-                    f"Unexpected number of pixels in {path} frame {frameIndex}: ({len(pixels)} != {height*width})"
-                )
-            for pix, a in pixels:
-                if transparent:
-                    if pix == 1:
-                        pix = 0
-                    if a < 0x80:
-                        pix = 1
-
-                data[pos] = pix
-                pos += 1
-
-    elif config[CONF_TYPE] == "RGBA":
-        data = [0 for _ in range(height * width * 4 * frames)]
-        pos = 0
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            frame = image.convert("RGBA")
-            if CONF_RESIZE in config:
-                frame = frame.resize([width, height])
-            pixels = list(frame.getdata())
-            if len(pixels) != height * width:
-                raise core.EsphomeError(
-                    f"Unexpected number of pixels in {path} frame {frameIndex}: ({len(pixels)} != {height*width})"
-                )
-            for pix in pixels:
-                data[pos] = pix[0]
-                pos += 1
-                data[pos] = pix[1]
-                pos += 1
-                data[pos] = pix[2]
-                pos += 1
-                data[pos] = pix[3]
-                pos += 1
-
-    elif config[CONF_TYPE] == "RGB24":
-        data = [0 for _ in range(height * width * 3 * frames)]
-        pos = 0
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            frame = image.convert("RGBA")
-            if CONF_RESIZE in config:
-                frame = frame.resize([width, height])
-            pixels = list(frame.getdata())
-            if len(pixels) != height * width:
-                raise core.EsphomeError(
-                    f"Unexpected number of pixels in {path} frame {frameIndex}: ({len(pixels)} != {height*width})"
-                )
-            for r, g, b, a in pixels:
-                if transparent:
-                    if r == 0 and g == 0 and b == 1:
-                        b = 0
-                    if a < 0x80:
-                        r = 0
-                        g = 0
-                        b = 1
-
-                data[pos] = r
-                pos += 1
-                data[pos] = g
-                pos += 1
-                data[pos] = b
-                pos += 1
-
-    elif config[CONF_TYPE] in ["RGB565", "TRANSPARENT_IMAGE"]:
-        data = [0 for _ in range(height * width * 2 * frames)]
-        pos = 0
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            frame = image.convert("RGBA")
-            if CONF_RESIZE in config:
-                frame = frame.resize([width, height])
-            pixels = list(frame.getdata())
-            if len(pixels) != height * width:
-                raise core.EsphomeError(
-                    f"Unexpected number of pixels in {path} frame {frameIndex}: ({len(pixels)} != {height*width})"
-                )
-            for r, g, b, a in pixels:
-                R = r >> 3
-                G = g >> 2
-                B = b >> 3
-                rgb = (R << 11) | (G << 5) | B
-
-                if transparent:
-                    if rgb == 0x0020:
-                        rgb = 0
-                    if a < 0x80:
-                        rgb = 0x0020
-
-                data[pos] = rgb >> 8
-                pos += 1
-                data[pos] = rgb & 0xFF
-                pos += 1
-
-    elif config[CONF_TYPE] in ["BINARY", "TRANSPARENT_BINARY"]:
-        width8 = ((width + 7) // 8) * 8
-        data = [0 for _ in range((height * width8 // 8) * frames)]
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            if transparent:
-                alpha = image.split()[-1]
-                has_alpha = alpha.getextrema()[0] < 0xFF
-            frame = image.convert("1", dither=Image.Dither.NONE)
-            if CONF_RESIZE in config:
-                frame = frame.resize([width, height])
-                if transparent:
-                    alpha = alpha.resize([width, height])
-            for x, y in [(i, j) for i in range(width) for j in range(height)]:
-                if transparent and has_alpha:
-                    if not alpha.getpixel((x, y)):
-                        continue
-                elif frame.getpixel((x, y)):
-                    continue
-
-                pos = x + y * width8 + (height * width8 * frameIndex)
-                data[pos // 8] |= 0x80 >> (pos % 8)
+
+async def to_code(config):
+    path = CORE.relative_config_path(config[CONF_FILE])
+    try:
+        with open(path, "rb") as f:
+            file_contents = f.read()
+    except Exception as e:
+        raise core.EsphomeError(f"Could not load image file {path}: {e}")
+
+    transparent = config[CONF_USE_TRANSPARENCY]
+    cache_key = asset_cache.compute_key(
+        DOMAIN,
+        file_contents,
+        {
+            CONF_TYPE: config[CONF_TYPE],
+            CONF_RESIZE: config.get(CONF_RESIZE),
+            CONF_USE_TRANSPARENCY: transparent,
+        },
+    )
+    if (cached := asset_cache.load(cache_key)) is not None:
+        data, metadata = cached
+        width, height = metadata["width"], metadata["height"]
+        frames = metadata["frames"]
     else:
-        raise core.EsphomeError(
-            f"Animation f{config[CONF_ID]} has not supported type {config[CONF_TYPE]}."
+        data, width, height, frames = _load_animation(config, path)
+        asset_cache.store(
+            cache_key, data, {"width": width, "height": height, "frames": frames}
+        )
+
+    if CONF_RESIZE not in config and (width > 500 or height > 500):
+        _LOGGER.warning(
+            'The image "%s" you requested is very big. Please consider'
+            " using the resize parameter.",
+            path,
         )
 
-    rhs = [HexInt(x) for x in data]
-    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], rhs)
+    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], data)
     var = cg.new_Pvariable(
         config[CONF_ID],
         prog_arr,
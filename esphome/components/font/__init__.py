@@ -1,3 +1,4 @@
+from concurrent.futures import ProcessPoolExecutor
 import functools
 from pathlib import Path
 import hashlib
@@ -7,10 +8,10 @@ from packaging import version
 
 import requests
 
-from esphome import core
+from esphome import asset_cache, core
 import esphome.config_validation as cv
 import esphome.codegen as cg
-from esphome.helpers import copy_file_if_changed
+from esphome.helpers import copy_file_if_changed, get_int_env
 from esphome.const import (
     CONF_FAMILY,
     CONF_FILE,
@@ -22,13 +23,16 @@ from esphome.const import (
     CONF_PATH,
     CONF_WEIGHT,
 )
-from esphome.core import CORE, HexInt
+from esphome.core import CORE
 
 
 DOMAIN = "font"
 DEPENDENCIES = ["display"]
 MULTI_CONF = True
 
+# Number of processes used to render the glyphs of a TrueType font
+ENV_FONT_WORKERS = "ESPHOME_FONT_WORKERS"
+
 font_ns = cg.esphome_ns.namespace("font")
 
 Font = font_ns.class_("Font")
@@ -347,40 +351,110 @@ def load_ttf_font(path, size):
     return TrueTypeFontWrapper(font)
 
 
-async def to_code(config):
+def _pack_mask(mask) -> bytes:
+    """Pack a glyph mask with one bit per pixel, rows padded to a full byte.
+
+    A bit is set for every pixel of the mask that is not zero.
+    """
+    from PIL import Image
+
+    image = Image.Image()._new(mask)  # pylint: disable=protected-access
+    if image.mode != "L":
+        image = image.convert("L")
+    # Pillow packs "1" images MSB first with every row padded to a full byte
+    return image.point(lambda v: 255 if v else 0, "1").tobytes()
+
+
+def _render_glyph(font, glyph):
+    mask = font.getmask(glyph, mode="1")
+    offset_x, offset_y = font.getoffset(glyph)
+    width, height = mask.size
+    return _pack_mask(mask), offset_x, offset_y, width, height
+
+
+def _render_ttf_glyphs(path, size, glyphs):
+    """Render TrueType glyphs, runs in worker processes."""
+    font = load_ttf_font(path, size)
+    return [_render_glyph(font, glyph) for glyph in glyphs]
+
+
+def _render_glyphs(config, path):
+    """Render all glyphs and return the packed glyph data, per glyph offsets and metrics."""
     conf = config[CONF_FILE]
+    glyphs = config[CONF_GLYPHS]
     if conf[CONF_TYPE] == TYPE_LOCAL_BITMAP:
-        font = load_bitmap_font(CORE.relative_config_path(conf[CONF_PATH]))
-    elif conf[CONF_TYPE] == TYPE_LOCAL:
-        path = CORE.relative_config_path(conf[CONF_PATH])
+        font = load_bitmap_font(path)
+    else:
         font = load_ttf_font(path, config[CONF_SIZE])
+
+    ascent, descent = font.getmetrics(glyphs)
+
+    # Bitmap fonts are converted on load, only TrueType fonts are rendered in parallel
+    workers = min(get_int_env(ENV_FONT_WORKERS, 1), len(glyphs))
+    if workers <= 1 or conf[CONF_TYPE] == TYPE_LOCAL_BITMAP:
+        rendered = [_render_glyph(font, glyph) for glyph in glyphs]
+    else:
+        # Config values may carry YAML source info, which can't be pickled
+        glyphs = [str(glyph) for glyph in glyphs]
+        bounds = [len(glyphs) * i // workers for i in range(workers + 1)]
+        render = functools.partial(
+            _render_ttf_glyphs, str(path), int(config[CONF_SIZE])
+        )
+        with ProcessPoolExecutor(workers) as executor:
+            chunks = executor.map(
+                render, [glyphs[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+            )
+            rendered = [glyph for chunk in chunks for glyph in chunk]
+
+    glyph_args = []
+    data = []
+    offset = 0
+    for glyph_data, offset_x, offset_y, width, height in rendered:
+        glyph_args.append((offset, offset_x, offset_y, width, height))
+        data.append(glyph_data)
+        offset += len(glyph_data)
+
+    return b"".join(data), glyph_args, ascent, descent
+
+
+async def to_code(config):
+    conf = config[CONF_FILE]
+    if conf[CONF_TYPE] in (TYPE_LOCAL_BITMAP, TYPE_LOCAL):
+        path = CORE.relative_config_path(conf[CONF_PATH])
     elif conf[CONF_TYPE] == TYPE_GFONTS:
         path = _compute_gfonts_local_path(conf)
-        font = load_ttf_font(path, config[CONF_SIZE])
     else:
         raise core.EsphomeError(f"Could not load font: unknown type: {conf[CONF_TYPE]}")
 
-    ascent, descent = font.getmetrics(config[CONF_GLYPHS])
+    try:
+        with open(path, "rb") as f:
+            file_contents = f.read()
+    except OSError as e:
+        raise core.EsphomeError(f"Could not load font file {path}: {e}")
+
+    cache_key = asset_cache.compute_key(
+        DOMAIN,
+        file_contents,
+        {
+            CONF_TYPE: conf[CONF_TYPE],
+            CONF_SIZE: config[CONF_SIZE],
+            CONF_GLYPHS: config[CONF_GLYPHS],
+        },
+    )
+    if (cached := asset_cache.load(cache_key)) is not None:
+        data, metadata = cached
+        glyph_args = metadata["glyphs"]
+        ascent, descent = metadata["ascent"], metadata["descent"]
+    else:
+        data, glyph_args, ascent, descent = _render_glyphs(config, path)
+        asset_cache.store(
+            cache_key,
+            data,
+            {"glyphs": glyph_args, "ascent": ascent, "descent": descent},
+        )
+    glyph_args = dict(zip(config[CONF_GLYPHS], glyph_args))
 
-    glyph_args = {}
-    data = []
-    for glyph in config[CONF_GLYPHS]:
-        mask = font.getmask(glyph, mode="1")
-        offset_x, offset_y = font.getoffset(glyph)
-        width, height = mask.size
-        width8 = ((width + 7) // 8) * 8
-        glyph_data = [0] * (height * width8 // 8)
-        for y in range(height):
-            for x in range(width):
-                if not mask.getpixel((x, y)):
-                    continue
-                pos = x + y * width8
-                glyph_data[pos // 8] |= 0x80 >> (pos % 8)
-        glyph_args[glyph] = (len(data), offset_x, offset_y, width, height)
-        data += glyph_data
-
-    rhs = [HexInt(x) for x in data]
-    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], rhs)
+    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], data)
 
     glyph_initializer = []
     for glyph in config[CONF_GLYPHS]:
@@ -3,7 +3,7 @@ import esphome.config_validation as cv
 from esphome import core, pins
 from esphome.components import display, spi, font
 from esphome.components.display import validate_rotation
-from esphome.core import CORE, HexInt
+from esphome.core import CORE
 from esphome.const import (
     CONF_COLOR_PALETTE,
     CONF_DC_PIN,
@@ -200,9 +200,7 @@ async def to_code(config):
     rhs = None
     if config[CONF_COLOR_PALETTE] == "GRAYSCALE":
         cg.add(var.set_buffer_color_mode(ILI9XXXColorMode.BITS_8_INDEXED))
-        rhs = []
-        for x in range(256):
-            rhs.extend([HexInt(x), HexInt(x), HexInt(x)])
+        rhs = bytes(x for x in range(256) for _ in range(3))
     elif config[CONF_COLOR_PALETTE] == "IMAGE_ADAPTIVE":
         cg.add(var.set_buffer_color_mode(ILI9XXXColorMode.BITS_8_INDEXED))
         from PIL import Image
@@ -232,7 +230,7 @@ async def to_code(config):
         # converted.save("ref_out.png")
         palette = converted.getpalette()
         assert len(palette) == 256 * 3
-        rhs = palette
+        rhs = bytes(palette)
     else:
         cg.add(var.set_buffer_color_mode(ILI9XXXColorMode.BITS_16))
 
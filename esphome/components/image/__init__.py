@@ -11,7 +11,7 @@ from magic import Magic
 
 from PIL import Image
 
-from esphome import core
+from esphome import asset_cache, core
 from esphome.components import font
 from esphome import external_files
 import esphome.config_validation as cv
@@ -29,7 +29,9 @@ from esphome.const import (
     CONF_TYPE,
     CONF_URL,
 )
-from esphome.core import CORE, HexInt
+from esphome.core import CORE
+
+from . import encoding
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -285,6 +287,26 @@ def load_svg_image(file: bytes, resize: tuple[int, int]):
     return Image.open(io.BytesIO(svg_image))
 
 
+def _encode_image(config, file_contents, resize, transparent):
+    mime = Magic(mime=True)
+    file_type = mime.from_buffer(file_contents)
+
+    if "svg" in file_type:
+        image = load_svg_image(file_contents, resize)
+    else:
+        image = Image.open(io.BytesIO(file_contents))
+        if resize:
+            image.thumbnail(resize)
+
+    dither = (
+        Image.Dither.NONE
+        if config[CONF_DITHER] == "NONE"
+        else Image.Dither.FLOYDSTEINBERG
+    )
+    width, height = image.size
+    return encoding.encode(image, config[CONF_TYPE], transparent, dither), width, height
+
+
 async def to_code(config):
     conf_file = config[CONF_FILE]
 
@@ -303,18 +325,24 @@ async def to_code(config):
     except Exception as e:
         raise core.EsphomeError(f"Could not load image file {path}: {e}")
 
-    mime = Magic(mime=True)
-    file_type = mime.from_buffer(file_contents)
-
     resize = config.get(CONF_RESIZE)
-    if "svg" in file_type:
-        image = load_svg_image(file_contents, resize)
+    transparent = config[CONF_USE_TRANSPARENCY]
+    cache_key = asset_cache.compute_key(
+        DOMAIN,
+        file_contents,
+        {
+            CONF_TYPE: config[CONF_TYPE],
+            CONF_RESIZE: resize,
+            CONF_DITHER: config[CONF_DITHER],
+            CONF_USE_TRANSPARENCY: transparent,
+        },
+    )
+    if (cached := asset_cache.load(cache_key)) is not None:
+        data, metadata = cached
+        width, height = metadata["width"], metadata["height"]
     else:
-        image = Image.open(io.BytesIO(file_contents))
-        if resize:
-            image.thumbnail(resize)
-
-    width, height = image.size
+        data, width, height = _encode_image(config, file_contents, resize, transparent)
+        asset_cache.store(cache_key, data, {"width": width, "height": height})
 
     if CONF_RESIZE not in config and (width > 500 or height > 500):
         _LOGGER.warning(
@@ -323,111 +351,7 @@ async def to_code(config):
             path,
         )
 
-    transparent = config[CONF_USE_TRANSPARENCY]
-
-    dither = (
-        Image.Dither.NONE
-        if config[CONF_DITHER] == "NONE"
-        else Image.Dither.FLOYDSTEINBERG
-    )
-    if config[CONF_TYPE] == "GRAYSCALE":
-        image = image.convert("LA", dither=dither)
-        pixels = list(image.getdata())
-        data = [0 for _ in range(height * width)]
-        pos = 0
-        for g, a in pixels:
-            if transparent:
-                if g == 1:
-                    g = 0
-                if a < 0x80:
-                    g = 1
-
-            data[pos] = g
-            pos += 1
-
-    elif config[CONF_TYPE] == "RGBA":
-        image = image.convert("RGBA")
-        pixels = list(image.getdata())
-        data = [0 for _ in range(height * width * 4)]
-        pos = 0
-        for r, g, b, a in pixels:
-            data[pos] = r
-            pos += 1
-            data[pos] = g
-            pos += 1
-            data[pos] = b
-            pos += 1
-            data[pos] = a
-            pos += 1
-
-    elif config[CONF_TYPE] == "RGB24":
-        image = image.convert("RGBA")
-        pixels = list(image.getdata())
-        data = [0 for _ in range(height * width * 3)]
-        pos = 0
-        for r, g, b, a in pixels:
-            if transparent:
-                if r == 0 and g == 0 and b == 1:
-                    b = 0
-                if a < 0x80:
-                    r = 0
-                    g = 0
-                    b = 1
-
-            data[pos] = r
-            pos += 1
-            data[pos] = g
-            pos += 1
-            data[pos] = b
-            pos += 1
-
-    elif config[CONF_TYPE] in ["RGB565"]:
-        image = image.convert("RGBA")
-        pixels = list(image.getdata())
-        data = [0 for _ in range(height * width * 2)]
-        pos = 0
-        for r, g, b, a in pixels:
-            R = r >> 3
-            G = g >> 2
-            B = b >> 3
-            rgb = (R << 11) | (G << 5) | B
-
-            if transparent:
-                if rgb == 0x0020:
-                    rgb = 0
-                if a < 0x80:
-                    rgb = 0x0020
-
-            data[pos] = rgb >> 8
-            pos += 1
-            data[pos] = rgb & 0xFF
-            pos += 1
-
-    elif config[CONF_TYPE] in ["BINARY", "TRANSPARENT_BINARY"]:
-        if transparent:
-            alpha = image.split()[-1]
-            has_alpha = alpha.getextrema()[0] < 0xFF
-            _LOGGER.debug("%s Has alpha: %s", config[CONF_ID], has_alpha)
-        image = image.convert("1", dither=dither)
-        width8 = ((width + 7) // 8) * 8
-        data = [0 for _ in range(height * width8 // 8)]
-        for y in range(height):
-            for x in range(width):
-                if transparent and has_alpha:
-                    a = alpha.getpixel((x, y))
-                    if not a:
-                        continue
-                elif image.getpixel((x, y)):
-                    continue
-                pos = x + y * width8
-                data[pos // 8] |= 0x80 >> (pos % 8)
-    else:
-        raise core.EsphomeError(
-            f"Image f{config[CONF_ID]} has an unsupported type: {config[CONF_TYPE]}."
-        )
-
-    rhs = [HexInt(x) for x in data]
-    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], rhs)
+    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], data)
     var = cg.new_Pvariable(
         config[CONF_ID], prog_arr, width, height, IMAGE_TYPE[config[CONF_TYPE]]
     )
@@ -0,0 +1,169 @@
+"""Bulk pixel encoders for the image formats understood by the display code.
+
+All encoders work on whole Pillow bands (lookup tables, channel masks and
+``tobytes``) instead of looping over pixels in Python, and return the raw
+bytes that are stored in the generated PROGMEM array.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from PIL import Image, ImageChops
+
+# Value a transparent pixel is encoded with, per image type
+TRANSPARENT_GRAYSCALE = 1
+TRANSPARENT_RGB24 = (0, 0, 1)
+TRANSPARENT_RGB565 = 0x0020
+
+
+def _lut(func) -> list[int]:
+    return [func(v) for v in range(256)]
+
+
+_LUT_RGB565_R_HIGH = _lut(lambda v: v & 0xF8)
+_LUT_RGB565_G_HIGH = _lut(lambda v: v >> 5)
+_LUT_RGB565_G_LOW = _lut(lambda v: (v << 3) & 0xE0)
+_LUT_RGB565_B_LOW = _lut(lambda v: v >> 3)
+
+
+def _mask(band: Image.Image, predicate) -> Image.Image:
+    """Return a mode "1" image that is set where predicate is true for the band value."""
+    return band.point(_lut(lambda v: 255 if predicate(v) else 0), "1")
+
+
+def _mask_all(*masks: Image.Image) -> Image.Image:
+    result = masks[0]
+    for mask in masks[1:]:
+        result = ImageChops.logical_and(result, mask)
+    return result
+
+
+def encode_grayscale(image: Image.Image, transparent: bool) -> bytes:
+    """Encode an "LA" image with one byte per pixel."""
+    gray, alpha = image.split()
+    if transparent:
+        # Keep the transparency value reserved for transparent pixels
+        gray = gray.point(_lut(lambda g: 0 if g == TRANSPARENT_GRAYSCALE else g))
+        gray.paste(TRANSPARENT_GRAYSCALE, mask=_mask(alpha, lambda a: a < 0x80))
+    return gray.tobytes()
+
+
+def encode_rgba(image: Image.Image) -> bytes:
+    """Encode an "RGBA" image with four bytes per pixel."""
+    return image.tobytes()
+
+
+def encode_rgb24(image: Image.Image, transparent: bool) -> bytes:
+    """Encode an "RGBA" image with three bytes per pixel."""
+    red, green, blue, alpha = image.split()
+    rgb = Image.merge("RGB", (red, green, blue))
+    if transparent:
+        # Keep the transparency value reserved for transparent pixels
+        rgb.paste(
+            (0, 0, 0),
+            mask=_mask_all(
+                _mask(red, lambda v: v == TRANSPARENT_RGB24[0]),
+                _mask(green, lambda v: v == TRANSPARENT_RGB24[1]),
+                _mask(blue, lambda v: v == TRANSPARENT_RGB24[2]),
+            ),
+        )
+        rgb.paste(TRANSPARENT_RGB24, mask=_mask(alpha, lambda a: a < 0x80))
+    return rgb.tobytes()
+
+
+def encode_rgb565(image: Image.Image, transparent: bool) -> bytes:
+    """Encode an "RGBA" image with two bytes per pixel, big endian."""
+    red, green, blue, alpha = image.split()
+    # The bits of both parts never overlap, so adding them is the same as or-ing them
+    high = ImageChops.add(
+        red.point(_LUT_RGB565_R_HIGH), green.point(_LUT_RGB565_G_HIGH)
+    )
+    low = ImageChops.add(green.point(_LUT_RGB565_G_LOW), blue.point(_LUT_RGB565_B_LOW))
+    # An "LA" image is stored as interleaved pairs of bytes, which is the encoding we need
+    rgb565 = Image.merge("LA", (high, low))
+    if transparent:
+        transparent_value = (TRANSPARENT_RGB565 >> 8, TRANSPARENT_RGB565 & 0xFF)
+        # Keep the transparency value reserved for transparent pixels
+        rgb565.paste(
+            (0, 0),
+            mask=_mask_all(
+                _mask(high, lambda v: v == transparent_value[0]),
+                _mask(low, lambda v: v == transparent_value[1]),
+            ),
+        )
+        rgb565.paste(transparent_value, mask=_mask(alpha, lambda a: a < 0x80))
+    return rgb565.tobytes()
+
+
+def encode_binary(image: Image.Image, alpha: Optional[Image.Image] = None) -> bytes:
+    """Encode a "1" image with one bit per pixel, rows padded to a full byte.
+
+    A bit is set for every black pixel, or, if an alpha band is given, for every
+    pixel that is not fully transparent.
+    """
+    if alpha is not None:
+        if alpha.mode not in ("L", "P"):
+            alpha = alpha.convert("L")
+        return _mask(alpha, bool).tobytes()
+    # Pillow packs "1" images in the same order, but with a bit set for white pixels
+    return ImageChops.invert(image).tobytes()
+
+
+def binary_alpha(image: Image.Image) -> Optional[Image.Image]:
+    """Return the band used as transparency mask for binary images, if it is not fully opaque."""
+    alpha = image.split()[-1]
+    if alpha.getextrema()[0] < 0xFF:
+        return alpha
+    return None
+
+
+def _encode_converted(image: Image.Image, image_type: str, transparent: bool) -> bytes:
+    if image_type == "GRAYSCALE":
+        return encode_grayscale(image, transparent)
+    if image_type == "RGBA":
+        return encode_rgba(image)
+    if image_type == "RGB24":
+        return encode_rgb24(image, transparent)
+    return encode_rgb565(image, transparent)
+
+
+def _converted_mode(image_type: str) -> str:
+    if image_type not in ("GRAYSCALE", "RGBA", "RGB24", "RGB565"):
+        raise ValueError(f"Unsupported image type {image_type}")
+    return "LA" if image_type == "GRAYSCALE" else "RGBA"
+
+
+def encode(
+    image: Image.Image, image_type: str, transparent: bool, dither: Image.Dither
+) -> bytes:
+    """Convert an image to the given image type and encode it."""
+    if image_type in ("BINARY", "TRANSPARENT_BINARY"):
+        alpha = binary_alpha(image) if transparent else None
+        return encode_binary(image.convert("1", dither=dither), alpha)
+    image = image.convert(_converted_mode(image_type), dither=dither)
+    return _encode_converted(image, image_type, transparent)
+
+
+def encode_frame(
+    frame: Image.Image,
+    image_type: str,
+    transparent: bool,
+    resize: Optional[tuple[int, int]] = None,
+) -> bytes:
+    """Convert, resize and encode a single animation frame.
+
+    Unlike `encode`, frames are never dithered and are resized after they
+    have been converted to the image type.
+    """
+    if image_type in ("BINARY", "TRANSPARENT_BINARY"):
+        alpha = binary_alpha(frame) if transparent else None
+        frame = frame.convert("1", dither=Image.Dither.NONE)
+        if resize:
+            frame = frame.resize(resize)
+            if alpha is not None:
+                alpha = alpha.resize(resize)
+        return encode_binary(frame, alpha)
+    frame = frame.convert(_converted_mode(image_type), dither=Image.Dither.NONE)
+    if resize:
+        frame = frame.resize(resize)
+    return _encode_converted(frame, image_type, transparent)
@@ -105,6 +105,7 @@ async def to_code(config):
         )
         cg.add(RawExpression(f"if ({condition}) return"))
         CORE.data[CONF_OTA][KEY_PAST_SAFE_MODE] = True
+        CORE.event_loop.notify(KEY_PAST_SAFE_MODE)
 
     if CORE.is_esp32 and CORE.using_arduino:
         cg.add_library("Update", None)
@@ -26,7 +26,7 @@ from esphome.const import (
     CONF_MIN_BRIGHTNESS,
     CONF_MAX_BRIGHTNESS,
 )
-from esphome.core import HexInt, CORE
+from esphome.core import CORE
 
 DOMAIN = "shelly_dimmer"
 DEPENDENCIES = ["sensor", "uart", "esp8266"]
@@ -109,7 +109,7 @@ def get_firmware(value):
     else:  # no caching, download every time
         firmware_data, dl_hash = dl(url)
 
-    return [HexInt(x) for x in firmware_data]
+    return firmware_data
 
 
 def validate_firmware(value):
@@ -3,7 +3,7 @@ import logging
 import esphome.config_validation as cv
 from esphome import core
 from esphome.const import CONF_SUBSTITUTIONS, VALID_SUBSTITUTIONS_CHARACTERS
-from esphome.yaml_util import ESPHomeDataBase, make_data_base
+from esphome.yaml_util import get_document_range, make_data_base
 from esphome.config_helpers import merge_config
 
 CODEOWNERS = ["@esphome/core"]
@@ -37,44 +37,55 @@ async def to_code(config):
     pass
 
 
+def _path_list(path):
+    """Return the list of keys of a path built by _substitute_item()."""
+    keys = []
+    while path:
+        path, key = path
+        keys.append(key)
+    keys.reverse()
+    return keys
+
+
 def _expand_substitutions(substitutions, value, path, ignore_missing):
     if "$" not in value:
         return value
 
     orig_value = value
 
-    i = 0
-    while True:
-        m = cv.VARIABLE_PROG.search(value, i)
-        if not m:
-            # Nothing more to match. Done
-            break
-
-        i, j = m.span(0)
+    # The substituted values are not searched again
+    parts = []
+    end = 0
+    for m in cv.VARIABLE_PROG.finditer(orig_value):
         name = m.group(1)
         if name.startswith("{") and name.endswith("}"):
             name = name[1:-1]
         if name not in substitutions:
-            if not ignore_missing and "password" not in path:
-                _LOGGER.warning(
-                    "Found '%s' (see %s) which looks like a substitution, but '%s' was "
-                    "not declared",
-                    orig_value,
-                    "->".join(str(x) for x in path),
-                    name,
-                )
-            i = j
+            if not ignore_missing:
+                # The path is only needed for the warning
+                keys = _path_list(path)
+                if "password" not in keys:
+                    _LOGGER.warning(
+                        "Found '%s' (see %s) which looks like a substitution, but '%s' was "
+                        "not declared",
+                        orig_value,
+                        "->".join(str(x) for x in keys),
+                        name,
+                    )
             continue
 
-        sub = substitutions[name]
-        tail = value[j:]
-        value = value[:i] + sub
-        i = len(value)
-        value += tail
+        i, j = m.span(0)
+        parts.append(orig_value[end:i])
+        parts.append(substitutions[name])
+        end = j
+
+    if parts:
+        parts.append(orig_value[end:])
+        value = "".join(parts)
 
     # orig_value can also already be a lambda with esp_range info, and only
     # a plain string is sent in orig_value
-    if isinstance(orig_value, ESPHomeDataBase):
+    if get_document_range(orig_value) is not None:
         # even though string can get larger or smaller, the range should point
         # to original document marks
         return make_data_base(value, orig_value)
@@ -82,40 +93,81 @@ def _expand_substitutions(substitutions, value, path, ignore_missing):
     return value
 
 
-def _substitute_item(substitutions, item, path, ignore_missing):
+def _expand_passes(passes, value, path, ignore_missing):
+    for substitutions in passes:
+        value = _expand_substitutions(substitutions, value, path, ignore_missing)
+    return value
+
+
+def _replace_keys(item, replace_keys):
+    for old, new in replace_keys:
+        item[new] = merge_config(item.get(old), item.get(new))
+        del item[old]
+
+
+def _substitute_item(passes, item, path, ignore_missing):
+    """Substitute a config item with the substitutions of all passes.
+
+    Each string gets the substitutions of one pass after the other, which
+    gives the same result as traversing the config once for each pass. The
+    path is a chain of (parent, key) tuples, only turned into a list for a
+    warning. Strings without a $ are skipped without a call.
+    """
     if isinstance(item, list):
         for i, it in enumerate(item):
-            sub = _substitute_item(substitutions, it, path + [i], ignore_missing)
-            if sub is not None:
-                item[i] = sub
+            if isinstance(it, str):
+                if "$" in it:
+                    sub = _expand_passes(passes, it, (path, i), ignore_missing)
+                    if sub != it:
+                        item[i] = sub
+            elif isinstance(it, (dict, list, core.Lambda)):
+                sub = _substitute_item(passes, it, (path, i), ignore_missing)
+                if sub is not None:
+                    item[i] = sub
     elif isinstance(item, dict):
         replace_keys = []
+        substituted_keys = False
         for k, v in item.items():
-            if path or k != CONF_SUBSTITUTIONS:
-                sub = _substitute_item(substitutions, k, path + [k], ignore_missing)
-                if sub is not None:
+            if "$" in k:
+                substituted_keys = True
+                sub = _expand_substitutions(passes[0], k, (path, k), ignore_missing)
+                if sub != k:
                     replace_keys.append((k, sub))
-            sub = _substitute_item(substitutions, v, path + [k], ignore_missing)
-            if sub is not None:
-                item[k] = sub
-        for old, new in replace_keys:
-            item[new] = merge_config(item.get(old), item.get(new))
-            del item[old]
+            elif not path and k == CONF_SUBSTITUTIONS:
+                # Substituted by do_substitution_pass() already
+                continue
+            if isinstance(v, str):
+                if "$" in v:
+                    sub = _expand_passes(passes, v, (path, k), ignore_missing)
+                    if sub != v:
+                        item[k] = sub
+            elif isinstance(v, (dict, list, core.Lambda)):
+                sub = _substitute_item(passes, v, (path, k), ignore_missing)
+                if sub is not None:
+                    item[k] = sub
+        _replace_keys(item, replace_keys)
+        # The keys are substituted after the keys of the previous pass were
+        # replaced, like in a traversal for each pass
+        for substitutions in passes[1:] if substituted_keys else ():
+            replace_keys = []
+            for k in item:
+                if "$" in k:
+                    sub = _expand_substitutions(
+                        substitutions, k, (path, k), ignore_missing
+                    )
+                    if sub != k:
+                        replace_keys.append((k, sub))
+            _replace_keys(item, replace_keys)
     elif isinstance(item, str):
-        sub = _expand_substitutions(substitutions, item, path, ignore_missing)
+        sub = _expand_passes(passes, item, path, ignore_missing)
         if sub != item:
             return sub
     elif isinstance(item, core.Lambda):
-        sub = _expand_substitutions(substitutions, item.value, path, ignore_missing)
-        if sub != item:
-            item.value = sub
+        item.value = _expand_passes(passes, item.value, path, ignore_missing)
     return None
 
 
-def do_substitution_pass(config, command_line_substitutions, ignore_missing=False):
-    if CONF_SUBSTITUTIONS not in config and not command_line_substitutions:
-        return
-
+def _load_substitutions(config, command_line_substitutions):
     substitutions = config[CONF_SUBSTITUTIONS]
     if substitutions is None:
         substitutions = command_line_substitutions
@@ -141,4 +193,32 @@ def do_substitution_pass(config, command_line_substitutions, ignore_missing=Fals
     config[CONF_SUBSTITUTIONS] = substitutions
     # Move substitutions to the first place to replace substitutions in them correctly
     config.move_to_end(CONF_SUBSTITUTIONS, False)
-    _substitute_item(substitutions, config, [], ignore_missing)
+    return substitutions
+
+
+def do_substitution_pass(
+    config, command_line_substitutions, ignore_missing=False, passes=1
+):
+    """Substitute the substitutions in a config.
+
+    With more than one pass, the substitutions inserted by a pass are
+    substituted by the next one. The values of the substitutions are
+    resolved for all passes first, then the rest of the config is
+    substituted in one traversal.
+    """
+    if CONF_SUBSTITUTIONS not in config and not command_line_substitutions:
+        return
+
+    tables = []
+    path = ((), CONF_SUBSTITUTIONS)
+    for _ in range(passes):
+        substitutions = _load_substitutions(config, command_line_substitutions)
+        # Each substitution can use the substituted values of the ones before
+        for key, value in substitutions.items():
+            sub = _expand_substitutions(
+                substitutions, value, (path, key), ignore_missing
+            )
+            if sub != value:
+                substitutions[key] = sub
+        tables.append(dict(substitutions))
+    _substitute_item(tables, config, (), ignore_missing)
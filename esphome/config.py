@@ -4,7 +4,7 @@ import heapq
 import logging
 import re
 
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
 from contextlib import contextmanager
 import contextvars
@@ -22,19 +22,22 @@ from esphome.const import (
     CONF_EXTERNAL_COMPONENTS,
     TARGET_PLATFORMS,
 )
-from esphome.core import CORE, EsphomeError
+from esphome.core import CORE, DocumentRange, EsphomeError
 from esphome.helpers import indent
 from esphome.util import safe_print, OrderedDict
 
 from esphome.config_helpers import Extend, Remove
 from esphome.loader import get_component, get_platform, ComponentManifest
-from esphome.yaml_util import is_secret, ESPHomeDataBase, ESPForceValue
+from esphome.yaml_util import is_secret, ESPForceValue, get_document_range
 from esphome.voluptuous_schema import ExtraKeysInvalid
 from esphome.log import color, Fore
 import esphome.final_validate as fv
 import esphome.config_validation as cv
 from esphome.types import ConfigType, ConfigPathType, ConfigFragmentType
 
+if TYPE_CHECKING:
+    from esphome.cpp_generator import MockObjClass
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -106,6 +109,12 @@ class Config(OrderedDict, fv.FinalValidateConfig):
         self.output_paths: list[tuple[ConfigPath, str]] = []
         # A list of components ids with the config path
         self.declare_ids: list[tuple[core.ID, ConfigPath]] = []
+        # Index of declare_ids by ID name
+        self._declare_ids_by_name: dict[str, tuple[core.ID, ConfigPath]] = {}
+        # Index of declared IDs by the name of their type and of all parent types
+        self._declare_ids_by_type: dict[str, list[core.ID]] = {}
+        # Next suffix to try when generating a name for an automatic ID, by base name
+        self._auto_id_suffixes: dict[str, int] = {}
         self._data = {}
         # Store pending validation tasks (in heap order)
         self._validation_tasks: list[_ValidationStepTask] = []
@@ -181,15 +190,15 @@ class Config(OrderedDict, fv.FinalValidateConfig):
 
     def get_deepest_document_range_for_path(
         self, path: ConfigPath, get_key: bool = False
-    ) -> Optional[ESPHomeDataBase]:
+    ) -> Optional[DocumentRange]:
         data = self
         doc_range = None
         for index, path_item in enumerate(path):
             try:
                 if path_item in data:
                     key_data = [x for x in data.keys() if x == path_item][0]
-                    if isinstance(key_data, ESPHomeDataBase):
-                        doc_range = key_data.esp_range
+                    if (key_range := get_document_range(key_data)) is not None:
+                        doc_range = key_range
                         if get_key and index == len(path) - 1:
                             return doc_range
                 data = data[path_item]
@@ -197,15 +206,12 @@ class Config(OrderedDict, fv.FinalValidateConfig):
                 return doc_range
             if isinstance(data, core.ID):
                 data = data.id
-            if isinstance(data, ESPHomeDataBase) and data.esp_range is not None:
-                doc_range = data.esp_range
+            if (data_range := get_document_range(data)) is not None:
+                doc_range = data_range
             elif isinstance(data, dict):
                 platform_item = data.get("platform")
-                if (
-                    isinstance(platform_item, ESPHomeDataBase)
-                    and platform_item.esp_range is not None
-                ):
-                    doc_range = platform_item.esp_range
+                if (platform_range := get_document_range(platform_item)) is not None:
+                    doc_range = platform_range
 
         return doc_range
 
@@ -234,12 +240,56 @@ class Config(OrderedDict, fv.FinalValidateConfig):
             part.append(item_index)
         return part
 
+    def declare_id(self, id: core.ID, path: ConfigPath) -> None:
+        """Register an ID declaration.
+
+        Manual IDs are indexed by name immediately, automatic IDs once they
+        have been resolved with `resolve_declared_ids`.
+        """
+        self.declare_ids.append((id, path))
+        if id.id is not None:
+            self._declare_ids_by_name[id.id] = (id, path)
+
+    def get_declared_id(self, name: str) -> Optional[tuple[core.ID, ConfigPath]]:
+        """Return the declared ID with the given name and its path, if any."""
+        return self._declare_ids_by_name.get(name)
+
+    def resolve_declared_ids(self) -> None:
+        """Give all automatic ID declarations a unique name and index all declarations by type."""
+        from esphome.cpp_generator import MockObjClass
+
+        used = set(self._declare_ids_by_name)
+        used.update(cv.RESERVED_IDS)
+        used.update(CORE.loaded_integrations)
+        for id, path in self.declare_ids:
+            if id.id is None:
+                # Same naming as core.ID.resolve, without copying the used names for every ID
+                name = id.default_name
+                tries = self._auto_id_suffixes.get(name, 1)
+                id.id = name if tries == 1 else f"{name}_{tries}"
+                while id.id in used:
+                    tries += 1
+                    id.id = f"{name}_{tries}"
+                self._auto_id_suffixes[name] = tries
+                used.add(id.id)
+                self._declare_ids_by_name[id.id] = (id, path)
+            if isinstance(id.type, MockObjClass):
+                # pylint: disable=protected-access
+                type_names = {str(id.type)}
+                type_names.update(str(parent) for parent in id.type._parents)
+                for type_name in type_names:
+                    self._declare_ids_by_type.setdefault(type_name, []).append(id)
+
+    def get_declared_ids_for_type(self, type: "MockObjClass") -> list[core.ID]:
+        """Return all declared IDs whose type inherits from the given type, in declaration order."""
+        return self._declare_ids_by_type.get(str(type), [])
+
     def get_path_for_id(self, id: core.ID):
         """Return the config fragment where the given ID is declared."""
-        for declared_id, path in self.declare_ids:
-            if declared_id.id == str(id):
-                return path
-        raise KeyError(f"ID {id} not found in configuration")
+        declared = self._declare_ids_by_name.get(str(id))
+        if declared is None:
+            raise KeyError(f"ID {id} not found in configuration")
+        return declared[1]
 
     def get_config_for_path(self, path: ConfigPathType) -> ConfigFragmentType:
         return self.get_nested_item(path, raise_error=True)
@@ -269,9 +319,9 @@ def iter_ids(config, path=None):
 
 def recursive_check_replaceme(value):
     if isinstance(value, list):
-        return cv.Schema([recursive_check_replaceme])(value)
+        return _REPLACEME_LIST_SCHEMA(value)
     if isinstance(value, dict):
-        return cv.Schema({cv.valid: recursive_check_replaceme})(value)
+        return _REPLACEME_DICT_SCHEMA(value)
     if isinstance(value, ESPForceValue):
         pass
     if isinstance(value, str) and value == "REPLACEME":
@@ -285,6 +335,10 @@ def recursive_check_replaceme(value):
     return value
 
 
+_REPLACEME_LIST_SCHEMA = cv.Schema([recursive_check_replaceme])
+_REPLACEME_DICT_SCHEMA = cv.Schema({cv.valid: recursive_check_replaceme})
+
+
 class ConfigValidationStep(abc.ABC):
     """A step to for the validation phase."""
 
@@ -575,22 +629,20 @@ class IDPassValidationStep(ConfigValidationStep):
             if id.is_declaration:
                 if id.id is not None:
                     # Look for duplicate definitions
-                    match = next(
-                        (v for v in result.declare_ids if v[0].id == id.id), None
-                    )
+                    match = result.get_declared_id(id.id)
                     if match is not None:
                         opath = "->".join(str(v) for v in match[1])
                         result.add_str_error(
                             f"ID {id.id} redefined! Check {opath}", path
                         )
                         continue
-                result.declare_ids.append((id, path))
+                result.declare_id(id, path)
             else:
                 searching_ids.append((id, path))
 
         # Resolve default ids after manual IDs
+        result.resolve_declared_ids()
         for id, _ in result.declare_ids:
-            id.resolve([v[0].id for v in result.declare_ids])
             if isinstance(id.type, MockObjClass) and id.type.inherits_from(Component):
                 CORE.component_ids.add(id.id)
 
@@ -598,9 +650,9 @@ class IDPassValidationStep(ConfigValidationStep):
         for id, path in searching_ids:
             if id.id is not None:
                 # manually declared
-                match = next(
-                    (v[0] for v in result.declare_ids if v[0].id == id.id), None
-                )
+                match = result.get_declared_id(id.id)
+                if match is not None:
+                    match = match[0]
                 if match is None or not match.is_manual:
                     # No declared ID with this name
                     import difflib
@@ -630,13 +682,7 @@ class IDPassValidationStep(ConfigValidationStep):
                     )
 
             if id.id is None and id.type is not None:
-                matches = []
-                for v in result.declare_ids:
-                    if v[0] is None or not isinstance(v[0].type, MockObjClass):
-                        continue
-                    inherits = v[0].type.inherits_from(id.type)
-                    if inherits:
-                        matches.append(v[0])
+                matches = result.get_declared_ids_for_type(id.type)
 
                 if len(matches) == 0:
                     result.add_str_error(
@@ -764,8 +810,9 @@ def validate_config(config, command_line_substitutions) -> Config:
         }
         result.add_output_path([CONF_SUBSTITUTIONS], CONF_SUBSTITUTIONS)
         try:
-            substitutions.do_substitution_pass(config, command_line_substitutions)
-            substitutions.do_substitution_pass(config, command_line_substitutions)
+            substitutions.do_substitution_pass(
+                config, command_line_substitutions, passes=2
+            )
         except vol.Invalid as err:
             result.add_error(err)
             return result
@@ -899,6 +946,7 @@ class InvalidYAMLError(EsphomeError):
 
 
 def _load_config(command_line_substitutions):
+    yaml_util.reset_provenance()
     try:
         config = yaml_util.load_yaml(CORE.config_path)
     except EsphomeError as e:
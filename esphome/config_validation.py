@@ -1678,6 +1678,8 @@ def validate_registry_entry(name, registry):
         extra=ALLOW_EXTRA,
     )
     ignore_keys = extract_keys(base_schema)
+    # The base schema with the type id of each entry, built on first use
+    type_schemas = {}
 
     @schema_extractor_registry(registry)
     def validator(value):
@@ -1710,9 +1712,11 @@ def validate_registry_entry(name, registry):
             value[key] = registry_entry.schema(value[key])
 
         if registry_entry.type_id is not None:
-            my_base_schema = base_schema.extend(
-                {GenerateID(CONF_TYPE_ID): declare_id(registry_entry.type_id)}
-            )
+            if (my_base_schema := type_schemas.get(key)) is None:
+                my_base_schema = base_schema.extend(
+                    {GenerateID(CONF_TYPE_ID): declare_id(registry_entry.type_id)}
+                )
+                type_schemas[key] = my_base_schema
             value = my_base_schema(value)
 
         return value
@@ -874,6 +874,7 @@ TYPE_LOCAL = "local"
 
 ENV_NOGITIGNORE = "ESPHOME_NOGITIGNORE"
 ENV_QUICKWIZARD = "ESPHOME_QUICKWIZARD"
+ENV_PLATFORMIO_LOCK = "ESPHOME_PLATFORMIO_LOCK"
 
 ICON_ACCELERATION = "mdi:axis-arrow"
 ICON_ACCELERATION_X = "mdi:axis-x-arrow"
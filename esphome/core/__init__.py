@@ -24,6 +24,7 @@ from esphome.const import (
 )
 from esphome.coroutine import FakeAwaitable as _FakeAwaitable
 from esphome.coroutine import FakeEventLoop as _FakeEventLoop
+from esphome.coroutine import WaitFor as _WaitFor
 
 # pylint: disable=unused-import
 from esphome.coroutine import coroutine, coroutine_with_priority  # noqa
@@ -78,6 +79,15 @@ class MACAddress:
         return RawExpression(f"0x{num}ULL")
 
 
+def get_data_dir(config_dir: str) -> str:
+    """Return the data directory of the configurations in a directory."""
+    if is_ha_addon():
+        return os.path.join("/data")
+    if "ESPHOME_DATA_DIR" in os.environ:
+        return get_str_env("ESPHOME_DATA_DIR", None)
+    return os.path.join(config_dir, ".esphome")
+
+
 def is_approximately_integer(value):
     if isinstance(value, int):
         return True
@@ -335,14 +345,18 @@ class ID:
         self.is_declaration = is_declaration
         self.type: Optional["MockObjClass"] = type
 
+    @property
+    def default_name(self) -> str:
+        """The name an automatic ID is derived from, based on its type."""
+        base = str(self.type).replace("::", "_").lower()
+        return "".join(c for c in base if c.isalnum() or c == "_")
+
     def resolve(self, registered_ids):
         from esphome.config_validation import RESERVED_IDS
 
         if self.id is None:
-            base = str(self.type).replace("::", "_").lower()
-            name = "".join(c for c in base if c.isalnum() or c == "_")
             used = set(registered_ids) | set(RESERVED_IDS) | CORE.loaded_integrations
-            self.id = ensure_unique_string(name, used)
+            self.id = ensure_unique_string(self.default_name, used)
         return self.id
 
     def __str__(self):
@@ -591,11 +605,7 @@ class EsphomeCore:
 
     @property
     def data_dir(self):
-        if is_ha_addon():
-            return os.path.join("/data")
-        if "ESPHOME_DATA_DIR" in os.environ:
-            return get_str_env("ESPHOME_DATA_DIR", None)
-        return self.relative_config_path(".esphome")
+        return get_data_dir(self.config_dir)
 
     @property
     def config_filename(self):
@@ -788,7 +798,7 @@ class EsphomeCore:
                 return self.variables[id]
             except KeyError:
                 _LOGGER.debug("Waiting for variable %s (%r)", id, id)
-                yield
+                yield _WaitFor(id)
 
     async def get_variable(self, id) -> "MockObj":
         if not isinstance(id, ID):
@@ -805,7 +815,7 @@ class EsphomeCore:
                     if k == id:
                         return (k, v)
             _LOGGER.debug("Waiting for variable %s", id)
-            yield
+            yield _WaitFor(id)
 
     async def get_variable_with_full_id(self, id: ID) -> tuple[ID, "MockObj"]:
         if not isinstance(id, ID):
@@ -817,31 +827,33 @@ class EsphomeCore:
             raise EsphomeError(f"ID {id} is already registered")
         _LOGGER.debug("Registered variable %s of type %s", id.id, id.type)
         self.variables[id] = obj
+        self.event_loop.notify(id)
 
     def has_id(self, id):
         return id in self.variables
 
-    @property
-    def cpp_main_section(self):
+    @staticmethod
+    def _iter_statement_code(statements):
         from esphome.cpp_generator import statement
 
-        main_code = []
-        for exp in self.main_statements:
-            text = str(statement(exp))
-            text = text.rstrip()
-            main_code.append(text)
-        return "\n".join(main_code) + "\n\n"
+        for exp in statements:
+            yield str(statement(exp)).rstrip()
+
+    def iter_cpp_main_statements(self):
+        """Yield the code of each main statement, without building the whole section."""
+        return self._iter_statement_code(self.main_statements)
+
+    def iter_cpp_global_statements(self):
+        """Yield the code of each global statement, without building the whole section."""
+        return self._iter_statement_code(self.global_statements)
 
     @property
-    def cpp_global_section(self):
-        from esphome.cpp_generator import statement
+    def cpp_main_section(self):
+        return "\n".join(self.iter_cpp_main_statements()) + "\n\n"
 
-        global_code = []
-        for exp in self.global_statements:
-            text = str(statement(exp))
-            text = text.rstrip()
-            global_code.append(text)
-        return "\n".join(global_code) + "\n"
+    @property
+    def cpp_global_section(self):
+        return "\n".join(self.iter_cpp_global_statements()) + "\n"
 
 
 class AutoLoad(OrderedDict):
@@ -49,10 +49,14 @@ import inspect
 import logging
 import types
 from typing import Any, Callable
-from collections.abc import Awaitable, Generator, Iterator
+from collections.abc import Awaitable, Generator, Hashable, Iterator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Tasks polling with a bare `yield` are given up on when no task finished,
+# parked or was woken for this many iterations
+MAX_IDLE_ITERATIONS = 1000000
+
 
 def coroutine(func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
     """Decorator to apply to methods to convert them to ESPHome coroutines."""
@@ -126,7 +130,12 @@ def _flatten_generator(gen: Generator[Any, Any, Any]):
             ret = to_send if e.value is None else e.value
             return ret
 
-        if isinstance(val, collections.abc.Awaitable):
+        if isinstance(val, WaitFor):
+            # Blocked on a key (like a variable ID), pass the marker up to the event loop
+            # so that the task is parked until the key is notified.
+            to_send = None
+            yield val
+        elif isinstance(val, collections.abc.Awaitable):
             # yielded object that is awaitable (like `yield some_new_style_method()`)
             # yield from __await__() like actual coroutines would.
             to_send = yield from val.__await__()
@@ -160,6 +169,23 @@ class FakeAwaitable:
         return ret
 
 
+class WaitFor:
+    """Marker yielded by a coroutine that is blocked until ``key`` is notified.
+
+    The event loop parks the task yielding this and only resumes it once
+    `FakeEventLoop.notify` is called with an equal key (for example when
+    the variable with that ID is registered).
+    """
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Hashable) -> None:
+        self.key = key
+
+    def __repr__(self):
+        return f"WaitFor<{self.key!r}>"
+
+
 @functools.total_ordering
 class _Task:
     def __init__(
@@ -192,11 +218,24 @@ class _Task:
 
 
 class FakeEventLoop:
-    """Emulate an asyncio EventLoop to run some registered coroutine jobs in sequence."""
+    """Emulate an asyncio EventLoop to run some registered coroutine jobs in sequence.
+
+    Tasks that yield a `WaitFor` marker are not re-polled. Instead they are parked
+    until `notify` is called for the key they are waiting on, after which they
+    are scheduled again. If no task can run anymore but some are still parked,
+    a circular (or missing) dependency is reported. So is a task polling with a
+    bare `yield` that does not get anywhere for MAX_IDLE_ITERATIONS.
+    """
 
     def __init__(self):
         self._pending_tasks: list[_Task] = []
         self._task_counter = 0
+        # Tasks parked on a key, in the order they started waiting
+        self._waiting_tasks: dict[Hashable, list[_Task]] = {}
+        # Priority of the task that is currently running
+        self._current_priority = 0.0
+        # Iterations since a task finished, was parked or was woken
+        self._idle_iterations = 0
 
     def add_job(self, func, *args, **kwargs):
         """Add a job to the task queue,
@@ -214,27 +253,55 @@ class FakeEventLoop:
         prio = getattr(coro, "priority", 0.0)
         task = _Task(prio, self._task_counter, gen, func)
         self._task_counter += 1
+        self._idle_iterations = 0
         heapq.heappush(self._pending_tasks, task)
 
+    def notify(self, key: Hashable) -> None:
+        """Wake up all tasks parked on the given key."""
+        tasks = self._waiting_tasks.pop(key, None)
+        if tasks is None:
+            return
+        self._idle_iterations = 0
+        for task in tasks:
+            # Resume at most at the level of the task that satisfied the dependency,
+            # like a task that has been polling for it would have
+            task = task.with_priority(min(task.priority, self._current_priority - 1))
+            _LOGGER.debug(
+                "Waking %s in %s (num %s)",
+                task.original_function.__qualname__,
+                task.original_function.__module__,
+                task.id_number,
+            )
+            heapq.heappush(self._pending_tasks, task)
+
+    def _deadlock_error(self) -> RuntimeError:
+        lines = []
+        for key, tasks in self._waiting_tasks.items():
+            for task in tasks:
+                lines.append(
+                    f"  {task.original_function.__qualname__} in "
+                    f"{task.original_function.__module__} is waiting for {key}"
+                )
+        for task in self._pending_tasks:
+            lines.append(
+                f"  {task.original_function.__qualname__} in "
+                f"{task.original_function.__module__} is polling"
+            )
+        lines.sort()
+        return RuntimeError(
+            "Circular dependency detected! "
+            "The following tasks could not be completed:\n" + "\n".join(lines)
+        )
+
     def flush_tasks(self):
         """Run until all tasks have been completed.
 
         :raises RuntimeError: if a deadlock is detected.
         """
-        i = 0
+        self._idle_iterations = 0
         while self._pending_tasks:
-            i += 1
-            if i > 1000000:
-                # Detect deadlock/circular dependency by measuring how many times tasks have been
-                # executed. On the big tests/test1.yaml we only get to a fraction of this, so
-                # this shouldn't be a problem.
-                raise RuntimeError(
-                    "Circular dependency detected! "
-                    "Please run with -v option to see what functions failed to "
-                    "complete."
-                )
-
             task: _Task = heapq.heappop(self._pending_tasks)
+            self._current_priority = task.priority
             _LOGGER.debug(
                 "Running %s in %s (num %s)",
                 task.original_function.__qualname__,
@@ -243,11 +310,24 @@ class FakeEventLoop:
             )
 
             try:
-                next(task.iterator)
-                # Decrease priority over time, so that if this task is blocked
-                # due to a dependency others will clear the dependency
-                # This could be improved with a less naive approach
-                new_task = task.with_priority(task.priority - 1)
-                heapq.heappush(self._pending_tasks, new_task)
+                val = next(task.iterator)
             except StopIteration:
                 _LOGGER.debug(" -> finished")
+                self._idle_iterations = 0
+                continue
+            # Decrease priority over time, so that tasks that were blocked
+            # run after the ones that were not
+            new_task = task.with_priority(task.priority - 1)
+            if isinstance(val, WaitFor):
+                self._waiting_tasks.setdefault(val.key, []).append(new_task)
+                self._idle_iterations = 0
+                continue
+            heapq.heappush(self._pending_tasks, new_task)
+            self._idle_iterations += 1
+            if self._idle_iterations > MAX_IDLE_ITERATIONS:
+                # Only tasks polling for something that never happens are left
+                raise self._deadlock_error()
+
+        if self._waiting_tasks:
+            # Nothing can run anymore, but some tasks are still blocked
+            raise self._deadlock_error()
@@ -22,7 +22,7 @@ from esphome.core import (
 )
 from esphome.helpers import cpp_string_escape, indent_all_but_first_and_last
 from esphome.util import OrderedDict
-from esphome.yaml_util import ESPHomeDataBase
+from esphome.yaml_util import get_content_offset, get_document_range
 
 
 class Expression(abc.ABC):
@@ -47,6 +47,7 @@ SafeExpType = Union[
     type[int],
     type[float],
     Sequence[Any],
+    bytes,
 ]
 
 
@@ -183,6 +184,42 @@ class ArrayInitializer(Expression):
         return cpp
 
 
+class ByteArrayInitializer(Expression):
+    """Array initializer for raw byte data like images, fonts or firmware blobs.
+
+    The hex literals are rendered from the buffer in bulk instead of creating
+    an expression object per byte.
+    """
+
+    __slots__ = ("data", "multiline", "bytes_per_line")
+
+    def __init__(
+        self,
+        data: Union[bytes, bytearray, memoryview],
+        multiline: bool = False,
+        bytes_per_line: int = 16,
+    ):
+        self.data = memoryview(data).cast("B")
+        self.multiline = multiline
+        self.bytes_per_line = bytes_per_line
+
+    @staticmethod
+    def _hex_literals(data: memoryview) -> str:
+        return "0x" + data.hex(",").upper().replace(",", ", 0x")
+
+    def __str__(self):
+        if not self.data:
+            return "{}"
+        if self.multiline:
+            step = self.bytes_per_line
+            lines = [
+                self._hex_literals(self.data[i : i + step])
+                for i in range(0, len(self.data), step)
+            ]
+            return "{\n  " + ",\n  ".join(lines) + ",\n}"
+        return f"{{{self._hex_literals(self.data)}}}"
+
+
 class ParameterExpression(Expression):
     __slots__ = ("type", "id")
 
@@ -364,6 +401,8 @@ def safe_exp(obj: SafeExpType) -> Expression:
         return IntLiteral(int(obj.total_minutes))
     if isinstance(obj, (tuple, list)):
         return ArrayInitializer(*[safe_exp(o) for o in obj])
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return ByteArrayInitializer(obj)
     if obj is bool:
         return bool_
     if obj is int:
@@ -443,8 +482,15 @@ class StaticConstAssignmentExpression(AssignmentExpression):
         return f"static const {self.type} {self.name}[] = {self.rhs}"
 
 
+def _array_exp(rhs) -> Expression:
+    if isinstance(rhs, (bytes, bytearray, memoryview)):
+        # Large byte arrays are easier to read (and diff) wrapped over several lines
+        return ByteArrayInitializer(rhs, multiline=True)
+    return safe_exp(rhs)
+
+
 def progmem_array(id_, rhs) -> "MockObj":
-    rhs = safe_exp(rhs)
+    rhs = _array_exp(rhs)
     obj = MockObj(id_, ".")
     assignment = ProgmemAssignmentExpression(id_.type, id_, rhs)
     CORE.add(assignment)
@@ -453,7 +499,7 @@ def progmem_array(id_, rhs) -> "MockObj":
 
 
 def static_const_array(id_, rhs) -> "MockObj":
-    rhs = safe_exp(rhs)
+    rhs = _array_exp(rhs)
     obj = MockObj(id_, ".")
     assignment = StaticConstAssignmentExpression(id_.type, id_, rhs)
     CORE.add(assignment)
@@ -695,9 +741,9 @@ async def process_lambda(
             parts[i * 3 + 1] = var
         parts[i * 3 + 2] = ""
 
-    if isinstance(value, ESPHomeDataBase) and value.esp_range is not None:
-        location = value.esp_range.start_mark
-        location.line += value.content_offset
+    if (doc_range := get_document_range(value)) is not None:
+        location = doc_range.start_mark
+        location.line += get_content_offset(value)
     else:
         location = None
     return LambdaExpression(parts, parameters, capture, return_type, location)
@@ -15,7 +15,7 @@ from esphome.const import (
 )
 
 from esphome.core import coroutine, ID, CORE
-from esphome.coroutine import FakeAwaitable
+from esphome.coroutine import FakeAwaitable, WaitFor
 from esphome.types import ConfigType, ConfigFragmentType
 from esphome.cpp_generator import add, get_variable
 from esphome.cpp_types import App
@@ -149,6 +149,7 @@ async def past_safe_mode():
         while True:
             if CORE.data.get(CONF_OTA, {}).get(KEY_PAST_SAFE_MODE, False):
                 return
-            yield
+            # Woken up by the ota component once the safe mode check is emitted
+            yield WaitFor(KEY_PAST_SAFE_MODE)
 
     return await FakeAwaitable(_safe_mode_generator())
@@ -2,18 +2,24 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import threading
 from dataclasses import dataclass
 from functools import partial
 from typing import TYPE_CHECKING, Any, Callable
 
+from ..core import CORE
+from ..resolver import CACHE_FILE, Resolver
 from ..zeroconf import DiscoveredImport
-from .dns import DNSCache
 from .entries import DashboardEntries
+from .events import DashboardEventStream
+from .jobs import JobScheduler
+from .json_config import JsonConfigRenderer
 from .settings import DashboardSettings
 
 if TYPE_CHECKING:
     from .status.mdns import MDNSStatus
+    from .status.ping import PingStatus
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -63,46 +69,63 @@ class ESPHomeDashboard:
     __slots__ = (
         "bus",
         "entries",
+        "events",
+        "jobs",
         "loop",
         "import_result",
         "stop_event",
         "ping_request",
         "mqtt_ping_request",
         "mdns_status",
+        "ping_status",
         "settings",
-        "dns_cache",
+        "resolver",
+        "json_config",
     )
 
     def __init__(self) -> None:
         """Initialize the ESPHomeDashboard."""
         self.bus = EventBus()
         self.entries: DashboardEntries | None = None
+        self.events: DashboardEventStream | None = None
+        self.jobs: JobScheduler | None = None
         self.loop: asyncio.AbstractEventLoop | None = None
         self.import_result: dict[str, DiscoveredImport] = {}
         self.stop_event = threading.Event()
         self.ping_request: asyncio.Event | None = None
         self.mqtt_ping_request = threading.Event()
         self.mdns_status: MDNSStatus | None = None
+        self.ping_status: PingStatus | None = None
         self.settings = DashboardSettings()
-        self.dns_cache = DNSCache()
+        self.resolver = Resolver()
+        self.json_config = JsonConfigRenderer()
 
     async def async_setup(self) -> None:
         """Setup the dashboard."""
         self.loop = asyncio.get_running_loop()
         self.ping_request = asyncio.Event()
         self.entries = DashboardEntries(self)
+        self.events = DashboardEventStream(self)
+        self.jobs = JobScheduler()
 
     async def async_run(self) -> None:
         """Run the dashboard."""
         settings = self.settings
         mdns_task: asyncio.Task | None = None
         ping_status_task: asyncio.Task | None = None
+        self.resolver.path = os.path.join(CORE.data_dir, CACHE_FILE)
+        # The ping status is used where mDNS does not work
+        self.resolver.mdns = not settings.status_use_ping
+        await self.resolver.async_load()
+        # Start watching first so no change is missed between the scan and the watch
+        self.entries.async_start_watching()
         await self.entries.async_update_entries()
 
         if settings.status_use_ping:
             from .status.ping import PingStatus
 
             ping_status = PingStatus()
+            self.ping_status = ping_status
             ping_status_task = asyncio.create_task(ping_status.async_run())
         else:
             from .status.mdns import MDNSStatus
@@ -123,6 +146,9 @@ class ESPHomeDashboard:
             await shutdown_event.wait()
         finally:
             _LOGGER.info("Shutting down...")
+            self.entries.async_stop_watching()
+            self.json_config.shutdown()
+            await self.resolver.async_save()
             self.stop_event.set()
             self.ping_request.set()
             if ping_status_task:
@@ -130,8 +156,8 @@ class ESPHomeDashboard:
             if mdns_task:
                 mdns_task.cancel()
             if settings.status_use_mqtt:
-                status_thread_mqtt.join()
                 self.mqtt_ping_request.set()
+                status_thread_mqtt.join()
             await asyncio.sleep(0)
 
 
@@ -16,6 +16,7 @@ from .const import (
     EVENT_ENTRY_UPDATED,
 )
 from .enum import StrEnum
+from .util.inotify import DirectoryWatcher
 
 if TYPE_CHECKING:
     from .core import ESPHomeDashboard
@@ -25,6 +26,9 @@ _LOGGER = logging.getLogger(__name__)
 
 DashboardCacheKeyType = tuple[int, int, float, int]
 
+# Seconds between the scans of the config dir when it cannot be watched
+POLL_INTERVAL = 10.0
+
 # Currently EntryState is a simple
 # online/offline/unknown enum, but in the future
 # it may be expanded to include more states
@@ -70,6 +74,13 @@ class DashboardEntries:
         "_loaded_entries",
         "_update_lock",
         "_name_to_entry",
+        "_storage_dir",
+        "_storage_watched",
+        "_watcher",
+        "_changed_paths",
+        "_changed_all",
+        "_changes_task",
+        "_poll_task",
     )
 
     def __init__(self, dashboard: ESPHomeDashboard) -> None:
@@ -86,6 +97,13 @@ class DashboardEntries:
         self._loaded_entries = False
         self._update_lock = asyncio.Lock()
         self._name_to_entry: dict[str, set[DashboardEntry]] = defaultdict(set)
+        self._storage_dir = os.path.normpath(os.path.dirname(ext_storage_path("x")))
+        self._storage_watched = False
+        self._watcher: DirectoryWatcher | None = None
+        self._changed_paths: set[str] = set()
+        self._changed_all = False
+        self._changes_task: asyncio.Task | None = None
+        self._poll_task: asyncio.Task | None = None
 
     def get(self, path: str) -> DashboardEntry | None:
         """Get an entry by path."""
@@ -101,7 +119,7 @@ class DashboardEntries:
 
     def all(self) -> list[DashboardEntry]:
         """Return all entries."""
-        return asyncio.run_coroutine_threadsafe(self._async_all, self._loop).result()
+        return asyncio.run_coroutine_threadsafe(self._async_all(), self._loop).result()
 
     def async_all(self) -> list[DashboardEntry]:
         """Return all entries."""
@@ -126,13 +144,125 @@ class DashboardEntries:
             EVENT_ENTRY_STATE_CHANGED, {"entry": entry, "state": state}
         )
 
+    @property
+    def watching(self) -> bool:
+        """Return if the entries are kept up to date by watching the file system."""
+        return self._watcher is not None
+
+    @property
+    def polling(self) -> bool:
+        """Return if the entries are kept up to date by scanning periodically."""
+        return self._poll_task is not None
+
+    def async_start_watching(self) -> bool:
+        """Keep the entries up to date by watching the config and storage dirs.
+
+        Returns False if watching is not supported, in which case the config
+        dir is scanned every POLL_INTERVAL seconds instead.
+        """
+        watcher = DirectoryWatcher(self._loop, self._async_path_changed)
+        if watcher.start() and watcher.add_watch(self._config_dir):
+            self._watcher = watcher
+            self._async_watch_storage_dir()
+            return True
+        watcher.stop()
+        _LOGGER.debug("File system watching is not available, polling instead")
+        self._poll_task = self._loop.create_task(self._async_poll())
+        return False
+
+    def async_stop_watching(self) -> None:
+        """Stop watching the config and storage dirs."""
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+        if self._changes_task is not None:
+            self._changes_task.cancel()
+            self._changes_task = None
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+    async def _async_poll(self) -> None:
+        """Update the entries from disk every POLL_INTERVAL seconds."""
+        while True:
+            await asyncio.sleep(POLL_INTERVAL)
+            try:
+                await self.async_update_entries()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error updating the dashboard entries")
+
+    def _async_watch_storage_dir(self) -> bool:
+        """Watch the storage dir, or its closest parent until it is created."""
+        directory = self._storage_dir
+        while not self._watcher.add_watch(directory):
+            if (parent := os.path.dirname(directory)) == directory:
+                break
+            directory = parent
+        self._storage_watched = directory == self._storage_dir
+        return self._storage_watched
+
+    def _async_path_changed(self, directory: str, filename: str | None) -> None:
+        """Handle a change in one of the watched directories."""
+        if directory == self._storage_dir:
+            if filename is None:
+                self._changed_all = True
+                if not os.path.isdir(directory):
+                    # Wait for the storage dir to be created again
+                    self._async_watch_storage_dir()
+            elif filename.endswith(".json"):
+                self._changed_paths.add(os.path.join(self._config_dir, filename[:-5]))
+            else:
+                return
+        else:
+            if directory == self._config_dir:
+                if filename is None:
+                    self._changed_all = True
+                else:
+                    self._changed_paths.add(os.path.join(self._config_dir, filename))
+            if not self._storage_watched and (
+                filename is None
+                or self._storage_dir
+                == (path := os.path.normpath(os.path.join(directory, filename)))
+                or self._storage_dir.startswith(path + os.sep)
+            ):
+                # A parent of the storage dir was created, existing storage
+                # files may have been moved in with it
+                if self._async_watch_storage_dir():
+                    self._changed_all = True
+        if self._changes_task is None:
+            self._changes_task = self._loop.create_task(self._async_process_changes())
+
+    async def _async_process_changes(self) -> None:
+        """Update the entries for the changed paths."""
+        try:
+            async with self._update_lock:
+                while self._changed_all or self._changed_paths:
+                    paths = None if self._changed_all else self._changed_paths
+                    self._changed_all = False
+                    self._changed_paths = set()
+                    await self._async_update_entries(paths)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error updating the dashboard entries")
+        finally:
+            # Later changes start a new task
+            self._changes_task = None
+
     async def async_request_update_entries(self) -> None:
         """Request an update of the dashboard entries from disk.
 
-        If an update is already in progress, this will do nothing.
+        If an update is already in progress, or the entries were loaded and
+        are kept up to date by watching or polling, this will do nothing.
+        Before the entries were loaded for the first time, this waits for the
+        update in progress.
         """
+        if (self.watching or self.polling) and self._loaded_entries:
+            return
         if self._update_lock.locked():
             _LOGGER.debug("Dashboard entries are already being updated")
+            if not self._loaded_entries:
+                # Wait for the first scan instead of returning no entries
+                async with self._update_lock:
+                    pass
             return
         await self.async_update_entries()
 
@@ -140,6 +270,7 @@ class DashboardEntries:
         """Update the dashboard entries from disk."""
         async with self._update_lock:
             await self._async_update_entries()
+            self._loaded_entries = True
 
     def _load_entries(
         self, entries: dict[DashboardEntry, DashboardCacheKeyType]
@@ -153,13 +284,15 @@ class DashboardEntries:
             )
             entry.load_from_disk(cache_key)
 
-    async def _async_update_entries(self) -> list[DashboardEntry]:
-        """Sync the dashboard entries from disk."""
+    async def _async_update_entries(self, paths: set[str] | None = None) -> None:
+        """Sync the dashboard entries from disk.
+
+        If paths is given, only the entries for these paths are synced.
+        """
         _LOGGER.debug("Updating dashboard entries")
-        # At some point it would be nice to use watchdog to avoid polling
 
         path_to_cache_key = await self._loop.run_in_executor(
-            None, self._get_path_to_cache_key
+            None, self._get_path_to_cache_key, paths
         )
         entries = self._entries
         name_to_entry = self._name_to_entry
@@ -169,6 +302,7 @@ class DashboardEntries:
             entry
             for filename, entry in entries.items()
             if filename not in path_to_cache_key
+            and (paths is None or filename in paths)
         }
         original_names: dict[DashboardEntry, str] = {}
 
@@ -204,8 +338,13 @@ class DashboardEntries:
                 name_to_entry[current_name].add(entry)
             bus.async_fire(EVENT_ENTRY_UPDATED, {"entry": entry})
 
-    def _get_path_to_cache_key(self) -> dict[str, DashboardCacheKeyType]:
-        """Return a dict of path to cache key."""
+    def _get_path_to_cache_key(
+        self, paths: set[str] | None = None
+    ) -> dict[str, DashboardCacheKeyType]:
+        """Return a dict of path to cache key.
+
+        If paths is given, only the existing YAML files among them are included.
+        """
         path_to_cache_key: dict[str, DashboardCacheKeyType] = {}
         #
         # The cache key is (inode, device, mtime, size)
@@ -215,7 +354,15 @@ class DashboardEntries:
         # file which is much faster than reading the file
         # for the cache hit case which is the common case.
         #
-        for file in util.list_yaml_files([self._config_dir]):
+        if paths is None:
+            files = util.list_yaml_files([self._config_dir])
+        else:
+            files = [
+                file
+                for file in util.filter_yaml_files(sorted(paths))
+                if os.path.isfile(file)
+            ]
+        for file in files:
             try:
                 # Prefer the json storage path if it exists
                 stat = os.stat(ext_storage_path(os.path.basename(file)))
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import TYPE_CHECKING, Any, Callable
+
+from .const import (
+    EVENT_ENTRY_ADDED,
+    EVENT_ENTRY_REMOVED,
+    EVENT_ENTRY_STATE_CHANGED,
+    EVENT_ENTRY_UPDATED,
+)
+from .entries import DashboardEntry, entry_state_to_bool
+
+if TYPE_CHECKING:
+    from .core import Event, ESPHomeDashboard
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds to collect changes for before they are sent out as one delta
+DELTA_INTERVAL = 0.1
+
+# The key in the delta message for each entry event
+_DELTA_KEYS = {
+    EVENT_ENTRY_ADDED: "added",
+    EVENT_ENTRY_REMOVED: "removed",
+    EVENT_ENTRY_UPDATED: "updated",
+}
+
+
+def entry_to_event_dict(entry: DashboardEntry) -> dict[str, Any]:
+    """Return the dict sent to subscribers for an entry, including its state."""
+    return {**entry.to_dict(), "state": entry_state_to_bool(entry.state)}
+
+
+class DashboardEventStream:
+    """Stream the changes of the dashboard entries to subscribers.
+
+    The changes are coalesced for DELTA_INTERVAL seconds and serialized once
+    into a delta message that is shared by all subscribers, so the cost of a
+    delta only depends on the number of changed entries.
+    """
+
+    __slots__ = (
+        "_dashboard",
+        "_loop",
+        "_subscribers",
+        "_remove_listeners",
+        "_changed_entries",
+        "_changed_states",
+        "_flush_handle",
+    )
+
+    def __init__(self, dashboard: ESPHomeDashboard) -> None:
+        """Initialize the DashboardEventStream."""
+        self._dashboard = dashboard
+        self._loop = dashboard.loop
+        self._subscribers: set[Callable[[str], None]] = set()
+        self._remove_listeners: list[Callable[[], None]] = []
+        # The pending change for each entry path, either the entry event type
+        # or None if the entry was added and removed again within the interval
+        self._changed_entries: dict[str, tuple[str | None, DashboardEntry]] = {}
+        self._changed_states: dict[str, DashboardEntry] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def async_subscribe(self, subscriber: Callable[[str], None]) -> Callable[[], None]:
+        """Subscribe to the serialized delta messages.
+
+        The subscriber should send async_snapshot() first, the deltas are
+        relative to the entries at the time of subscribing.
+        """
+        if not self._subscribers:
+            bus = self._dashboard.bus
+            self._remove_listeners = [
+                bus.async_add_listener(event_type, self._async_on_entry_event)
+                for event_type in _DELTA_KEYS
+            ]
+            self._remove_listeners.append(
+                bus.async_add_listener(
+                    EVENT_ENTRY_STATE_CHANGED, self._async_on_state_event
+                )
+            )
+        self._subscribers.add(subscriber)
+        return lambda: self._async_unsubscribe(subscriber)
+
+    def _async_unsubscribe(self, subscriber: Callable[[str], None]) -> None:
+        self._subscribers.discard(subscriber)
+        if self._subscribers:
+            return
+        for remove_listener in self._remove_listeners:
+            remove_listener()
+        self._remove_listeners = []
+        self._changed_entries.clear()
+        self._changed_states.clear()
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def async_snapshot(self) -> str:
+        """Return the serialized snapshot of all entries."""
+        dashboard = self._dashboard
+        entries = dashboard.entries.async_all()
+        configured = {entry.name for entry in entries}
+        return json.dumps(
+            {
+                "event": "initial_state",
+                "data": {
+                    "configured": [entry_to_event_dict(entry) for entry in entries],
+                    "importable": [
+                        {
+                            "name": res.device_name,
+                            "friendly_name": res.friendly_name,
+                            "package_import_url": res.package_import_url,
+                            "project_name": res.project_name,
+                            "project_version": res.project_version,
+                            "network": res.network,
+                        }
+                        for res in dashboard.import_result.values()
+                        if res.device_name not in configured
+                    ],
+                },
+            }
+        )
+
+    def _async_on_entry_event(self, event: Event) -> None:
+        entry: DashboardEntry = event.data["entry"]
+        event_type = event.event_type
+        if previous := self._changed_entries.get(entry.path):
+            previous_type = previous[0]
+            if previous_type == EVENT_ENTRY_ADDED:
+                # The subscribers never saw this entry
+                event_type = (
+                    None if event_type == EVENT_ENTRY_REMOVED else previous_type
+                )
+            elif previous_type is None:
+                event_type = (
+                    None if event_type == EVENT_ENTRY_REMOVED else EVENT_ENTRY_ADDED
+                )
+            elif previous_type == EVENT_ENTRY_REMOVED:
+                event_type = EVENT_ENTRY_UPDATED
+        self._changed_entries[entry.path] = (event_type, entry)
+        self._async_schedule_flush()
+
+    def _async_on_state_event(self, event: Event) -> None:
+        entry: DashboardEntry = event.data["entry"]
+        self._changed_states[entry.path] = entry
+        self._async_schedule_flush()
+
+    def _async_schedule_flush(self) -> None:
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(
+                DELTA_INTERVAL, self._async_flush
+            )
+
+    def _async_flush(self) -> None:
+        """Send the changes collected since the last flush to all subscribers."""
+        self._flush_handle = None
+        changed_entries = self._changed_entries
+        changed_states = self._changed_states
+        self._changed_entries = {}
+        self._changed_states = {}
+
+        delta: dict[str, Any] = {}
+        for event_type, entry in changed_entries.values():
+            if event_type is None:
+                continue
+            key = _DELTA_KEYS[event_type]
+            if event_type == EVENT_ENTRY_REMOVED:
+                delta.setdefault(key, []).append(entry.filename)
+            else:
+                delta.setdefault(key, []).append(entry_to_event_dict(entry))
+        # The entry dicts already include the current state
+        if states := {
+            entry.filename: entry_state_to_bool(entry.state)
+            for path, entry in changed_states.items()
+            if path not in changed_entries
+        }:
+            delta["states"] = states
+        if not delta:
+            return
+
+        message = json.dumps({"event": "delta", "data": delta})
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(message)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error sending delta to subscriber")
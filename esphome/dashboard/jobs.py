@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import json
+import logging
+from typing import Callable
+
+from esphome.helpers import get_int_env
+from esphome.util import shlex_quote
+
+from .enum import StrEnum
+from .output import READ_CHUNK_SIZE, OutputRelay
+
+_LOGGER = logging.getLogger(__name__)
+
+ENV_MAX_JOBS = "ESPHOME_DASHBOARD_MAX_JOBS"
+
+# Lower values run first, jobs with the same priority run in order
+PRIORITY_DEVICE = 0
+PRIORITY_BUILD = 1
+PRIORITY_BACKGROUND = 2
+
+
+class JobState(StrEnum):
+    """The state of a job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+
+
+class DashboardJob:
+    """A command run by the JobScheduler.
+
+    The job is shared by all clients requesting the same command, clients
+    that subscribe late get the recent output. The job is cancelled when the
+    last subscriber unsubscribes.
+    """
+
+    __slots__ = (
+        "_scheduler",
+        "command",
+        "configuration",
+        "priority",
+        "state",
+        "returncode",
+        "_output",
+        "_subscribers",
+        "_process",
+        "_task",
+        "_terminating",
+    )
+
+    def __init__(
+        self,
+        scheduler: JobScheduler,
+        command: list[str],
+        configuration: str | None,
+        priority: int,
+    ) -> None:
+        """Initialize the DashboardJob."""
+        self._scheduler = scheduler
+        self.command = command
+        self.configuration = configuration
+        self.priority = priority
+        self.state = JobState.QUEUED
+        self.returncode: int | None = None
+        self._subscribers: set[Callable[[str], None]] = set()
+        self._output = OutputRelay(self._async_send)
+        self._process: asyncio.subprocess.Process | None = None
+        self._task: asyncio.Task | None = None
+        self._terminating = False
+
+    def async_subscribe(self, subscriber: Callable[[str], None]) -> Callable[[], None]:
+        """Send the recent and all further serialized messages to a subscriber."""
+        if (message := self._output.history_message()) is not None:
+            subscriber(message)
+        self._subscribers.add(subscriber)
+        return lambda: self._async_unsubscribe(subscriber)
+
+    def _async_unsubscribe(self, subscriber: Callable[[str], None]) -> None:
+        self._subscribers.discard(subscriber)
+        if not self._subscribers:
+            self._scheduler.async_cancel(self)
+
+    def async_write_stdin(self, data: bytes) -> None:
+        """Write to the stdin of the running command."""
+        if self._process is not None and self._process.returncode is None:
+            self._process.stdin.write(data)
+
+    def async_terminate(self) -> None:
+        """Terminate the running command."""
+        # The process may still be starting
+        self._terminating = True
+        if self._process is not None and self._process.returncode is None:
+            _LOGGER.debug("Terminating process")
+            self._process.terminate()
+
+    def _async_send(self, message: str) -> None:
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(message)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error sending job output to subscriber")
+
+    def async_send_line(self, text: str) -> None:
+        """Send a line of output to the subscribers."""
+        self._output.write_line(text)
+
+    def async_start(self) -> None:
+        """Start running the command."""
+        self.state = JobState.RUNNING
+        self._task = asyncio.create_task(self._async_run())
+
+    async def _async_run(self) -> None:
+        _LOGGER.info(
+            "Running command '%s'", " ".join(shlex_quote(x) for x in self.command)
+        )
+        returncode = 1
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                close_fds=False,
+            )
+            if self._terminating:
+                self._process.terminate()
+            await self._async_read_output()
+            returncode = await self._process.wait()
+        except OSError as err:
+            _LOGGER.error("Could not run command: %s", err)
+            self.async_send_line(f"Could not run command: {err}\n")
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error running command")
+        finally:
+            # The slot must be released however the job ended
+            process = self._process
+            killed = process is not None and process.returncode is None
+            if killed:
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+            _LOGGER.info("Process exited with return code %s", returncode)
+            self.state = JobState.DONE
+            self.returncode = returncode
+            self._output.close()
+            self._async_send(json.dumps({"event": "exit", "code": returncode}))
+            self._scheduler.async_job_done(self)
+            if killed:
+                await process.wait()
+
+    async def _async_read_output(self) -> None:
+        stdout = self._process.stdout
+        while data := await stdout.read(READ_CHUNK_SIZE):
+            self._output.feed(data)
+
+
+class JobScheduler:
+    """Run the build commands of all clients with a limited concurrency.
+
+    Jobs run by priority and then in the order they were submitted. Only one
+    job runs for a configuration at a time, since they share the build
+    directory. Submitting a command that is already queued or running
+    returns the existing job.
+    """
+
+    __slots__ = ("max_jobs", "_jobs", "_queue", "_sequence", "_running")
+
+    def __init__(self) -> None:
+        """Initialize the JobScheduler."""
+        self.max_jobs = max(get_int_env(ENV_MAX_JOBS, 1), 1)
+        self._jobs: dict[tuple[str, ...], DashboardJob] = {}
+        # Heap of (priority, sequence, job)
+        self._queue: list[tuple[int, int, DashboardJob]] = []
+        self._sequence = itertools.count()
+        self._running: set[DashboardJob] = set()
+
+    def async_submit(
+        self, command: list[str], configuration: str | None, priority: int
+    ) -> DashboardJob:
+        """Queue a command or return the job that already runs it."""
+        key = tuple(command)
+        if (job := self._jobs.get(key)) is not None:
+            return job
+        job = DashboardJob(self, command, configuration, priority)
+        self._jobs[key] = job
+        heapq.heappush(self._queue, (priority, next(self._sequence), job))
+        self._async_start_jobs()
+        if job.state == JobState.QUEUED:
+            job.async_send_line("Waiting for other builds to finish...\n")
+        return job
+
+    def async_cancel(self, job: DashboardJob) -> None:
+        """Remove a job from the queue or terminate it if it runs."""
+        if job.state == JobState.QUEUED:
+            # Skipped when it comes up in the queue
+            job.state = JobState.DONE
+            self._async_remove(job)
+        elif job.state == JobState.RUNNING:
+            # The slot is released once the process exited
+            self._async_remove(job)
+            job.async_terminate()
+
+    def async_job_done(self, job: DashboardJob) -> None:
+        """Release the slot of a job that finished."""
+        self._running.discard(job)
+        self._async_remove(job)
+        self._async_start_jobs()
+
+    def _async_remove(self, job: DashboardJob) -> None:
+        key = tuple(job.command)
+        if self._jobs.get(key) is job:
+            del self._jobs[key]
+
+    def _async_start_jobs(self) -> None:
+        queue = self._queue
+        busy = {job.configuration for job in self._running}
+        waiting: list[tuple[int, int, DashboardJob]] = []
+        while queue and len(self._running) < self.max_jobs:
+            item = heapq.heappop(queue)
+            job = item[2]
+            if job.state != JobState.QUEUED:
+                continue
+            if job.configuration is not None and job.configuration in busy:
+                waiting.append(item)
+                continue
+            busy.add(job.configuration)
+            self._running.add(job)
+            job.async_start()
+        for item in waiting:
+            heapq.heappush(queue, item)
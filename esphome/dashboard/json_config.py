@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Optional
+
+from esphome import core, yaml_util
+from esphome.core import CORE
+from esphome.helpers import get_int_env
+from esphome.loader import CORE_COMPONENTS_PATH
+from esphome.util import OrderedDict
+
+_LOGGER = logging.getLogger(__name__)
+
+ENV_CONFIG_WORKERS = "ESPHOME_DASHBOARD_CONFIG_WORKERS"
+
+# The path of every file read to validate a configuration with its
+# modification time and size, or None if it did not exist
+FilesKeyType = tuple[tuple[str, Optional[int], Optional[int]], ...]
+
+# Set in a worker once it imported components from outside of esphome, like
+# external_components or custom_components. Their modules and what they
+# registered stay in the process, so it must not render another config.
+_EXTERNAL_COMPONENTS_LOADED = False
+
+
+def _stat_key(
+    path: str, stat: os.stat_result | None
+) -> tuple[str, int | None, int | None]:
+    if stat is None:
+        return (path, None, None)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def _files_key(paths: list[str]) -> FilesKeyType:
+    """Return the cache key of the current version of the given files."""
+    key = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        key.append(_stat_key(path, stat))
+    return tuple(key)
+
+
+def _json_default(value: Any) -> Any:
+    """Convert the values of a validated config that are not JSON types."""
+    if isinstance(value, core.Lambda):
+        return f"!lambda {value.value}"
+    if isinstance(value, core.ID):
+        return str(value.id)
+    if isinstance(value, (core.IPAddress, core.MACAddress, core.TimePeriod, uuid.UUID)):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.decode("ascii")
+    return str(value)
+
+
+def _external_component_files() -> list[str]:
+    """Return the files of the imported components from outside of esphome."""
+    core_prefix = os.path.join(CORE_COMPONENTS_PATH, "")
+    return sorted(
+        file
+        for name, module in list(sys.modules.items())
+        if name.startswith("esphome.components.")
+        and (file := getattr(module, "__file__", None)) is not None
+        and not os.path.realpath(file).startswith(core_prefix)
+    )
+
+
+def _init_worker() -> None:
+    logging.basicConfig(level=logging.WARNING)
+
+
+def render_config_json(
+    config_path: str,
+) -> tuple[FilesKeyType | None, str | None, bool]:
+    """Validate a configuration and return it as JSON.
+
+    This runs in the worker processes, the components stay imported between
+    calls. Returns the cache key of the files that were read, including the
+    sources of components from outside of esphome, and the JSON, or None if
+    the configuration is not valid. The last item is True if the worker
+    imported such components and must be replaced, it does not render
+    anymore and returns None as the key.
+    """
+    from esphome.config import load_config, strip_default_ids
+
+    global _EXTERNAL_COMPONENTS_LOADED  # pylint: disable=global-statement
+    if _EXTERNAL_COMPONENTS_LOADED:
+        return None, None, True
+    CORE.config_path = config_path
+    data = None
+    with yaml_util.track_loaded_files() as loaded_files:
+        try:
+            result = load_config({})
+            if not result.errors:
+                data = json.dumps(
+                    strip_default_ids(OrderedDict(result)), default=_json_default
+                )
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Could not render %s: %s", config_path, err)
+        finally:
+            CORE.reset()
+    key = tuple(_stat_key(path, stat) for path, stat in sorted(loaded_files.items()))
+    if external_files := _external_component_files():
+        _EXTERNAL_COMPONENTS_LOADED = True
+        key += _files_key(external_files)
+    return key, data, _EXTERNAL_COMPONENTS_LOADED
+
+
+class JsonConfigRenderer:
+    """Render validated configurations as JSON in warm worker processes.
+
+    The results are cached until one of the files read to validate the
+    configuration changes. The workers are replaced after rendering a
+    configuration with components from outside of esphome, so that changes
+    to their sources are picked up.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the JsonConfigRenderer."""
+        self._executor: ProcessPoolExecutor | None = None
+        self._cache: dict[str, tuple[FilesKeyType, str | None]] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking the dashboard with its threads and event loop is not safe
+            self._executor = ProcessPoolExecutor(
+                get_int_env(ENV_CONFIG_WORKERS, 1),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._executor
+
+    async def async_render(self, config_path: str) -> str | None:
+        """Return the JSON of a configuration, or None if it is not valid."""
+        loop = asyncio.get_running_loop()
+        if cached := self._cache.get(config_path):
+            key, data = cached
+            paths = [path for path, _, _ in key]
+            if await loop.run_in_executor(None, _files_key, paths) == key:
+                return data
+
+        if (future := self._pending.get(config_path)) is None:
+            future = asyncio.ensure_future(self._async_render(config_path))
+            self._pending[config_path] = future
+            future.add_done_callback(lambda _: self._pending.pop(config_path, None))
+        return await asyncio.shield(future)
+
+    async def _async_render(self, config_path: str) -> str | None:
+        loop = asyncio.get_running_loop()
+        key = None
+        while key is None:
+            executor = self._get_executor()
+            try:
+                key, data, external = await loop.run_in_executor(
+                    executor, render_config_json, config_path
+                )
+            except BrokenProcessPool:
+                _LOGGER.warning("Config worker died while rendering %s", config_path)
+                self.shutdown()
+                return None
+            if external and self._executor is executor:
+                # The renders queued in the old workers are retried here
+                _LOGGER.debug("Replacing the config workers after %s", config_path)
+                self._executor = None
+                executor.shutdown(wait=False)
+        self._cache[config_path] = (key, data)
+        return data
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
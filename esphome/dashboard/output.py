@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+from collections import deque
+import json
+import logging
+import re
+from typing import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 64 * 1024
+# Seconds to collect output for before it is sent as one message
+FLUSH_INTERVAL = 0.05
+# Number of lines kept for clients that join late
+HISTORY_LINES = 1000
+
+# A line ends with a newline or with a carriage return of a progress update,
+# a carriage return at the end of a chunk could be followed by a newline
+_LINE_END = re.compile(r"(?<=\n)|(?<=\r)(?=[^\n])")
+
+
+class OutputRelay:
+    """Relay the output of a command to websocket clients in batches.
+
+    The output is read in large chunks and split into lines in bulk. The
+    lines are sent as one serialized line message every FLUSH_INTERVAL, a
+    progress update ending with a carriage return is replaced by the line
+    after it. The last HISTORY_LINES lines are kept for clients that join
+    late.
+    """
+
+    __slots__ = (
+        "_loop",
+        "_send",
+        "_decoder",
+        "_partial",
+        "_pending",
+        "history",
+        "_flush_handle",
+    )
+
+    def __init__(self, send: Callable[[str], None]) -> None:
+        """Initialize the OutputRelay."""
+        self._loop = asyncio.get_running_loop()
+        self._send = send
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._partial = ""
+        self._pending: list[str] = []
+        self.history: deque[str] = deque(maxlen=HISTORY_LINES)
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def feed(self, data: bytes) -> None:
+        """Add a chunk of output."""
+        *lines, self._partial = _LINE_END.split(
+            self._partial + self._decoder.decode(data)
+        )
+        if lines:
+            self._add_lines(lines)
+
+    def write_line(self, line: str) -> None:
+        """Add a line that is not part of the output of the command."""
+        self._add_lines([line])
+
+    def _add_lines(self, lines: list[str]) -> None:
+        pending = self._pending
+        for line in lines:
+            if pending and pending[-1].endswith("\r"):
+                pending[-1] = line
+            else:
+                pending.append(line)
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(FLUSH_INTERVAL, self.flush)
+
+    def close(self) -> None:
+        """Send the rest of the output right away, after the command exited."""
+        if rest := self._partial + self._decoder.decode(b"", final=True):
+            self._partial = ""
+            self._add_lines([rest])
+        self.flush()
+
+    def flush(self) -> None:
+        """Send the pending lines as one message."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not (pending := self._pending):
+            return
+        self._pending = []
+        history = self.history
+        if history and history[-1].endswith("\r"):
+            history.pop()
+        history.extend(pending)
+        text = "".join(pending)
+        _LOGGER.debug("> stdout: %s", text)
+        self._send(json.dumps({"event": "line", "data": text}))
+
+    def history_message(self) -> str | None:
+        """Return the line message with the output sent so far."""
+        if not self.history:
+            return None
+        return json.dumps({"event": "line", "data": "".join(self.history)})
@@ -26,12 +26,6 @@ class MDNSStatus:
         self.host_mdns_state: dict[str, bool | None] = {}
         self._loop = asyncio.get_running_loop()
 
-    async def async_resolve_host(self, host_name: str) -> str | None:
-        """Resolve a host name to an address in a thread-safe manner."""
-        if aiozc := self.aiozc:
-            return await aiozc.async_resolve_host(host_name)
-        return None
-
     async def async_refresh_hosts(self):
         """Refresh the hosts to track."""
         dashboard = DASHBOARD
@@ -52,13 +46,17 @@ class MDNSStatus:
                 entries.async_set_state(entry, bool_to_entry_state(online))
 
         if poll_names and self.aiozc:
-            results = await asyncio.gather(
-                *(self.aiozc.async_resolve_host(name) for name in poll_names)
+            # Resolved again to check the devices are online, the addresses
+            # are shared with the device commands
+            resolver = dashboard.resolver
+            results = await resolver.async_resolve_many(
+                (f"{name}.local" for name in poll_names), refresh=True
             )
-            for name, address in zip(poll_names, results):
-                result = bool(address)
+            await resolver.async_save()
+            for name, entries_for_name in poll_names.items():
+                result = not isinstance(results[f"{name}.local"], Exception)
                 host_mdns_state[name] = result
-                for entry in poll_names[name]:
+                for entry in entries_for_name:
                     entries.async_set_state(entry, bool_to_entry_state(result))
 
     async def async_run(self) -> None:
@@ -66,6 +64,7 @@ class MDNSStatus:
         entries = dashboard.entries
         aiozc = AsyncEsphomeZeroconf()
         self.aiozc = aiozc
+        dashboard.resolver.aiozc = aiozc
         host_mdns_state = self.host_mdns_state
 
         def on_update(dat: dict[str, bool | None]) -> None:
@@ -94,5 +93,6 @@ class MDNSStatus:
             ping_request.clear()
 
         await browser.async_cancel()
+        dashboard.resolver.aiozc = None
         await aiozc.async_close()
         self.aiozc = None
@@ -1,40 +1,102 @@
 from __future__ import annotations
 
+import asyncio
 import binascii
 import json
+import logging
 import os
 import threading
+import time
 
 from esphome import mqtt
+from esphome.helpers import get_int_env
 
 from ..core import DASHBOARD
 from ..entries import EntryState
 
+_LOGGER = logging.getLogger(__name__)
+
+ENV_MQTT_TTL = "ESPHOME_DASHBOARD_MQTT_TTL"
+
+# Seconds between the liveness checks while the dashboard is open
+CHECK_INTERVAL = 2.0
+# Seconds a device is considered online after its last discovery message,
+# discovery is requested three times within this time
+DEFAULT_TTL = 30
+
 
 class MqttStatusThread(threading.Thread):
-    """Status thread to get the status of the devices via MQTT."""
+    """Status thread to get the status of the devices via MQTT.
+
+    The discovery messages are received in the paho thread and handed to the
+    event loop in batches. A device is online until it has not sent a
+    discovery message for the liveness TTL.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the MqttStatusThread."""
+        super().__init__()
+        self._loop = asyncio.get_running_loop()
+        self._ttl = get_int_env(ENV_MQTT_TTL, DEFAULT_TTL)
+        # Devices get a full TTL to answer after the dashboard was opened
+        self._active_since = time.monotonic()
+        # The monotonic time each device name was last seen, only used in
+        # the event loop
+        self._last_seen: dict[str, float] = {}
+        # The names seen by the paho thread since the last batch
+        self._seen: dict[str, float] = {}
+        self._seen_lock = threading.Lock()
+
+    def _handle_discovery(self, payload: bytes) -> None:
+        """Handle a discovery message in the paho thread."""
+        payload = payload.decode(errors="backslashreplace")
+        if not payload:
+            return
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            _LOGGER.debug("Invalid discovery message: %s", payload)
+            return
+        if not isinstance(data, dict) or "name" not in data:
+            return
+        with self._seen_lock:
+            schedule = not self._seen
+            self._seen[data["name"]] = time.monotonic()
+        if schedule:
+            self._loop.call_soon_threadsafe(self._async_process_seen)
+
+    def _async_process_seen(self) -> None:
+        """Mark the devices seen since the last batch online."""
+        with self._seen_lock:
+            seen = self._seen
+            self._seen = {}
+        entries = DASHBOARD.entries
+        self._last_seen.update(seen)
+        for name in seen:
+            for entry in entries.get_by_name(name) or ():
+                entries.async_set_state(entry, EntryState.ONLINE)
+
+    def _async_check_liveness(self) -> None:
+        """Mark the devices that were not seen within the TTL offline."""
+        entries = DASHBOARD.entries
+        last_seen = self._last_seen
+        active_since = self._active_since
+        expired = time.monotonic() - self._ttl
+        for entry in entries.async_all():
+            if not entry.no_mdns:
+                continue
+            if max(last_seen.get(entry.name, 0.0), active_since) < expired:
+                entries.async_set_state(entry, EntryState.OFFLINE)
 
     def run(self) -> None:
         """Run the status thread."""
         dashboard = DASHBOARD
-        entries = dashboard.entries
-        current_entries = entries.all()
 
         config = mqtt.config_from_env()
         topic = "esphome/discover/#"
 
         def on_message(client, userdata, msg):
-            nonlocal current_entries
-
-            payload = msg.payload.decode(errors="backslashreplace")
-            if len(payload) > 0:
-                data = json.loads(payload)
-                if "name" not in data:
-                    return
-                for entry in current_entries:
-                    if entry.name == data["name"]:
-                        entries.set_state(entry, EntryState.ONLINE)
-                        return
+            self._handle_discovery(msg.payload)
 
         def on_connect(client, userdata, flags, return_code):
             client.publish("esphome/discover", None, retain=False)
@@ -52,16 +114,20 @@ class MqttStatusThread(threading.Thread):
         )
         client.loop_start()
 
-        while not dashboard.stop_event.wait(2):
-            current_entries = entries.all()
-            # will be set to true on on_message
-            for entry in current_entries:
-                if entry.no_mdns:
-                    entries.set_state(entry, EntryState.OFFLINE)
-
-            client.publish("esphome/discover", None, retain=False)
+        last_discover = time.monotonic()
+        while not dashboard.stop_event.wait(CHECK_INTERVAL):
+            now = time.monotonic()
+            if now - last_discover >= self._ttl / 3:
+                client.publish("esphome/discover", None, retain=False)
+                last_discover = now
+            self._loop.call_soon_threadsafe(self._async_check_liveness)
             dashboard.mqtt_ping_request.wait()
             dashboard.mqtt_ping_request.clear()
+            if (now := time.monotonic()) - last_discover > self._ttl:
+                # The dashboard was closed for a while
+                self._active_since = now
+                client.publish("esphome/discover", None, retain=False)
+                last_discover = now
 
         client.disconnect()
         client.loop_stop()
@@ -1,20 +1,60 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import itertools
 import logging
+import sys
 import time
-from typing import cast
+from dataclasses import dataclass
 
 from icmplib import Host, SocketPermissionError, async_ping
 
-from ..const import MAX_EXECUTOR_WORKERS
-from ..core import DASHBOARD
+from ..const import EVENT_ENTRY_ADDED, EVENT_ENTRY_UPDATED, MAX_EXECUTOR_WORKERS
+from ..core import DASHBOARD, Event
 from ..entries import DashboardEntry, EntryState, bool_to_entry_state
-from ..util.itertools import chunked
+
+if sys.version_info >= (3, 11):
+    from asyncio import timeout as async_timeout
+else:
+    from async_timeout import timeout as async_timeout
 
 _LOGGER = logging.getLogger(__name__)
 
-GROUP_SIZE = int(MAX_EXECUTOR_WORKERS / 2)
+# Maximum number of hosts that are probed at the same time
+MAX_IN_FLIGHT = int(MAX_EXECUTOR_WORKERS / 2)
+# Seconds between probes of an online host
+ONLINE_INTERVAL = 10.0
+# Seconds until a host is probed again after its state changed
+RECHECK_INTERVAL = 2.0
+# The interval of an offline host doubles up to this many seconds
+OFFLINE_MAX_INTERVAL = 300.0
+# Seconds to keep probing after the last ping request from the frontend
+ACTIVE_TIMEOUT = 60.0
+# Seconds to wait at most before checking for new ping requests
+MAX_SLEEP = 1.0
+
+PROBE_COUNT = 2
+PROBE_INTERVAL = 0.5
+PROBE_TIMEOUT = 2.0
+
+
+@dataclass
+class PingStatistics:
+    """Counters to size the ping scheduler with."""
+
+    probes: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    max_in_flight: int = 0
+
+    @property
+    def average_latency(self) -> float:
+        """Return the average round trip time of the answered probes in ms."""
+        answered = self.probes - self.timeouts - self.errors
+        return self.total_latency / answered if answered else 0.0
 
 
 class PingStatus:
@@ -22,68 +62,166 @@ class PingStatus:
         """Initialize the PingStatus class."""
         super().__init__()
         self._loop = asyncio.get_running_loop()
+        self.stats = PingStatistics()
+        # Heap of (deadline, sequence, entry), an item is stale if the
+        # deadline no longer matches the one in _deadlines
+        self._queue: list[tuple[float, int, DashboardEntry]] = []
+        self._sequence = itertools.count()
+        self._deadlines: dict[DashboardEntry, float] = {}
+        self._intervals: dict[DashboardEntry, float] = {}
+        self._in_flight: dict[DashboardEntry, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+
+    def _schedule(self, entry: DashboardEntry, deadline: float) -> None:
+        """Schedule the next probe of an entry."""
+        self._deadlines[entry] = deadline
+        heapq.heappush(self._queue, (deadline, next(self._sequence), entry))
+
+    def _async_entry_changed(self, event: Event) -> None:
+        """Probe added entries and entries that may have a new address."""
+        entry: DashboardEntry = event.data["entry"]
+        self._intervals.pop(entry, None)
+        self._schedule(entry, time.monotonic())
+        self._wakeup.set()
 
     async def async_run(self) -> None:
         """Run the ping status."""
         dashboard = DASHBOARD
-        entries = dashboard.entries
         privileged = await _can_use_icmp_lib_with_privilege()
         if privileged is None:
             _LOGGER.warning("Cannot use icmplib because privileges are insufficient")
             return
 
+        now = time.monotonic()
+        for entry in dashboard.entries.async_all():
+            self._schedule(entry, now)
+        remove_listeners = [
+            dashboard.bus.async_add_listener(event_type, self._async_entry_changed)
+            for event_type in (EVENT_ENTRY_ADDED, EVENT_ENTRY_UPDATED)
+        ]
+        try:
+            while not dashboard.stop_event.is_set():
+                # Only ping if the dashboard is open
+                await dashboard.ping_request.wait()
+                await self._async_run_active(privileged)
+                _LOGGER.debug("Ping statistics: %s", self.stats)
+        finally:
+            for remove_listener in remove_listeners:
+                remove_listener()
+            for task in self._in_flight.values():
+                task.cancel()
+
+    async def _async_run_active(self, privileged: bool) -> None:
+        """Probe the due hosts until the frontend stops requesting pings."""
+        dashboard = DASHBOARD
+        ping_request = dashboard.ping_request
+        active_until = 0.0
         while not dashboard.stop_event.is_set():
-            # Only ping if the dashboard is open
-            await dashboard.ping_request.wait()
-            dashboard.ping_request.clear()
-            current_entries = dashboard.entries.async_all()
-            to_ping: list[DashboardEntry] = [
-                entry for entry in current_entries if entry.address is not None
-            ]
-
-            # Resolve DNS for all entries
-            entries_with_addresses: dict[DashboardEntry, list[str]] = {}
-            for ping_group in chunked(to_ping, GROUP_SIZE):
-                ping_group = cast(list[DashboardEntry], ping_group)
-                now_monotonic = time.monotonic()
-                dns_results = await asyncio.gather(
-                    *(
-                        dashboard.dns_cache.async_resolve(entry.address, now_monotonic)
-                        for entry in ping_group
-                    ),
-                    return_exceptions=True,
-                )
-
-                for entry, result in zip(ping_group, dns_results):
-                    if isinstance(result, Exception):
-                        entries.async_set_state(entry, EntryState.UNKNOWN)
-                        continue
-                    if isinstance(result, BaseException):
-                        raise result
-                    entries_with_addresses[entry] = result
-
-            # Ping all entries with valid addresses
-            for ping_group in chunked(entries_with_addresses.items(), GROUP_SIZE):
-                entry_addresses = cast(tuple[DashboardEntry, list[str]], ping_group)
-
-                results = await asyncio.gather(
-                    *(
-                        async_ping(addresses[0], privileged=privileged)
-                        for _, addresses in entry_addresses
-                    ),
-                    return_exceptions=True,
-                )
-
-                for entry_addresses, result in zip(entry_addresses, results):
-                    if isinstance(result, Exception):
-                        ping_result = False
-                    elif isinstance(result, BaseException):
-                        raise result
-                    else:
-                        host: Host = result
-                        ping_result = host.is_alive
-                    entry, _ = entry_addresses
-                    entries.async_set_state(entry, bool_to_entry_state(ping_result))
+            now = time.monotonic()
+            if ping_request.is_set():
+                ping_request.clear()
+                active_until = now + ACTIVE_TIMEOUT
+            elif now >= active_until:
+                return
+
+            self._wakeup.clear()
+            next_deadline = self._async_start_due_probes(now, privileged)
+            try:
+                async with async_timeout(
+                    min(next_deadline - now, active_until - now, MAX_SLEEP)
+                ):
+                    await self._wakeup.wait()
+            except asyncio.TimeoutError:
+                pass
+
+    def _async_start_due_probes(self, now: float, privileged: bool) -> float:
+        """Start probing the due hosts, return when to check again."""
+        entries = DASHBOARD.entries
+        queue = self._queue
+        in_flight = self._in_flight
+        while queue and len(in_flight) < MAX_IN_FLIGHT:
+            deadline, _, entry = queue[0]
+            if deadline > now:
+                return deadline
+            heapq.heappop(queue)
+            if self._deadlines.get(entry) != deadline:
+                continue
+            del self._deadlines[entry]
+            if entries.get(entry.path) is not entry:
+                # The entry was removed
+                self._intervals.pop(entry, None)
+                continue
+            if entry.address is None:
+                # Probed again once the entry is updated with an address
+                continue
+            if entry in in_flight:
+                # Rescheduled when the running probe finishes
+                continue
+            in_flight[entry] = self._loop.create_task(
+                self._async_probe(entry, privileged)
+            )
+        self.stats.max_in_flight = max(self.stats.max_in_flight, len(in_flight))
+        # A finishing probe wakes the scheduler up early
+        return now + MAX_SLEEP
+
+    async def _async_probe(self, entry: DashboardEntry, privileged: bool) -> None:
+        """Probe a single host and schedule its next probe."""
+        try:
+            state = await self._async_probe_state(entry, privileged)
+        except Exception:  # pylint: disable=broad-except
+            # The host is probed again like one that cannot be resolved
+            _LOGGER.exception("Error probing %s", entry.address)
+            self.stats.errors += 1
+            state = EntryState.UNKNOWN
+        finally:
+            del self._in_flight[entry]
+            self._wakeup.set()
+        self._async_set_result(entry, state)
+
+    async def _async_probe_state(
+        self, entry: DashboardEntry, privileged: bool
+    ) -> EntryState:
+        """Return the state of a single host."""
+        stats = self.stats
+        stats.probes += 1
+        addresses = await DASHBOARD.resolver.async_resolve(entry.address)
+        if isinstance(addresses, Exception):
+            stats.errors += 1
+            return EntryState.UNKNOWN
+        try:
+            host: Host = await async_ping(
+                addresses[0],
+                count=PROBE_COUNT,
+                interval=PROBE_INTERVAL,
+                timeout=PROBE_TIMEOUT,
+                privileged=privileged,
+            )
+        except Exception:  # pylint: disable=broad-except
+            stats.errors += 1
+            return EntryState.OFFLINE
+        if host.is_alive:
+            stats.total_latency += host.avg_rtt
+            stats.max_latency = max(stats.max_latency, host.avg_rtt)
+        else:
+            stats.timeouts += 1
+        return bool_to_entry_state(host.is_alive)
+
+    def _async_set_result(self, entry: DashboardEntry, state: EntryState) -> None:
+        """Set the state of an entry and schedule its next probe."""
+        if entry.state not in (state, EntryState.UNKNOWN):
+            interval = RECHECK_INTERVAL
+        elif state == EntryState.ONLINE:
+            interval = ONLINE_INTERVAL
+        else:
+            # Back off for hosts that stay offline
+            interval = min(
+                max(self._intervals.get(entry, 0.0), ONLINE_INTERVAL / 2) * 2,
+                OFFLINE_MAX_INTERVAL,
+            )
+        self._intervals[entry] = interval
+        if entry not in self._deadlines:
+            self._schedule(entry, time.monotonic() + interval)
+        DASHBOARD.entries.async_set_state(entry, state)
 
 
 async def _can_use_icmp_lib_with_privilege() -> None | bool:
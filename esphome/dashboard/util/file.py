@@ -1,5 +1,7 @@
+import gzip
 import logging
 import os
+import shutil
 import tempfile
 from pathlib import Path
 
@@ -61,3 +63,48 @@ def write_file(
                     filename,
                     err,
                 )
+
+
+def _is_gzip_copy(gz_path: str, stat: os.stat_result) -> bool:
+    """Return if gz_path is the gzip copy of a file with the given stat."""
+    try:
+        if os.stat(gz_path).st_mtime_ns != stat.st_mtime_ns:
+            return False
+        with open(gz_path, "rb") as gz_file:
+            # The gzip trailer ends with the size of the uncompressed data
+            gz_file.seek(-4, os.SEEK_END)
+            size = int.from_bytes(gz_file.read(4), "little")
+    except OSError:
+        return False
+    return size == stat.st_size & 0xFFFFFFFF
+
+
+def gzip_file_cached(path: str) -> str:
+    """Return the path of a gzip compressed copy of a file.
+
+    The copy is stored next to the file with the modification time of the file
+    and is only compressed again once the size or modification time changes.
+    """
+    gz_path = f"{path}.gz"
+    stat = os.stat(path)
+    if _is_gzip_copy(gz_path, stat):
+        return gz_path
+
+    tmp_filename = ""
+    try:
+        with open(path, "rb") as source, tempfile.NamedTemporaryFile(
+            mode="wb", dir=os.path.dirname(path), delete=False
+        ) as fdesc:
+            tmp_filename = fdesc.name
+            with gzip.GzipFile(
+                filename="", mode="wb", compresslevel=9, fileobj=fdesc, mtime=0
+            ) as gz_file:
+                shutil.copyfileobj(source, gz_file, 64 * 1024)
+        # If the file changes while it is compressed the modification time
+        # no longer matches and the copy is compressed again on the next call
+        os.utime(tmp_filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(tmp_filename, gz_path)
+    finally:
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+    return gz_path
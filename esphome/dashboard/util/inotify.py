@@ -0,0 +1,136 @@
+"""Minimal inotify based directory watcher for the dashboard event loop."""
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+from typing import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class DirectoryWatcher:
+    """Watch the files directly inside some directories with inotify.
+
+    The callback is called on the event loop with the directory and the name of
+    the file that changed. The name is None if any file in the directory may
+    have changed, for example because events were lost.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        callback: Callable[[str, str | None], None],
+    ) -> None:
+        """Initialize the DirectoryWatcher."""
+        self._loop = loop
+        self._callback = callback
+        self._libc: ctypes.CDLL | None = None
+        self._fd: int | None = None
+        self._watches: dict[int, str] = {}
+
+    def start(self) -> bool:
+        """Start watching, return False if inotify is not available."""
+        if (libc := _load_libc()) is None:
+            return False
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            _LOGGER.debug("inotify_init1 failed: %s", os.strerror(ctypes.get_errno()))
+            return False
+        self._libc = libc
+        self._fd = fd
+        self._loop.add_reader(fd, self._read_events)
+        return True
+
+    def add_watch(self, directory: str) -> bool:
+        """Watch the given directory, return False if that failed."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            _LOGGER.debug(
+                "Could not watch %s: %s",
+                directory,
+                os.strerror(ctypes.get_errno()),
+            )
+            return False
+        # Watching a directory twice returns the same descriptor, keep its name
+        self._watches.setdefault(wd, directory)
+        return True
+
+    def stop(self) -> None:
+        """Stop watching."""
+        if self._fd is None:
+            return
+        self._loop.remove_reader(self._fd)
+        os.close(self._fd)
+        self._fd = None
+        self._watches.clear()
+
+    def _read_events(self) -> None:
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                _LOGGER.debug("inotify queue overflowed, rescanning")
+                for directory in set(self._watches.values()):
+                    self._callback(directory, None)
+                continue
+            if (directory := self._watches.get(wd)) is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._watches[wd]
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                self._callback(directory, None)
+                continue
+            self._callback(directory, os.fsdecode(name))
@@ -4,12 +4,10 @@ import asyncio
 import base64
 import datetime
 import functools
-import gzip
 import hashlib
 import json
 import logging
 import os
-import time
 import secrets
 import shutil
 import subprocess
@@ -30,19 +28,18 @@ import tornado.process
 import tornado.queues
 import tornado.web
 import tornado.websocket
-import yaml
 from tornado.log import access_log
-from yaml.nodes import Node
 
 from esphome import const, platformio_api, yaml_util
 from esphome.helpers import get_bool_env, mkdir_p
 from esphome.storage_json import StorageJSON, ext_storage_path, trash_storage_path
 from esphome.util import get_serial_ports, shlex_quote
-from esphome.yaml_util import FastestAvailableSafeLoader
 
 from .core import DASHBOARD
 from .entries import EntryState, entry_state_to_bool
-from .util.file import write_file
+from .jobs import PRIORITY_BUILD, PRIORITY_DEVICE, DashboardJob
+from .output import READ_CHUNK_SIZE, OutputRelay
+from .util.file import gzip_file_cached, write_file
 from .util.subprocess import async_run_system_command
 from .util.text import friendly_name_slugify
 
@@ -58,6 +55,10 @@ COOKIE_AUTHENTICATED_YES = b"yes"
 
 AUTH_COOKIE_NAME = "authenticated"
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Compressions of downloads that are in progress, by path
+_GZIP_FUTURES: dict[str, asyncio.Future[str]] = {}
+
 
 settings = DASHBOARD.settings
 
@@ -150,6 +151,9 @@ def websocket_method(name):
 class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
     """Base class for ESPHome websocket commands."""
 
+    # Commands with a priority run as jobs of the dashboard's job scheduler
+    job_priority: int | None = None
+
     def __init__(
         self,
         application: tornado.web.Application,
@@ -161,6 +165,8 @@ class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
         self._proc = None
         self._queue = None
         self._is_closed = False
+        self._job: DashboardJob | None = None
+        self._unsubscribe_job: Callable[[], None] | None = None
         # Windows doesn't support non-blocking pipes,
         # use Popen() with a reading thread instead
         self._use_popen = os.name == "nt"
@@ -189,10 +195,18 @@ class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
 
     @websocket_method("spawn")
     async def handle_spawn(self, json_message: dict[str, Any]) -> None:
-        if self._proc is not None:
+        if self._proc is not None or self._job is not None:
             # spawn can only be called once
             return
         command = await self.build_command(json_message)
+        if self.job_priority is not None:
+            if self._is_closed:
+                return
+            self._job = DASHBOARD.jobs.async_submit(
+                command, json_message.get("configuration"), self.job_priority
+            )
+            self._unsubscribe_job = self._job.async_subscribe(self._send_output)
+            return
         _LOGGER.info("Running command '%s'", " ".join(shlex_quote(x) for x in command))
 
         if self._use_popen:
@@ -215,42 +229,56 @@ class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
                 stdin=tornado.process.Subprocess.STREAM,
                 close_fds=False,
             )
-            self._proc.set_exit_callback(self._proc_on_exit)
 
         tornado.ioloop.IOLoop.current().spawn_callback(self._redirect_stdout)
 
+    def _send_output(self, message: str) -> None:
+        """Send a serialized output message, output may outlive the socket."""
+        try:
+            self.write_message(message)
+        except tornado.websocket.WebSocketClosedError:
+            self.on_close()
+
     @property
     def is_process_active(self) -> bool:
         return self._proc is not None and self._proc.returncode is None
 
     @websocket_method("stdin")
     async def handle_stdin(self, json_message: dict[str, Any]) -> None:
-        if not self.is_process_active:
+        if not self.is_process_active and self._job is None:
             return
         text: str = json_message["data"]
         data = text.encode("utf-8", "replace")
         _LOGGER.debug("< stdin: %s", data)
-        self._proc.stdin.write(data)
+        if self._job is not None:
+            self._job.async_write_stdin(data)
+        else:
+            self._proc.stdin.write(data)
 
     @tornado.gen.coroutine
     def _redirect_stdout(self) -> None:
-        reg = b"[\n\r]"
+        relay = OutputRelay(self._send_output)
 
         while True:
             try:
                 if self._use_popen:
                     data: bytes = yield self._queue.get()
                     if data is None:
-                        self._proc_on_exit(self._proc.poll())
+                        returncode = self._proc.poll()
                         break
                 else:
-                    data: bytes = yield self._proc.stdout.read_until_regex(reg)
+                    data: bytes = yield self._proc.stdout.read_bytes(
+                        READ_CHUNK_SIZE, partial=True
+                    )
             except tornado.iostream.StreamClosedError:
+                returncode = yield self._proc.wait_for_exit(raise_error=False)
                 break
 
-            text = data.decode("utf-8", "replace")
-            _LOGGER.debug("> stdout: %s", text)
-            self.write_message({"event": "line", "data": text})
+            relay.feed(data)
+
+        # The exit is sent after the rest of the output
+        relay.close()
+        self._proc_on_exit(returncode)
 
     def _stdout_thread(self) -> None:
         if not self._use_popen:
@@ -272,6 +300,10 @@ class EsphomeCommandWebSocket(tornado.websocket.WebSocketHandler):
             self.write_message({"event": "exit", "code": returncode})
 
     def on_close(self) -> None:
+        if self._unsubscribe_job is not None:
+            # The job is cancelled when no client is left
+            self._unsubscribe_job()
+            self._unsubscribe_job = None
         # Check if proc exists (if 'start' has been run)
         if self.is_process_active:
             _LOGGER.debug("Terminating process")
@@ -307,24 +339,13 @@ class EsphomePortCommandWebSocket(EsphomeCommandWebSocket):
             and entry.loaded_integrations
             and "api" in entry.loaded_integrations
         ):
-            if (mdns := dashboard.mdns_status) and (
-                address := await mdns.async_resolve_host(entry.name)
-            ):
-                # Use the IP address if available but only
-                # if the API is loaded and the device is online
-                # since MQTT logging will not work otherwise
-                port = address
-            elif (
-                entry.address
-                and (
-                    address_list := await dashboard.dns_cache.async_resolve(
-                        entry.address, time.monotonic()
-                    )
-                )
-                and not isinstance(address_list, Exception)
-            ):
-                # If mdns is not available, try to use the DNS cache
-                port = address_list[0]
+            # Use the IP address if available but only if the API is loaded
+            # and the device is online since MQTT logging will not work otherwise
+            host = entry.address or f"{entry.name}.local"
+            addresses = await dashboard.resolver.async_resolve(host)
+            if not isinstance(addresses, Exception):
+                port = addresses[0]
+            await dashboard.resolver.async_save()
 
         return [
             *DASHBOARD_COMMAND,
@@ -367,18 +388,23 @@ class EsphomeRenameHandler(EsphomeCommandWebSocket):
 
 
 class EsphomeUploadHandler(EsphomePortCommandWebSocket):
+    job_priority = PRIORITY_DEVICE
+
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         """Build the command to run."""
         return await self.build_device_command(["upload"], json_message)
 
 
 class EsphomeRunHandler(EsphomePortCommandWebSocket):
+    # Not a job, it streams the device logs until the window is closed
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         """Build the command to run."""
         return await self.build_device_command(["run"], json_message)
 
 
 class EsphomeCompileHandler(EsphomeCommandWebSocket):
+    job_priority = PRIORITY_BUILD
+
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         config_file = settings.rel_path(json_message["configuration"])
         command = [*DASHBOARD_COMMAND, "compile"]
@@ -404,6 +430,8 @@ class EsphomeCleanMqttHandler(EsphomeCommandWebSocket):
 
 
 class EsphomeCleanHandler(EsphomeCommandWebSocket):
+    job_priority = PRIORITY_BUILD
+
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         config_file = settings.rel_path(json_message["configuration"])
         return [*DASHBOARD_COMMAND, "clean", config_file]
@@ -420,10 +448,76 @@ class EsphomeAceEditorHandler(EsphomeCommandWebSocket):
 
 
 class EsphomeUpdateAllHandler(EsphomeCommandWebSocket):
+    # Not a job, it would take a slot for the whole update, its steps are
+    # limited by update-all --jobs
     async def build_command(self, json_message: dict[str, Any]) -> list[str]:
         return [*DASHBOARD_COMMAND, "update-all", settings.config_dir]
 
 
+class EsphomeEventsWebSocket(tornado.websocket.WebSocketHandler):
+    """Push the dashboard entries and their changes to the frontend.
+
+    A snapshot of all entries is sent when the connection is opened, followed
+    by batched deltas with the added, updated and removed entries and the
+    state changes.
+    """
+
+    def __init__(
+        self,
+        application: tornado.web.Application,
+        request: tornado.httputil.HTTPServerRequest,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the websocket."""
+        super().__init__(application, request, **kwargs)
+        self._unsubscribe: Callable[[], None] | None = None
+
+    async def open(  # pylint: disable=invalid-overridden-method
+        self, *args: str, **kwargs: str
+    ) -> None:
+        """Send the snapshot and subscribe to the deltas."""
+        if not is_authenticated(self):
+            self.close()
+            return
+        self.set_nodelay(True)
+        dashboard = DASHBOARD
+        await dashboard.entries.async_request_update_entries()
+        if self.ws_connection is None:
+            return
+        self._request_ping()
+        events = dashboard.events
+        self.write_message(events.async_snapshot())
+        self._unsubscribe = events.async_subscribe(self._send_delta)
+
+    def _send_delta(self, message: str) -> None:
+        try:
+            self.write_message(message)
+        except tornado.websocket.WebSocketClosedError:
+            self.on_close()
+
+    def _request_ping(self) -> None:
+        DASHBOARD.ping_request.set()
+        if settings.status_use_mqtt:
+            DASHBOARD.mqtt_ping_request.set()
+
+    def on_message(self, message: str) -> None:
+        """Handle a message from the frontend."""
+        try:
+            json_message = json.loads(message)
+        except ValueError:
+            _LOGGER.warning("Ignoring invalid message on the events websocket")
+            return
+        if isinstance(json_message, dict) and json_message.get("type") == "ping":
+            # Refresh the online state, the changes are sent as deltas
+            self._request_ping()
+
+    def on_close(self) -> None:
+        """Unsubscribe from the deltas."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+
 class SerialPortRequestHandler(BaseHandler):
     @authenticated
     async def get(self) -> None:
@@ -571,14 +665,39 @@ class DownloadListRequestHandler(BaseHandler):
         return
 
 
+def _parse_byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a Range header with a single byte range into start and end offsets.
+
+    The end is exclusive, start >= end if the range is not satisfiable.
+    Returns None for headers that are not a single valid byte range.
+    """
+    unit, _, byte_range = header.partition("=")
+    start_str, sep, end_str = byte_range.strip().partition("-")
+    if unit.strip() != "bytes" or not sep or "," in byte_range:
+        return None
+    try:
+        if not start_str:
+            # The last bytes of the file
+            return max(size - int(end_str), 0), size
+        start = int(start_str)
+        end = int(end_str) + 1 if end_str else max(size, start + 1)
+    except ValueError:
+        return None
+    if start < 0 or end <= start:
+        return None
+    return start, min(end, size)
+
+
 class DownloadBinaryRequestHandler(BaseHandler):
-    def _load_file(self, path: str, compressed: bool) -> bytes:
-        """Load a file from disk and compress it if requested."""
-        with open(path, "rb") as f:
-            data = f.read()
-            if compressed:
-                return gzip.compress(data, 9)
-            return data
+    async def _async_gzip(self, path: str) -> str:
+        """Return the path of the compressed file, compressing it once."""
+        if (future := _GZIP_FUTURES.get(path)) is None:
+            future = asyncio.get_running_loop().run_in_executor(
+                None, gzip_file_cached, path
+            )
+            _GZIP_FUTURES[path] = future
+            future.add_done_callback(lambda _: _GZIP_FUTURES.pop(path, None))
+        return await asyncio.shield(future)
 
     @authenticated
     @bind_config
@@ -609,15 +728,14 @@ class DownloadBinaryRequestHandler(BaseHandler):
         path = os.path.join(path, file_name)
 
         if not Path(path).is_file():
-            args = ["esphome", "idedata", settings.rel_path(configuration)]
-            rc, stdout, _ = await async_run_system_command(args)
-
-            if rc != 0:
-                self.send_error(404 if rc == 2 else 500)
+            # The idedata is cached by every compile, no need to run PlatformIO
+            idedata = await loop.run_in_executor(
+                None, platformio_api.load_cached_idedata, storage_json.name
+            )
+            if idedata is None:
+                self.send_error(404)
                 return
 
-            idedata = platformio_api.IDEData(json.loads(stdout))
-
             found = False
             for image in idedata.extra_flash_images:
                 if image.path.endswith(file_name):
@@ -630,20 +748,63 @@ class DownloadBinaryRequestHandler(BaseHandler):
                 self.send_error(404)
                 return
 
-        download_name = download_name + ".gz" if compressed else download_name
-
-        self.set_header("Content-Type", "application/octet-stream")
-        self.set_header(
-            "Content-Disposition", f'attachment; filename="{download_name}"'
-        )
-        self.set_header("Cache-Control", "no-cache")
         if not Path(path).is_file():
             self.send_error(404)
             return
 
-        data = await loop.run_in_executor(None, self._load_file, path, compressed)
-        self.write(data)
+        try:
+            if compressed:
+                path = await self._async_gzip(path)
+            file = await loop.run_in_executor(None, open, path, "rb")
+        except OSError:
+            self.send_error(404)
+            return
 
+        download_name = download_name + ".gz" if compressed else download_name
+        with file:
+            stat = os.fstat(file.fileno())
+            etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+            self.set_header("Content-Type", "application/octet-stream")
+            self.set_header(
+                "Content-Disposition", f'attachment; filename="{download_name}"'
+            )
+            self.set_header("Cache-Control", "no-cache")
+            self.set_header("Accept-Ranges", "bytes")
+            self.set_header("Etag", etag)
+            if self.check_etag_header():
+                self.set_status(304)
+                return
+
+            start, end = 0, stat.st_size
+            if (range_header := self.request.headers.get("Range")) and (
+                self.request.headers.get("If-Range", etag) == etag
+            ):
+                if (byte_range := _parse_byte_range(range_header, end)) is not None:
+                    start, end = byte_range
+                    if start >= end:
+                        self.set_status(416)
+                        self.set_header("Content-Range", f"bytes */{stat.st_size}")
+                        return
+                    self.set_status(206)
+                    self.set_header(
+                        "Content-Range", f"bytes {start}-{end - 1}/{stat.st_size}"
+                    )
+
+            self.set_header("Content-Length", end - start)
+            await loop.run_in_executor(None, file.seek, start)
+            remaining = end - start
+            try:
+                while remaining > 0:
+                    chunk = await loop.run_in_executor(
+                        None, file.read, min(DOWNLOAD_CHUNK_SIZE, remaining)
+                    )
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    self.write(chunk)
+                    await self.flush()
+            except tornado.iostream.StreamClosedError:
+                return
         self.finish()
 
 
@@ -974,20 +1135,6 @@ class SecretKeysRequestHandler(BaseHandler):
         self.write(json.dumps(secret_keys))
 
 
-class SafeLoaderIgnoreUnknown(FastestAvailableSafeLoader):
-    def ignore_unknown(self, node: Node) -> str:
-        return f"{node.tag} {node.value}"
-
-    def construct_yaml_binary(self, node: Node) -> str:
-        return super().construct_yaml_binary(node).decode("ascii")
-
-
-SafeLoaderIgnoreUnknown.add_constructor(None, SafeLoaderIgnoreUnknown.ignore_unknown)
-SafeLoaderIgnoreUnknown.add_constructor(
-    "tag:yaml.org,2002:binary", SafeLoaderIgnoreUnknown.construct_yaml_binary
-)
-
-
 class JsonConfigRequestHandler(BaseHandler):
     @authenticated
     @bind_config
@@ -997,17 +1144,13 @@ class JsonConfigRequestHandler(BaseHandler):
             self.send_error(404)
             return
 
-        args = ["esphome", "config", filename, "--show-secrets"]
-
-        rc, stdout, _ = await async_run_system_command(args)
-
-        if rc != 0:
+        data = await DASHBOARD.json_config.async_render(filename)
+        if data is None:
             self.send_error(422)
             return
 
-        data = yaml.load(stdout, Loader=SafeLoaderIgnoreUnknown)
         self.set_header("content-type", "application/json")
-        self.write(json.dumps(data))
+        self.write(data)
         self.finish()
 
 
@@ -1113,6 +1256,7 @@ def make_app(debug=get_bool_env(ENV_DEV)) -> tornado.web.Application:
             (f"{rel}download.bin", DownloadBinaryRequestHandler),
             (f"{rel}serial-ports", SerialPortRequestHandler),
             (f"{rel}ping", PingRequestHandler),
+            (f"{rel}events", EsphomeEventsWebSocket),
             (f"{rel}delete", DeleteRequestHandler),
             (f"{rel}undo-delete", UndoDeleteRequestHandler),
             (f"{rel}wizard", WizardRequestHandler),
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-import gzip
 import hashlib
 import io
 import logging
+import os
 import random
 import socket
 import sys
+import tempfile
 import time
+import zlib
 
 from esphome.core import EsphomeError
-from esphome.helpers import is_ip_address, resolve_ip_address
+from esphome.helpers import get_int_env, is_ip_address, resolve_ip_address
 
 RESPONSE_OK = 0x00
 RESPONSE_REQUEST_AUTH = 0x01
@@ -49,6 +51,9 @@ FEATURE_SUPPORTS_COMPRESSION = 0x01
 UPLOAD_BLOCK_SIZE = 8192
 UPLOAD_BUFFER_SIZE = UPLOAD_BLOCK_SIZE * 8
 
+# Number of chunks that may be sent before their acknowledgement is received
+ENV_OTA_UPLOAD_WINDOW = "ESPHOME_OTA_UPLOAD_WINDOW"
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -193,11 +198,51 @@ def send_check(sock, data, msg):
         raise OTAError(f"Error sending {msg}: {err}") from err
 
 
+def _file_size(file_handle: io.IOBase) -> int:
+    file_handle.seek(0, os.SEEK_END)
+    size = file_handle.tell()
+    file_handle.seek(0)
+    return size
+
+
+def _prepare_upload(
+    file_handle: io.IOBase, compress: bool
+) -> tuple[io.IOBase, int, str]:
+    """Return a file positioned at the contents to upload, their size and MD5.
+
+    The device needs the size and MD5 before the data, so the firmware is
+    compressed into a temporary file in a single pass while hashing the
+    result, instead of compressing it in memory.
+    """
+    md5 = hashlib.md5()
+    buffer = bytearray(UPLOAD_BLOCK_SIZE)
+    view = memoryview(buffer)
+    if not compress:
+        while read := file_handle.readinto(buffer):
+            md5.update(view[:read])
+        return file_handle, _file_size(file_handle), md5.hexdigest()
+
+    upload_file = tempfile.TemporaryFile()
+    # wbits=31 produces a gzip stream
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+    while read := file_handle.readinto(buffer):
+        compressed = compressor.compress(view[:read])
+        md5.update(compressed)
+        upload_file.write(compressed)
+    compressed = compressor.flush()
+    md5.update(compressed)
+    upload_file.write(compressed)
+    return upload_file, _file_size(upload_file), md5.hexdigest()
+
+
 def perform_ota(
-    sock: socket.socket, password: str, file_handle: io.IOBase, filename: str
+    sock: socket.socket,
+    password: str,
+    file_handle: io.IOBase,
+    filename: str,
+    window: int = 1,
 ) -> None:
-    file_contents = file_handle.read()
-    file_size = len(file_contents)
+    file_size = _file_size(file_handle)
     _LOGGER.info("Uploading %s (%s bytes)", filename, file_size)
 
     # Enable nodelay, we need it for phase 1
@@ -215,11 +260,10 @@ def perform_ota(
         sock, 1, "features", [RESPONSE_HEADER_OK, RESPONSE_SUPPORTS_COMPRESSION]
     )[0]
 
-    if features == RESPONSE_SUPPORTS_COMPRESSION:
-        upload_contents = gzip.compress(file_contents, compresslevel=9)
-        _LOGGER.info("Compressed to %s bytes", len(upload_contents))
-    else:
-        upload_contents = file_contents
+    compress = features == RESPONSE_SUPPORTS_COMPRESSION
+    upload_file, upload_size, upload_md5 = _prepare_upload(file_handle, compress)
+    if compress:
+        _LOGGER.info("Compressed to %s bytes", upload_size)
 
     (auth,) = receive_exactly(
         sock, 1, "auth", [RESPONSE_REQUEST_AUTH, RESPONSE_AUTH_OK]
@@ -246,7 +290,6 @@ def perform_ota(
         send_check(sock, result, "auth result")
         receive_exactly(sock, 1, "auth result", RESPONSE_AUTH_OK)
 
-    upload_size = len(upload_contents)
     upload_size_encoded = [
         (upload_size >> 24) & 0xFF,
         (upload_size >> 16) & 0xFF,
@@ -256,7 +299,6 @@ def perform_ota(
     send_check(sock, upload_size_encoded, "binary size")
     receive_exactly(sock, 1, "binary size", RESPONSE_UPDATE_PREPARE_OK)
 
-    upload_md5 = hashlib.md5(upload_contents).hexdigest()
     _LOGGER.debug("MD5 of upload is %s", upload_md5)
 
     send_check(sock, upload_md5, "file checksum")
@@ -272,23 +314,43 @@ def perform_ota(
     sock.settimeout(30.0)
     start_time = time.perf_counter()
 
+    # Version 2 devices acknowledge every UPLOAD_BLOCK_SIZE bytes and the final
+    # partial block. Up to `window` chunks are sent before waiting for their
+    # acknowledgement, so that the upload isn't bound by the round trip time.
+    total_chunks = -(-upload_size // UPLOAD_BLOCK_SIZE)
+    chunks_acknowledged = 0
     offset = 0
+    buffer = bytearray(UPLOAD_BLOCK_SIZE)
+    view = memoryview(buffer)
     progress = ProgressBar()
-    while True:
-        chunk = upload_contents[offset : offset + UPLOAD_BLOCK_SIZE]
-        if not chunk:
-            break
-        offset += len(chunk)
+    try:
+        while offset < upload_size:
+            read = upload_file.readinto(buffer)
+            if not read:
+                raise OTAError("Error reading data: file ended unexpectedly")
+            offset += read
 
-        try:
-            sock.sendall(chunk)
+            sock.sendall(view[:read])
             if version >= OTA_VERSION_2_0:
+                if offset < upload_size:
+                    chunks_sent = offset // UPLOAD_BLOCK_SIZE
+                else:
+                    chunks_sent = total_chunks
+                while chunks_sent - chunks_acknowledged >= window:
+                    receive_exactly(sock, 1, "chunk OK", RESPONSE_CHUNK_OK)
+                    chunks_acknowledged += 1
+
+            progress.update(offset / upload_size)
+        if version >= OTA_VERSION_2_0:
+            while chunks_acknowledged < total_chunks:
                 receive_exactly(sock, 1, "chunk OK", RESPONSE_CHUNK_OK)
-        except OSError as err:
-            sys.stderr.write("\n")
-            raise OTAError(f"Error sending data: {err}") from err
-
-        progress.update(offset / upload_size)
+                chunks_acknowledged += 1
+    except OSError as err:
+        sys.stderr.write("\n")
+        raise OTAError(f"Error sending data: {err}") from err
+    finally:
+        if upload_file is not file_handle:
+            upload_file.close()
     progress.done()
 
     # Enable nodelay for last checks
@@ -338,7 +400,13 @@ def run_ota_impl_(remote_host, remote_port, password, filename):
 
     with open(filename, "rb") as file_handle:
         try:
-            perform_ota(sock, password, file_handle, filename)
+            perform_ota(
+                sock,
+                password,
+                file_handle,
+                filename,
+                window=max(get_int_env(ENV_OTA_UPLOAD_WINDOW, 1), 1),
+            )
         except OTAError as err:
             _LOGGER.error(str(err))
             return 1
@@ -1,13 +1,13 @@
 import codecs
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 
 import logging
 import os
 import platform
 from pathlib import Path
 from typing import Union
+from collections.abc import Iterable
 import tempfile
-from urllib.parse import urlparse
 import re
 
 _LOGGER = logging.getLogger(__name__)
@@ -103,49 +103,10 @@ def is_ip_address(host):
         return False
 
 
-def _resolve_with_zeroconf(host):
-    from esphome.core import EsphomeError
-    from esphome.zeroconf import EsphomeZeroconf
-
-    try:
-        zc = EsphomeZeroconf()
-    except Exception as err:
-        raise EsphomeError(
-            "Cannot start mDNS sockets, is this a docker container without "
-            "host network mode?"
-        ) from err
-    try:
-        info = zc.resolve_host(f"{host}.")
-    except Exception as err:
-        raise EsphomeError(f"Error resolving mDNS hostname: {err}") from err
-    finally:
-        zc.close()
-    if info is None:
-        raise EsphomeError(
-            "Error resolving address with mDNS: Did not respond. "
-            "Maybe the device is offline."
-        )
-    return info
-
-
 def resolve_ip_address(host):
-    from esphome.core import EsphomeError
-    import socket
-
-    errs = []
+    from esphome.resolver import get_resolver
 
-    if host.endswith(".local"):
-        try:
-            return _resolve_with_zeroconf(host)
-        except EsphomeError as err:
-            errs.append(str(err))
-
-    try:
-        host_url = host if (urlparse(host).scheme != "") else "http://" + host
-        return socket.gethostbyname(urlparse(host_url).hostname)
-    except OSError as err:
-        errs.append(str(err))
-        raise EsphomeError(f"Error resolving IP address: {', '.join(errs)}") from err
+    return get_resolver().resolve(host)
 
 
 def get_bool_env(var, default=False):
@@ -191,7 +152,7 @@ def read_file(path):
         raise EsphomeError(f"Error reading file {path}: {err}") from err
 
 
-def _write_file(path: Union[Path, str], text: Union[str, bytes]):
+def _write_file(path: Union[Path, str], text: Union[str, bytes], mode: int = 0o644):
     """Atomically writes `text` to the given path.
 
     Automatically creates all parent directories.
@@ -213,7 +174,7 @@ def _write_file(path: Union[Path, str], text: Union[str, bytes]):
             tmp_path = f_handle.name
             f_handle.write(data)
         # Newer tempfile implementations create the file with mode 0o600
-        os.chmod(tmp_path, 0o644)
+        os.chmod(tmp_path, mode)
         # If destination exists, will be overwritten
         os.replace(tmp_path, path)
     finally:
@@ -224,9 +185,9 @@ def _write_file(path: Union[Path, str], text: Union[str, bytes]):
                 _LOGGER.error("Write file cleanup failed: %s", err)
 
 
-def write_file(path: Union[Path, str], text: str):
+def write_file(path: Union[Path, str], text: str, mode: int = 0o644):
     try:
-        _write_file(path, text)
+        _write_file(path, text, mode)
     except OSError as err:
         from esphome.core import EsphomeError
 
@@ -250,6 +211,78 @@ def write_file_if_changed(path: Union[Path, str], text: str) -> bool:
     return True
 
 
+def write_chunks_if_changed(path: Union[Path, str], chunks: Iterable[str]) -> bool:
+    """Stream text chunks to the given path, but not if the contents match already.
+
+    Unlike write_file_if_changed the contents are never held in memory as a
+    whole: the chunks are written to a temporary file which is only moved into
+    place if it differs from the existing file.
+
+    Returns true if the file was changed.
+    """
+    if not isinstance(path, Path):
+        path = Path(path)
+
+    tmp_path = None
+    try:
+        path.parent.mkdir(exist_ok=True, parents=True)
+        with tempfile.NamedTemporaryFile(
+            mode="wb", dir=path.parent, delete=False
+        ) as f_handle:
+            tmp_path = f_handle.name
+            for chunk in chunks:
+                f_handle.write(chunk.encode())
+        if file_compare(tmp_path, path):
+            return False
+        # Newer tempfile implementations create the file with mode 0o600
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+        return True
+    except OSError as err:
+        from esphome.core import EsphomeError
+
+        raise EsphomeError(f"Could not write file at {path}") from err
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError as err:
+                _LOGGER.error("Write file cleanup failed: %s", err)
+
+
+@contextmanager
+def file_lock(path: Union[Path, str]):
+    """Hold an exclusive lock on the given file, blocking until other processes release it."""
+    if not isinstance(path, Path):
+        path = Path(path)
+    path.parent.mkdir(exist_ok=True, parents=True)
+
+    with open(path, "a+b") as f_handle:
+        if IS_WINDOWS:
+            import msvcrt  # pylint: disable=import-error
+
+            f_handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f_handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 seconds, keep waiting
+                    continue
+        else:
+            import fcntl
+
+            fcntl.flock(f_handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if IS_WINDOWS:
+                f_handle.seek(0)
+                msvcrt.locking(f_handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f_handle.fileno(), fcntl.LOCK_UN)
+
+
 def copy_file_if_changed(src: os.PathLike, dst: os.PathLike) -> None:
     import shutil
 
@@ -313,20 +346,49 @@ def file_compare(path1: os.PathLike, path2: os.PathLike) -> bool:
                 return True
 
 
+# Heap types of the builtin types, they are module attributes so that values with
+# added classes can be pickled
+EInt = type("EInt", (int,), {})
+EFloat = type("EFloat", (float,), {})
+EStr = type("EStr", (str,), {})
+EDict = type("EDict", (dict,), {})
+EList = type("EList", (list,), {})
+
 # A dict of types that need to be converted to heaptypes before a class can be added
 # to the object
 _TYPE_OVERLOADS = {
-    int: type("EInt", (int,), {}),
-    float: type("EFloat", (float,), {}),
-    str: type("EStr", (str,), {}),
-    dict: type("EDict", (dict,), {}),
-    list: type("EList", (list,), {}),
+    int: EInt,
+    float: EFloat,
+    str: EStr,
+    dict: EDict,
+    list: EList,
 }
 
 # cache created classes here
 _CLASS_LOOKUP = {}
 
 
+def get_added_class(orig_cls, cls):
+    """Return the class add_class_to_obj() gives values of orig_cls."""
+    key = (orig_cls, cls)
+    new_cls = _CLASS_LOOKUP.get(key)
+    if new_cls is None:
+        new_cls = orig_cls.__class__(orig_cls.__name__, (orig_cls, cls), {})
+        _CLASS_LOOKUP[key] = new_cls
+    return new_cls
+
+
+def split_added_class(new_cls):
+    """Return the classes a class created by add_class_to_obj() combines.
+
+    Returns None for other classes.
+    """
+    bases = new_cls.__bases__
+    if len(bases) == 2 and _CLASS_LOOKUP.get(bases) is new_cls:
+        return bases
+    return None
+
+
 def add_class_to_obj(value, cls):
     """Add a class to a python type.
 
@@ -339,13 +401,7 @@ def add_class_to_obj(value, cls):
         return value
 
     try:
-        orig_cls = value.__class__
-        key = (orig_cls, cls)
-        new_cls = _CLASS_LOOKUP.get(key)
-        if new_cls is None:
-            new_cls = orig_cls.__class__(orig_cls.__name__, (orig_cls, cls), {})
-            _CLASS_LOOKUP[key] = new_cls
-        value.__class__ = new_cls
+        value.__class__ = get_added_class(value.__class__, cls)
         return value
     except TypeError:
         # Non heap type, look in overloads dict
@@ -8,8 +8,14 @@ import os
 import re
 import subprocess
 
-from esphome.const import CONF_COMPILE_PROCESS_LIMIT, CONF_ESPHOME, KEY_CORE
+from esphome.const import (
+    CONF_COMPILE_PROCESS_LIMIT,
+    CONF_ESPHOME,
+    ENV_PLATFORMIO_LOCK,
+    KEY_CORE,
+)
 from esphome.core import CORE, EsphomeError
+from esphome.helpers import file_lock
 from esphome.util import run_external_command, run_external_process
 
 _LOGGER = logging.getLogger(__name__)
@@ -102,6 +108,13 @@ def run_platformio_cli_run(config, verbose, *args, **kwargs) -> Union[str, int]:
 
 
 def run_compile(config, verbose):
+    if (lock_path := os.environ.get(ENV_PLATFORMIO_LOCK)) is not None:
+        # Builds running in parallel share the PlatformIO platforms, packages and
+        # toolchains. Install them one build at a time, compiling is safe afterwards.
+        with file_lock(lock_path):
+            rc = run_platformio_cli("pkg", "install", "-d", CORE.build_path)
+        if rc != 0:
+            return rc
     args = []
     if CONF_COMPILE_PROCESS_LIMIT in config[CONF_ESPHOME]:
         args += [f"-j{config[CONF_ESPHOME][CONF_COMPILE_PROCESS_LIMIT]}"]
@@ -125,9 +138,13 @@ def _run_idedata(config):
         raise
 
 
+def _idedata_cache_path(name: str) -> Path:
+    return Path(CORE.relative_internal_path("idedata", f"{name}.json"))
+
+
 def _load_idedata(config):
     platformio_ini = Path(CORE.relative_build_path("platformio.ini"))
-    temp_idedata = Path(CORE.relative_internal_path("idedata", f"{CORE.name}.json"))
+    temp_idedata = _idedata_cache_path(CORE.name)
 
     changed = False
     if not platformio_ini.is_file() or not temp_idedata.is_file():
@@ -160,6 +177,20 @@ def get_idedata(config) -> "IDEData":
     return idedata
 
 
+def load_cached_idedata(name: str) -> Union["IDEData", None]:
+    """Load the idedata cached by the last compile of a device.
+
+    Unlike get_idedata() this never runs PlatformIO, None is returned if the
+    device was not compiled yet.
+    """
+    try:
+        return IDEData(
+            json.loads(_idedata_cache_path(name).read_text(encoding="utf-8"))
+        )
+    except (OSError, ValueError):
+        return None
+
+
 # ESP logs stack trace decoder, based on https://github.com/me-no-dev/EspExceptionDecoder
 ESP8266_EXCEPTION_CODES = {
     0: "Illegal instruction (Is the flash damaged?)",
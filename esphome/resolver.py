@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Union
+from urllib.parse import urlparse
+
+from icmplib import NameLookupError, async_resolve
+
+from esphome.core import CORE, EsphomeError
+from esphome.helpers import is_ip_address, write_file
+
+if sys.version_info >= (3, 11):
+    from asyncio import timeout as async_timeout
+else:
+    from async_timeout import timeout as async_timeout
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds the addresses of a host are cached for
+DEFAULT_TTL = 120.0
+# Seconds a failed lookup is cached for
+NEGATIVE_TTL = 30.0
+MDNS_TIMEOUT = 3.0
+DNS_TIMEOUT = 2.0
+
+CACHE_FILE = "addresses.json"
+CACHE_VERSION = 1
+
+# The addresses of a host, or the error resolving it
+ResultType = Union[list[str], Exception]
+
+
+def _dns_name(host: str) -> str:
+    """Return the host name of a host that may be given as a URL."""
+    url = host if urlparse(host).scheme != "" else f"http://{host}"
+    return urlparse(url).hostname or host
+
+
+class Resolver:
+    """Resolve host names to addresses with a shared cache.
+
+    Host names are resolved concurrently, names ending with .local with mDNS
+    first and then with DNS. Addresses are cached for DEFAULT_TTL and errors
+    for NEGATIVE_TTL, lookups of a host that is already being resolved wait
+    for the running lookup. The addresses are persisted so that the esphome
+    commands run by update-all and the dashboard start with a warm cache.
+    """
+
+    __slots__ = ("path", "mdns", "aiozc", "_cache", "_pending", "_saved", "_lock")
+
+    def __init__(self, path: str | None = None) -> None:
+        """Initialize the Resolver."""
+        self.path = path
+        # Without mDNS, .local names are only resolved with DNS
+        self.mdns = True
+        # The zeroconf instance to use, a temporary one is created for each
+        # batch of .local names without it
+        self.aiozc = None
+        # The wall clock expiry and the result of each host
+        self._cache: dict[str, tuple[float, ResultType]] = {}
+        self._pending: dict[str, asyncio.Future] = {}
+        # The expiry of the addresses last written to path
+        self._saved: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """Load the addresses persisted by another process."""
+        if self.path is None:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as err:
+            _LOGGER.debug("Could not load the address cache %s: %s", self.path, err)
+            return
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return
+        now = time.time()
+        for host, entry in data.get("hosts", {}).items():
+            expires = entry["expires"]
+            if expires <= now:
+                continue
+            cached = self._cache.get(host)
+            if cached is None or cached[0] < expires:
+                self._cache[host] = (expires, list(entry["addresses"]))
+            self._saved[host] = expires
+
+    def _dump(self) -> str | None:
+        """Return the addresses to persist if they changed since the last save."""
+        now = time.time()
+        hosts = {
+            host: (expires, result)
+            for host, (expires, result) in self._cache.items()
+            if expires > now and not isinstance(result, Exception)
+        }
+        saved = self._saved
+        # Unchanged addresses are saved again when half of their TTL passed
+        if hosts.keys() == saved.keys() and all(
+            saved[host] > expires - DEFAULT_TTL / 2
+            for host, (expires, _) in hosts.items()
+        ):
+            return None
+        self._saved = {host: expires for host, (expires, _) in hosts.items()}
+        return json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "hosts": {
+                    host: {"expires": expires, "addresses": addresses}
+                    for host, (expires, addresses) in hosts.items()
+                },
+            }
+        )
+
+    def _write(self, text: str | None) -> None:
+        if text is None or self.path is None:
+            return
+        try:
+            write_file(self.path, text)
+        except EsphomeError as err:
+            _LOGGER.debug("Could not save the address cache: %s", err)
+
+    def save(self) -> None:
+        """Persist the addresses if they changed."""
+        if self.path is not None:
+            with self._lock:
+                text = self._dump()
+            self._write(text)
+
+    async def async_load(self) -> None:
+        """Load the persisted addresses in the executor."""
+        await asyncio.get_running_loop().run_in_executor(None, self.load)
+
+    async def async_save(self) -> None:
+        """Persist the addresses in the executor if they changed."""
+        if self.path is not None and (text := self._dump()) is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._write, text)
+
+    def get_cached(self, host: str) -> ResultType | None:
+        """Return the cached result for a host, or None if it is not cached."""
+        if is_ip_address(host):
+            return [host]
+        if (cached := self._cache.get(host)) is not None and cached[0] > time.time():
+            return cached[1]
+        return None
+
+    async def async_resolve(self, host: str, refresh: bool = False) -> ResultType:
+        """Resolve a host name to a list of addresses."""
+        return (await self.async_resolve_many((host,), refresh))[host]
+
+    async def async_resolve_many(
+        self, hosts: Iterable[str], refresh: bool = False
+    ) -> dict[str, ResultType]:
+        """Resolve many host names concurrently.
+
+        With refresh, the hosts are resolved again even if they are cached.
+        """
+        results: dict[str, ResultType] = {}
+        lookups: dict[str, asyncio.Future] = {}
+        new: list[str] = []
+        for host in hosts:
+            if host in results or host in lookups or host in new:
+                continue
+            if not refresh and (cached := self.get_cached(host)) is not None:
+                results[host] = cached
+            elif (future := self._pending.get(host)) is not None:
+                lookups[host] = future
+            else:
+                new.append(host)
+        if not lookups and not new:
+            return results
+
+        aiozc = self.aiozc
+        temporary_aiozc = None
+        if aiozc is None and self.mdns and any(host.endswith(".local") for host in new):
+            from esphome.zeroconf import AsyncEsphomeZeroconf
+
+            try:
+                aiozc = temporary_aiozc = AsyncEsphomeZeroconf()
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug("Cannot start mDNS sockets: %s", err)
+
+        pending = self._pending
+        for host in new:
+            future = asyncio.ensure_future(self._async_lookup(host, aiozc))
+            pending[host] = lookups[host] = future
+            future.add_done_callback(lambda _, host=host: pending.pop(host, None))
+        try:
+            # Other callers may wait for the same lookups
+            done = await asyncio.gather(*map(asyncio.shield, lookups.values()))
+        finally:
+            if temporary_aiozc is not None:
+                await temporary_aiozc.async_close()
+        results.update(zip(lookups, done))
+        return results
+
+    async def _async_lookup(self, host: str, aiozc) -> ResultType:
+        errors: list[str] = []
+        if host.endswith(".local") and self.mdns:
+            if aiozc is None:
+                errors.append(
+                    "Cannot start mDNS sockets, is this a docker container without "
+                    "host network mode?"
+                )
+            else:
+                try:
+                    address = await aiozc.async_resolve_host(host, MDNS_TIMEOUT)
+                except Exception as err:  # pylint: disable=broad-except
+                    errors.append(f"Error resolving mDNS hostname: {err}")
+                else:
+                    if address:
+                        return self._store(host, [address])
+                    errors.append(
+                        "Error resolving address with mDNS: Did not respond. "
+                        "Maybe the device is offline."
+                    )
+        try:
+            async with async_timeout(DNS_TIMEOUT):
+                return self._store(host, await async_resolve(_dns_name(host)))
+        except (asyncio.TimeoutError, NameLookupError, UnicodeError) as err:
+            errors.append(str(err) or "Timed out")
+        return self._store(
+            host, EsphomeError(f"Error resolving IP address: {', '.join(errors)}")
+        )
+
+    def _store(self, host: str, result: ResultType) -> ResultType:
+        ttl = NEGATIVE_TTL if isinstance(result, Exception) else DEFAULT_TTL
+        self._cache[host] = (time.time() + ttl, result)
+        return result
+
+    def resolve_many(self, hosts: Iterable[str]) -> dict[str, ResultType]:
+        """Resolve many host names concurrently outside of an event loop."""
+        with self._lock:
+            hosts = list(hosts)
+            if all(self.get_cached(host) is not None for host in hosts):
+                return {host: self.get_cached(host) for host in hosts}
+            return asyncio.run(self.async_resolve_many(hosts))
+
+    def resolve(self, host: str) -> str:
+        """Resolve a host name to an address outside of an event loop."""
+        result = self.resolve_many((host,))[host]
+        if isinstance(result, Exception):
+            raise EsphomeError(str(result))
+        self.save()
+        return result[0]
+
+
+_RESOLVER: Resolver | None = None
+
+
+def get_resolver() -> Resolver:
+    """Return the resolver of the command, it persists in the data directory."""
+    global _RESOLVER  # pylint: disable=global-statement
+    if _RESOLVER is None:
+        path = None
+        if CORE.config_path is not None:
+            path = os.path.join(CORE.data_dir, CACHE_FILE)
+        _RESOLVER = Resolver(path)
+        _RESOLVER.load()
+    return _RESOLVER
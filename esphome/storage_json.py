@@ -19,8 +19,10 @@ def storage_path() -> str:
     return os.path.join(CORE.data_dir, "storage", f"{CORE.config_filename}.json")
 
 
-def ext_storage_path(config_filename: str) -> str:
-    return os.path.join(CORE.data_dir, "storage", f"{config_filename}.json")
+def ext_storage_path(config_filename: str, data_dir: str | None = None) -> str:
+    if data_dir is None:
+        data_dir = CORE.data_dir
+    return os.path.join(data_dir, "storage", f"{config_filename}.json")
 
 
 def esphome_storage_path() -> str:
@@ -1,6 +1,7 @@
 from typing import Union
 
 import collections
+import functools
 import io
 import logging
 import os
@@ -27,7 +28,7 @@ class RegistryEntry:
 
         return coroutine(self.fun)
 
-    @property
+    @functools.cached_property
     def schema(self):
         from esphome.config_validation import Schema
 
@@ -3,6 +3,7 @@ import os
 
 from typing import Optional
 
+from esphome import yaml_util
 from esphome.config import load_config, _format_vol_invalid, Config
 from esphome.core import CORE, DocumentRange
 import esphome.config_validation as cv
@@ -56,21 +57,30 @@ class VSCodeResult:
         )
 
 
-def read_config(args):
-    while True:
+class ValidationSession:
+    """Validate the configurations sent by the editor.
+
+    The session lives as long as the editor is connected, so the components
+    stay imported and unchanged YAML files are not parsed again.
+    """
+
+    def __init__(self, args):
+        self._args = args
+        self.parse_cache = yaml_util.YAMLParseCache()
+
+    def validate(self, file: str) -> VSCodeResult:
         CORE.reset()
-        data = json.loads(input())
-        assert data["type"] == "validate"
         CORE.vscode = True
-        CORE.ace = args.ace
-        f = data["file"]
+        CORE.ace = self._args.ace
         if CORE.ace:
-            CORE.config_path = os.path.join(args.configuration, f)
+            CORE.config_path = os.path.join(self._args.configuration, file)
         else:
-            CORE.config_path = data["file"]
+            CORE.config_path = file
+        substitutions = self._args.substitution
         vs = VSCodeResult()
         try:
-            res = load_config(dict(args.substitution) if args.substitution else {})
+            with yaml_util.use_parse_cache(self.parse_cache):
+                res = load_config(dict(substitutions) if substitutions else {})
         except Exception as err:  # pylint: disable=broad-except
             vs.add_yaml_error(str(err))
         else:
@@ -80,4 +90,12 @@ def read_config(args):
                     vs.add_validation_error(range_, _format_vol_invalid(err, res))
                 except Exception:  # pylint: disable=broad-except
                     continue
-        print(vs.dump())
+        return vs
+
+
+def read_config(args):
+    session = ValidationSession(args)
+    while True:
+        data = json.loads(input())
+        assert data["type"] == "validate"
+        print(session.validate(data["file"]).dump())
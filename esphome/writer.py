@@ -1,6 +1,7 @@
 import logging
 import os
 import re
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Union
 
@@ -16,6 +17,7 @@ from esphome.helpers import (
     mkdir_p,
     read_file,
     write_file_if_changed,
+    write_chunks_if_changed,
     walk_files,
     copy_file_if_changed,
     get_bool_env,
@@ -327,10 +329,68 @@ def generate_version_h():
     )
 
 
-def write_cpp(code_s):
+def _read_cpp_user_code(path) -> str:
+    """Read an existing main.cpp, skipping the code between the generated markers.
+
+    Only the user code around the generated blocks is needed to rewrite the
+    file, and the generated code may contain large arrays.
+    """
+    markers = (
+        CPP_INCLUDE_BEGIN,
+        CPP_INCLUDE_END,
+        CPP_AUTO_GENERATE_BEGIN,
+        CPP_AUTO_GENERATE_END,
+    )
+    ends = {
+        CPP_INCLUDE_BEGIN: CPP_INCLUDE_END,
+        CPP_AUTO_GENERATE_BEGIN: CPP_AUTO_GENERATE_END,
+    }
+    text = []
+    skip_until = None
+    try:
+        with open(path, encoding="utf-8", newline="") as f_handle:
+            for line in f_handle:
+                found = [marker for marker in markers if marker in line]
+                if skip_until is not None and not found:
+                    continue
+                text.append(line)
+                for marker in found:
+                    if marker == skip_until:
+                        skip_until = None
+                    elif (end := ends.get(marker)) is not None:
+                        skip_until = end
+    except (OSError, UnicodeDecodeError) as err:
+        raise EsphomeError(f"Error reading file {path}: {err}") from err
+    return "".join(text)
+
+
+def _iter_cpp_global_code() -> Iterator[str]:
+    yield '#include "esphome.h"\n'
+    separator = ""
+    for code in CORE.iter_cpp_global_statements():
+        yield separator
+        yield code
+        separator = "\n"
+    yield "\n"
+
+
+def _iter_cpp_main_code(padding: str = "  ") -> Iterator[str]:
+    """Yield the main section indented by padding, like indent(CORE.cpp_main_section)."""
+    separator = ""
+    for code in CORE.iter_cpp_main_statements():
+        for line in code.splitlines() or [""]:
+            yield f"{separator}{padding}{line}"
+            separator = "\n"
+    if not separator:
+        yield padding
+    # The section ends with an empty line
+    yield f"\n{padding}"
+
+
+def write_cpp():
     path = CORE.relative_src_path("main.cpp")
     if os.path.isfile(path):
-        text = read_file(path)
+        text = _read_cpp_user_code(path)
         code_format = find_begin_end(
             text, CPP_AUTO_GENERATE_BEGIN, CPP_AUTO_GENERATE_END
         )
@@ -342,15 +402,16 @@ def write_cpp(code_s):
         code_format = CPP_BASE_FORMAT
 
     copy_src_tree()
-    global_s = '#include "esphome.h"\n'
-    global_s += CORE.cpp_global_section
 
-    full_file = f"{code_format[0] + CPP_INCLUDE_BEGIN}\n{global_s}{CPP_INCLUDE_END}"
-    full_file += (
-        f"{code_format[1] + CPP_AUTO_GENERATE_BEGIN}\n{code_s}{CPP_AUTO_GENERATE_END}"
-    )
-    full_file += code_format[2]
-    write_file_if_changed(path, full_file)
+    def chunks():
+        yield f"{code_format[0] + CPP_INCLUDE_BEGIN}\n"
+        yield from _iter_cpp_global_code()
+        yield f"{CPP_INCLUDE_END}{code_format[1] + CPP_AUTO_GENERATE_BEGIN}\n"
+        yield from _iter_cpp_main_code()
+        yield CPP_AUTO_GENERATE_END
+        yield code_format[2]
+
+    write_chunks_if_changed(path, chunks())
 
 
 def clean_build():
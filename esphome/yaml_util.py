@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import copy
 import fnmatch
 import functools
+import gc
+import hashlib
 import inspect
+import io
 import logging
 import math
 import os
+import pickle
+import re
+import sys
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from io import TextIOWrapper
 from typing import Any
 
@@ -19,10 +28,16 @@ try:
 except ImportError:
     FastestAvailableSafeLoader = PurePythonLoader
 
+try:
+    from yaml.cyaml import CEmitter
+except ImportError:
+    CEmitter = None
+
 from esphome import core
 from esphome.config_helpers import Extend, Remove
 from esphome.core import (
     CORE,
+    DocumentLocation,
     DocumentRange,
     EsphomeError,
     IPAddress,
@@ -30,7 +45,14 @@ from esphome.core import (
     MACAddress,
     TimePeriod,
 )
-from esphome.helpers import add_class_to_obj
+from esphome.const import __version__
+from esphome.helpers import (
+    add_class_to_obj,
+    get_added_class,
+    get_bool_env,
+    split_added_class,
+    write_file,
+)
 from esphome.util import OrderedDict, filter_yaml_files
 
 _LOGGER = logging.getLogger(__name__)
@@ -39,8 +61,25 @@ _LOGGER = logging.getLogger(__name__)
 # let's not reinvent the wheel here
 
 SECRET_YAML = "secrets.yaml"
-_SECRET_CACHE = {}
+
+# Keep the parsed YAML files in the data directory between runs. The cache is
+# trusted like the data directory: it is only readable by its owner, files of
+# other users or writable by them are ignored, and it is unpickled with only
+# the classes of loaded YAML, see _YAMLCacheUnpickler. Secrets are never saved.
+ENV_YAML_CACHE = "ESPHOME_YAML_CACHE"
+YAML_CACHE_DIR = "yaml_cache"
+_YAML_CACHE_VERSION = 2
+# Keep the document ranges in a ProvenanceTable instead of subclassing the
+# loaded values, see reset_provenance()
+ENV_YAML_PROVENANCE_TABLE = "ESPHOME_YAML_PROVENANCE_TABLE"
+
 _SECRET_VALUES = {}
+# The files and directories read while tracking, see track_loaded_files()
+_LOADED_FILES: dict[str, os.stat_result | None] | None = None
+# The cache the files are loaded through, see use_parse_cache()
+_PARSE_CACHE: YAMLParseCache | None = None
+# The document ranges of the loaded values if they are not subclassed
+_PROVENANCE: ProvenanceTable | None = None
 
 
 class ESPHomeDataBase:
@@ -61,15 +100,150 @@ class ESPHomeDataBase:
 
     def from_database(self, database):
         # pylint: disable=attribute-defined-outside-init
-        self._esp_range = database.esp_range
-        self._content_offset = database.content_offset
+        self._esp_range = get_document_range(database)
+        self._content_offset = get_content_offset(database)
 
 
 class ESPForceValue:
     pass
 
 
+def _content_offset(node) -> int:
+    """Return the lines before the content of a block scalar."""
+    if isinstance(node, yaml.ScalarNode) and node.style is not None:
+        return 1 if node.style in "|>" else 0
+    return 0
+
+
+class ProvenanceTable:
+    """The document ranges of loaded values, keyed by the id of the value.
+
+    The loaded values stay plain builtins, so validation takes the fast paths
+    for str, dict and list. Only values whose identity belongs to them are
+    recorded: containers, strings longer than one character and other
+    objects. Numbers, booleans and the strings Python shares between all
+    users are not, their parent or key has the range. Each entry holds the
+    value to keep its id valid, and the document, the start and end line and
+    column and the content offset instead of a DocumentRange.
+    """
+
+    __slots__ = ("_entries",)
+
+    def __init__(self) -> None:
+        """Initialize the ProvenanceTable."""
+        self._entries: dict[int, tuple[Any, str, int, int, int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> list[tuple[Any, str, int, int, int, int, int]]:
+        # The ids are only valid in this process
+        return list(self._entries.values())
+
+    def __setstate__(self, entries: list[tuple[Any, ...]]) -> None:
+        self._entries = {id(entry[0]): entry for entry in entries}
+
+    @staticmethod
+    def _is_unique(value: Any) -> bool:
+        value_type = type(value)
+        if value_type is str:
+            return len(value) > 1
+        return value is not None and value_type not in (int, float, bool)
+
+    def record(self, value: Any, node: yaml.Node) -> None:
+        """Record the range of the node a value was constructed from."""
+        if self._is_unique(value):
+            start = node.start_mark
+            end = node.end_mark
+            self._entries[id(value)] = (
+                value,
+                start.name,
+                start.line,
+                start.column,
+                end.line,
+                end.column,
+                _content_offset(node),
+            )
+
+    def copy(self, source: Any, value: Any) -> None:
+        """Give a value the range of the value it was derived from."""
+        if not self._is_unique(value):
+            return
+        if (entry := self._entries.get(id(source))) is not None:
+            self._entries[id(value)] = (value, *entry[1:])
+        elif (
+            isinstance(source, ESPHomeDataBase)
+            and (doc_range := source.esp_range) is not None
+        ):
+            start = doc_range.start_mark
+            end = doc_range.end_mark
+            self._entries[id(value)] = (
+                value,
+                start.document,
+                start.line,
+                start.column,
+                end.line,
+                end.column,
+                source.content_offset,
+            )
+
+    def update(self, other: ProvenanceTable) -> None:
+        """Add the ranges recorded by another table."""
+        # pylint: disable=protected-access
+        self._entries.update(other._entries)
+
+    def get_range(self, value: Any) -> DocumentRange | None:
+        """Return the document range of a value, or None if not recorded."""
+        if (entry := self._entries.get(id(value))) is None:
+            return None
+        _, document, line, column, end_line, end_column, _ = entry
+        return DocumentRange(
+            DocumentLocation(document, line, column),
+            DocumentLocation(document, end_line, end_column),
+        )
+
+    def get_content_offset(self, value: Any) -> int:
+        """Return the lines before the content of a block scalar value."""
+        if (entry := self._entries.get(id(value))) is None:
+            return 0
+        return entry[6]
+
+
+def reset_provenance() -> ProvenanceTable | None:
+    """Start keeping the document ranges of a new configuration.
+
+    With ESPHOME_YAML_PROVENANCE_TABLE set, the values loaded until the next
+    reset are plain builtins and their ranges are kept in a ProvenanceTable.
+    Otherwise the values are subclassed with ESPHomeDataBase.
+    """
+    global _PROVENANCE  # pylint: disable=global-statement
+    _PROVENANCE = ProvenanceTable() if get_bool_env(ENV_YAML_PROVENANCE_TABLE) else None
+    return _PROVENANCE
+
+
+def get_document_range(value: Any) -> DocumentRange | None:
+    """Return the document range of a loaded value, or None if unknown."""
+    if isinstance(value, ESPHomeDataBase):
+        return value.esp_range
+    if _PROVENANCE is not None:
+        return _PROVENANCE.get_range(value)
+    return None
+
+
+def get_content_offset(value: Any) -> int:
+    """Return the lines before the content of a loaded block scalar."""
+    if isinstance(value, ESPHomeDataBase):
+        return value.content_offset
+    if _PROVENANCE is not None:
+        return _PROVENANCE.get_content_offset(value)
+    return 0
+
+
 def make_data_base(value, from_database: ESPHomeDataBase = None):
+    if _PROVENANCE is not None:
+        if from_database is not None:
+            _PROVENANCE.copy(from_database, value)
+        return value
     try:
         value = add_class_to_obj(value, ESPHomeDataBase)
         if from_database is not None:
@@ -91,6 +265,9 @@ def _add_data_ref(fn):
             # Let generator finish
             for _ in generator:
                 pass
+        if _PROVENANCE is not None:
+            _PROVENANCE.record(res, node)
+            return res
         res = make_data_base(res)
         if isinstance(res, ESPHomeDataBase):
             res.from_node(node)
@@ -164,8 +341,12 @@ class ESPHomeLoaderMixin:
                         f'Invalid key "{key}" (not hashable)', key_node.start_mark
                     )
 
-                key = make_data_base(str(key))
-                key.from_node(key_node)
+                if _PROVENANCE is not None:
+                    key = str(key)
+                    _PROVENANCE.record(key, key_node)
+                else:
+                    key = make_data_base(str(key))
+                    key.from_node(key_node)
 
                 # Check if it is a duplicate key
                 if key in seen_keys:
@@ -233,6 +414,8 @@ class ESPHomeLoaderMixin:
     @_add_data_ref
     def construct_env_var(self, node):
         args = node.value.split()
+        if _PARSE_CACHE is not None:
+            _PARSE_CACHE.add_env_var(args[0])
         # Check for a default value
         if len(args) > 1:
             return os.getenv(args[0], " ".join(args[1:]))
@@ -252,14 +435,16 @@ class ESPHomeLoaderMixin:
     @_add_data_ref
     def construct_secret(self, node):
         try:
-            secrets = _load_yaml_internal(self._rel_path(SECRET_YAML))
+            secrets = _load_yaml_shared(self._rel_path(SECRET_YAML))
         except EsphomeError as e:
             if self.name == CORE.config_path:
                 raise e
             try:
                 main_config_dir = os.path.dirname(CORE.config_path)
                 main_secret_yml = os.path.join(main_config_dir, SECRET_YAML)
-                secrets = _load_yaml_internal(main_secret_yml)
+                if _PARSE_CACHE is not None:
+                    _PARSE_CACHE.add_config_path_dependency()
+                secrets = _load_yaml_shared(main_secret_yml)
             except EsphomeError as er:
                 raise EsphomeError(f"{e}\n{er}") from er
 
@@ -267,8 +452,10 @@ class ESPHomeLoaderMixin:
             raise yaml.MarkedYAMLError(
                 f"Secret '{node.value}' not defined", node.start_mark
             )
-        val = secrets[node.value]
+        val = _copy_containers(secrets[node.value])
         _SECRET_VALUES[str(val)] = node.value
+        if _PARSE_CACHE is not None:
+            _PARSE_CACHE.add_secret(str(val), node.value)
         return val
 
     @_add_data_ref
@@ -327,12 +514,12 @@ class ESPHomeLoaderMixin:
 
     @_add_data_ref
     def construct_include_dir_list(self, node):
-        files = filter_yaml_files(_find_files(self._rel_path(node.value), "*.yaml"))
+        files = _include_dir_files(self._rel_path(node.value))
         return [_load_yaml_internal(f) for f in files]
 
     @_add_data_ref
     def construct_include_dir_merge_list(self, node):
-        files = filter_yaml_files(_find_files(self._rel_path(node.value), "*.yaml"))
+        files = _include_dir_files(self._rel_path(node.value))
         merged_list = []
         for fname in files:
             loaded_yaml = _load_yaml_internal(fname)
@@ -342,7 +529,7 @@ class ESPHomeLoaderMixin:
 
     @_add_data_ref
     def construct_include_dir_named(self, node):
-        files = filter_yaml_files(_find_files(self._rel_path(node.value), "*.yaml"))
+        files = _include_dir_files(self._rel_path(node.value))
         mapping = OrderedDict()
         for fname in files:
             filename = os.path.splitext(os.path.basename(fname))[0]
@@ -351,7 +538,7 @@ class ESPHomeLoaderMixin:
 
     @_add_data_ref
     def construct_include_dir_merge_named(self, node):
-        files = filter_yaml_files(_find_files(self._rel_path(node.value), "*.yaml"))
+        files = _include_dir_files(self._rel_path(node.value))
         mapping = OrderedDict()
         for fname in files:
             loaded_yaml = _load_yaml_internal(fname)
@@ -413,32 +600,97 @@ for _loader in (ESPHomeLoader, ESPHomePurePythonLoader):
 def load_yaml(fname: str, clear_secrets: bool = True) -> Any:
     if clear_secrets:
         _SECRET_VALUES.clear()
-        _SECRET_CACHE.clear()
-    return _load_yaml_internal(fname)
+    if _PARSE_CACHE is not None:
+        return _load_yaml_internal(fname)
+    # Files loaded many times, like secrets.yaml for every !secret, are
+    # parsed once per load
+    cache = YAMLParseCache()
+    if (cache_path := _yaml_cache_path(fname)) is not None:
+        cache.restore(cache_path)
+    with use_parse_cache(cache):
+        # The cache is discarded after the load, the data is not copied
+        data = cache.load(fname, shared=True)
+    if cache_path is not None and cache.misses:
+        cache.save(cache_path)
+    _LOGGER.debug(
+        "Loaded %s, %s of %s files were parsed",
+        fname,
+        cache.misses,
+        cache.hits + cache.misses,
+    )
+    return data
+
+
+def _yaml_cache_path(fname: str) -> str | None:
+    """Return the path of the on-disk cache of a file, or None if disabled."""
+    if not get_bool_env(ENV_YAML_CACHE) or CORE.config_path is None:
+        return None
+    fname = os.path.abspath(fname)
+    key = hashlib.sha256(fname.encode("utf-8")).hexdigest()[:16]
+    name = f"{os.path.basename(fname)}-{key}.pickle"
+    return os.path.join(CORE.data_dir, YAML_CACHE_DIR, name)
+
+
+@contextmanager
+def track_loaded_files() -> Iterator[dict[str, os.stat_result | None]]:
+    """Track the files read by the YAML loader.
+
+    Yields a dict of the paths of all YAML files and included directories that
+    are read to the stat result at the time they were read, or None if they
+    did not exist.
+    """
+    global _LOADED_FILES  # pylint: disable=global-statement
+    previous = _LOADED_FILES
+    _LOADED_FILES = {}
+    try:
+        yield _LOADED_FILES
+    finally:
+        _LOADED_FILES = previous
 
 
 def _load_yaml_internal(fname: str) -> Any:
     """Load a YAML file."""
+    if _PARSE_CACHE is not None:
+        return _PARSE_CACHE.load(fname)
+    return _load_yaml_file(fname)
+
+
+def _load_yaml_file(fname: str) -> Any:
+    """Read and parse a YAML file."""
+    if _LOADED_FILES is not None:
+        _LOADED_FILES[fname] = None
     try:
         with open(fname, encoding="utf-8") as f_handle:
-            try:
-                return _load_yaml_internal_with_type(ESPHomeLoader, fname, f_handle)
-            except EsphomeError:
-                # Loading failed, so we now load with the Python loader which has more
-                # readable exceptions
-                # Rewind the stream so we can try again
-                f_handle.seek(0, 0)
-                return _load_yaml_internal_with_type(
-                    ESPHomePurePythonLoader, fname, f_handle
-                )
+            if _LOADED_FILES is not None:
+                _LOADED_FILES[fname] = os.fstat(f_handle.fileno())
+            return _load_yaml_stream(fname, f_handle)
     except (UnicodeDecodeError, OSError) as err:
         raise EsphomeError(f"Error reading file {fname}: {err}") from err
 
 
+def _load_yaml_shared(fname: str) -> Any:
+    """Load a YAML file whose data is only read and never modified."""
+    if _PARSE_CACHE is not None:
+        return _PARSE_CACHE.load(fname, shared=True)
+    return _load_yaml_file(fname)
+
+
+def _load_yaml_stream(fname: str, stream: TextIOWrapper | io.StringIO) -> Any:
+    """Load a YAML document from a stream."""
+    try:
+        return _load_yaml_internal_with_type(ESPHomeLoader, fname, stream)
+    except EsphomeError:
+        # Loading failed, so we now load with the Python loader which has more
+        # readable exceptions
+        # Rewind the stream so we can try again
+        stream.seek(0, 0)
+        return _load_yaml_internal_with_type(ESPHomePurePythonLoader, fname, stream)
+
+
 def _load_yaml_internal_with_type(
     loader_type: type[ESPHomeLoader] | type[ESPHomePurePythonLoader],
     fname: str,
-    content: TextIOWrapper,
+    content: TextIOWrapper | io.StringIO,
 ) -> Any:
     """Load a YAML file."""
     loader = loader_type(content)
@@ -451,11 +703,389 @@ def _load_yaml_internal_with_type(
         loader.dispose()
 
 
+def _include_dir_files(directory: str) -> list[str]:
+    """Return the YAML files included by the !include_dir_* tags."""
+    if _PARSE_CACHE is not None:
+        return _PARSE_CACHE.list_directory(directory)
+    return filter_yaml_files(_find_files(directory, "*.yaml"))
+
+
+def _copy_containers(value: Any) -> Any:
+    """Copy the dicts, lists and lambdas of loaded YAML.
+
+    Validation modifies these in place, the other values are never modified
+    and are shared with the copy.
+    """
+    if isinstance(value, Lambda):
+        copied = copy.copy(value)
+        if _PROVENANCE is not None:
+            _PROVENANCE.copy(value, copied)
+        return copied
+    if not isinstance(value, (dict, list)):
+        return value
+    copied = type(value)(value)
+    if attributes := getattr(value, "__dict__", None):
+        # The document range of the ESPHomeDataBase subclasses
+        copied.__dict__.update(attributes)
+    if _PROVENANCE is not None:
+        _PROVENANCE.copy(value, copied)
+    items = value.items() if isinstance(value, dict) else enumerate(value)
+    for key, item in items:
+        if isinstance(item, (dict, list, Lambda)):
+            copied[key] = _copy_containers(item)
+    return copied
+
+
+class _YAMLCachePickler(pickle.Pickler):
+    """Pickle parsed YAML with the classes added by add_class_to_obj()."""
+
+    def reducer_override(self, obj: Any) -> Any:
+        if isinstance(obj, type) and (bases := split_added_class(obj)) is not None:
+            return get_added_class, bases
+        return NotImplemented
+
+
+class _YAMLCacheUnpickler(pickle.Unpickler):
+    """Unpickle parsed YAML, refusing every other global.
+
+    Unpickling can only create the values the loader constructs, so a
+    modified cache can not call arbitrary functions.
+    """
+
+    _ALLOWED = {
+        ("datetime", "date"),
+        ("datetime", "datetime"),
+        ("datetime", "timedelta"),
+        ("datetime", "timezone"),
+        ("esphome.config_helpers", "Extend"),
+        ("esphome.config_helpers", "Remove"),
+        ("esphome.core", "DocumentLocation"),
+        ("esphome.core", "DocumentRange"),
+        ("esphome.core", "Lambda"),
+        ("esphome.helpers", "EDict"),
+        ("esphome.helpers", "EFloat"),
+        ("esphome.helpers", "EInt"),
+        ("esphome.helpers", "EList"),
+        ("esphome.helpers", "EStr"),
+        ("esphome.helpers", "get_added_class"),
+        ("esphome.util", "OrderedDict"),
+        ("esphome.yaml_util", "ESPForceValue"),
+        ("esphome.yaml_util", "ESPHomeDataBase"),
+        ("esphome.yaml_util", "ProvenanceTable"),
+        ("esphome.yaml_util", "_ParsedFile"),
+    }
+
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) not in self._ALLOWED:
+            raise pickle.UnpicklingError(f"Global {module}.{name} is not allowed")
+        return super().find_class(module, name)
+
+
+def _is_private_file(f_handle: io.BufferedReader) -> bool:
+    """Return if only the current user can have written an open file."""
+    if not hasattr(os, "getuid"):
+        return True
+    stat = os.fstat(f_handle.fileno())
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+def _yaml_cache_header() -> tuple[Any, ...]:
+    return (
+        _YAML_CACHE_VERSION,
+        __version__,
+        yaml.__version__,
+        sys.version_info[:2],
+        _PROVENANCE is not None,
+    )
+
+
+class _ParsedFile:
+    """A parsed YAML file and everything its content depends on.
+
+    The digest of a file that could not be read is None and its data is the
+    error message.
+    """
+
+    __slots__ = (
+        "digest",
+        "data",
+        "files",
+        "directories",
+        "secrets",
+        "env",
+        "config_path",
+        "provenance",
+    )
+
+    def __init__(self, digest: bytes | None) -> None:
+        """Initialize the _ParsedFile."""
+        self.digest = digest
+        self.data: Any = None
+        # The files and directory listings loaded while parsing
+        self.files: set[str] = set()
+        self.directories: dict[str, list[str]] = {}
+        # The secrets resolved while parsing, for is_secret()
+        self.secrets: list[tuple[str, str]] = []
+        # The environment variables read by !env_var
+        self.env: dict[str, str | None] = {}
+        # The main config if its secrets were used as a fallback
+        self.config_path: str | None = None
+        # The document ranges of the data if they are kept in a table, they
+        # include the ranges of the data of the included files
+        self.provenance: ProvenanceTable | None = None
+
+
+class YAMLParseCache:
+    """Keep parsed YAML files until their content changes.
+
+    Every load through use_parse_cache() reads each file once to compare the
+    digest of its content, a file is only parsed again if it or a file or
+    directory it includes changed. Loading a cached file returns a copy of its
+    containers, so the cached data is never modified.
+
+    Without an active cache, load_yaml() loads through a new one that is
+    discarded afterwards. A file that is included many times, or
+    secrets.yaml, which is loaded for every !secret, is then still parsed
+    only once per load.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the YAMLParseCache."""
+        self.hits = 0
+        self.misses = 0
+        self._files: dict[str, _ParsedFile] = {}
+        self._parsing: list[_ParsedFile] = []
+        # The files and directories read by the current load, the content is
+        # only kept until the load is done
+        self._contents: dict[str, str | EsphomeError] = {}
+        self._digests: dict[str, bytes | None] = {}
+        self._listings: dict[str, list[str]] = {}
+        self._fresh: dict[str, bool] = {}
+
+    def _start_load(self) -> None:
+        self._digests = {}
+        self._listings = {}
+        self._fresh = {}
+
+    def _end_load(self) -> None:
+        self._contents = {}
+        self._parsing = []
+
+    def _read(self, fname: str) -> str | EsphomeError:
+        if (content := self._contents.get(fname)) is not None:
+            return content
+        if _LOADED_FILES is not None:
+            _LOADED_FILES[fname] = None
+        try:
+            with open(fname, encoding="utf-8") as f_handle:
+                if _LOADED_FILES is not None:
+                    _LOADED_FILES[fname] = os.fstat(f_handle.fileno())
+                content = f_handle.read()
+        except (UnicodeDecodeError, OSError) as err:
+            content = EsphomeError(f"Error reading file {fname}: {err}")
+            self._digests[fname] = None
+        else:
+            self._digests[fname] = hashlib.sha256(content.encode("utf-8")).digest()
+        self._contents[fname] = content
+        return content
+
+    def _digest(self, fname: str) -> bytes | None:
+        if fname not in self._digests:
+            self._read(fname)
+        return self._digests[fname]
+
+    def _is_fresh(self, fname: str) -> bool:
+        """Return if the cached data of a file is still valid."""
+        if (fresh := self._fresh.get(fname)) is not None:
+            return fresh
+        # Files that include themselves are never fresh
+        self._fresh[fname] = False
+        parsed = self._files.get(fname)
+        fresh = (
+            parsed is not None
+            and parsed.config_path in (None, CORE.config_path)
+            and self._digest(fname) == parsed.digest
+            and all(os.environ.get(name) == value for name, value in parsed.env.items())
+            and all(self._is_fresh(dependency) for dependency in parsed.files)
+            and all(
+                self.list_directory(directory) == files
+                for directory, files in parsed.directories.items()
+            )
+        )
+        self._fresh[fname] = fresh
+        return fresh
+
+    def load(self, fname: str, shared: bool = False) -> Any:
+        """Load a YAML file, parsing it only if it changed.
+
+        If shared the cached data is returned, it must not be modified.
+        """
+        global _PROVENANCE  # pylint: disable=global-statement
+        if self._parsing:
+            self._parsing[-1].files.add(fname)
+        if self._is_fresh(fname):
+            self.hits += 1
+            parsed = self._files[fname]
+            if parsed.digest is None:
+                raise EsphomeError(parsed.data)
+            for value, name in parsed.secrets:
+                _SECRET_VALUES[value] = name
+                self.add_secret(value, name)
+            if parsed.config_path is not None:
+                self.add_config_path_dependency()
+            if _PROVENANCE is not None and parsed.provenance is not None:
+                _PROVENANCE.update(parsed.provenance)
+            return parsed.data if shared else _copy_containers(parsed.data)
+
+        self.misses += 1
+        content = self._read(fname)
+        if isinstance(content, EsphomeError):
+            # Kept so that the files trying to read it stay fresh while it is
+            # missing, like a secrets.yaml next to an included file
+            parsed = self._files[fname] = _ParsedFile(None)
+            parsed.data = str(content)
+            self._fresh[fname] = True
+            raise content
+        stream = io.StringIO(content)
+        # The C loader takes the document name of the marks from the stream
+        stream.name = fname
+        parsed = _ParsedFile(self._digests[fname])
+        self._parsing.append(parsed)
+        provenance = _PROVENANCE
+        if provenance is not None:
+            # Kept with the data, the table of the load is reset
+            _PROVENANCE = parsed.provenance = ProvenanceTable()
+        try:
+            parsed.data = _load_yaml_stream(fname, stream)
+        finally:
+            self._parsing.pop()
+            if provenance is not None:
+                _PROVENANCE = provenance
+                provenance.update(parsed.provenance)
+        self._files[fname] = parsed
+        self._fresh[fname] = True
+        return parsed.data if shared else _copy_containers(parsed.data)
+
+    def list_directory(self, directory: str) -> list[str]:
+        """Return the YAML files in a directory included by a file."""
+        if (files := self._listings.get(directory)) is None:
+            files = filter_yaml_files(_find_files(directory, "*.yaml"))
+            self._listings[directory] = files
+        if self._parsing:
+            self._parsing[-1].directories[directory] = files
+        return files
+
+    def add_secret(self, value: str, name: str) -> None:
+        """Record a secret resolved by the files being parsed."""
+        for parsed in self._parsing:
+            parsed.secrets.append((value, name))
+
+    def add_config_path_dependency(self) -> None:
+        """Record that the files being parsed depend on the main config path."""
+        for parsed in self._parsing:
+            parsed.config_path = CORE.config_path
+
+    def add_env_var(self, name: str) -> None:
+        """Record an environment variable read by the file being parsed."""
+        if self._parsing:
+            self._parsing[-1].env[name] = os.environ.get(name)
+
+    def restore(self, path: str) -> None:
+        """Restore the parsed files saved by an earlier run."""
+        # The many objects created would run the cyclic garbage collector
+        # again and again, but none of them can be garbage
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(path, "rb") as f_handle:
+                if not _is_private_file(f_handle):
+                    _LOGGER.warning(
+                        "Ignoring the YAML cache %s, other users can write it", path
+                    )
+                    return
+                header, files = _YAMLCacheUnpickler(f_handle).load()
+        except FileNotFoundError:
+            return
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Could not read the YAML cache %s: %s", path, err)
+            return
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if header == _yaml_cache_header():
+            self._files.update(files)
+
+    def _secret_files(self) -> set[str]:
+        """Return the files whose data holds secrets."""
+        # secrets.yaml and the files it includes
+        files = {
+            fname for fname in self._files if os.path.basename(fname) == SECRET_YAML
+        }
+        pending = list(files)
+        while pending:
+            if (parsed := self._files.get(pending.pop())) is None:
+                continue
+            for dependency in parsed.files - files:
+                files.add(dependency)
+                pending.append(dependency)
+        # The files that resolved a !secret, and the files including them
+        files.update(fname for fname, parsed in self._files.items() if parsed.secrets)
+        return files
+
+    def save(self, path: str) -> None:
+        """Save the parsed files read by the last load.
+
+        The files holding secrets are left out and parsed again by every load.
+        """
+        secret_files = self._secret_files()
+        files = {
+            fname: parsed
+            for fname, parsed in self._files.items()
+            if fname in self._digests and fname not in secret_files
+        }
+        buffer = io.BytesIO()
+        try:
+            _YAMLCachePickler(buffer, pickle.HIGHEST_PROTOCOL).dump(
+                (_yaml_cache_header(), files)
+            )
+            write_file(path, buffer.getvalue(), 0o600)
+        except (pickle.PicklingError, TypeError, AttributeError, RecursionError) as err:
+            _LOGGER.debug("Could not pickle the parsed YAML: %s", err)
+        except EsphomeError as err:
+            _LOGGER.debug("Could not write the YAML cache: %s", err)
+
+
+@contextmanager
+def use_parse_cache(cache: YAMLParseCache) -> Iterator[YAMLParseCache]:
+    """Load the YAML files through a cache.
+
+    Each block is one load, the files are read only once per load.
+    """
+    global _PARSE_CACHE  # pylint: disable=global-statement
+    previous = _PARSE_CACHE
+    _PARSE_CACHE = cache
+    cache._start_load()  # pylint: disable=protected-access
+    try:
+        yield cache
+    finally:
+        cache._end_load()  # pylint: disable=protected-access
+        _PARSE_CACHE = previous
+
+
 def dump(dict_, show_secrets=False):
     """Dump YAML to a string and remove null."""
     if show_secrets:
         _SECRET_VALUES.clear()
-        _SECRET_CACHE.clear()
+    if CEmitter is not None and isinstance(dict_, (dict, list)):
+        try:
+            return yaml.dump(
+                dict_,
+                default_flow_style=False,
+                allow_unicode=True,
+                Dumper=ESPHomeCDumper,
+            )
+        except _CEmitterUnsupported:
+            pass
     return yaml.dump(
         dict_, default_flow_style=False, allow_unicode=True, Dumper=ESPHomeDumper
     )
@@ -469,6 +1099,9 @@ def _is_file_valid(name):
 def _find_files(directory, pattern):
     """Recursively load files in a directory."""
     for root, dirs, files in os.walk(directory, topdown=True):
+        if _LOADED_FILES is not None:
+            # Files added to or removed from the directory change its stat
+            _LOADED_FILES[root] = os.stat(root)
         dirs[:] = [d for d in dirs if _is_file_valid(d)]
         for basename in files:
             if _is_file_valid(basename) and fnmatch.fnmatch(basename, pattern):
@@ -477,6 +1110,8 @@ def _find_files(directory, pattern):
 
 
 def is_secret(value):
+    if not _SECRET_VALUES:
+        return None
     try:
         return _SECRET_VALUES[str(value)]
     except (KeyError, ValueError):
@@ -515,6 +1150,13 @@ class ESPHomeDumper(yaml.SafeDumper):
             return self.represent_secret(value)
         return self.represent_scalar(tag="tag:yaml.org,2002:str", value=str(value))
 
+    # pylint: disable=arguments-renamed
+    def represent_str(self, value):
+        # Only the secrets loaded with a provenance table are plain strings
+        if _PROVENANCE is not None:
+            return self.represent_stringify(value)
+        return super().represent_str(value)
+
     # pylint: disable=arguments-renamed
     def represent_bool(self, value):
         return self.represent_scalar(
@@ -568,6 +1210,9 @@ ESPHomeDumper.add_multi_representer(
 )
 ESPHomeDumper.add_multi_representer(bool, ESPHomeDumper.represent_bool)
 ESPHomeDumper.add_multi_representer(str, ESPHomeDumper.represent_stringify)
+# Plain strings would take the representer of SafeDumper, which does not
+# hide secrets
+ESPHomeDumper.add_representer(str, ESPHomeDumper.represent_str)
 ESPHomeDumper.add_multi_representer(int, ESPHomeDumper.represent_int)
 ESPHomeDumper.add_multi_representer(float, ESPHomeDumper.represent_float)
 ESPHomeDumper.add_multi_representer(IPAddress, ESPHomeDumper.represent_stringify)
@@ -576,3 +1221,68 @@ ESPHomeDumper.add_multi_representer(TimePeriod, ESPHomeDumper.represent_stringif
 ESPHomeDumper.add_multi_representer(Lambda, ESPHomeDumper.represent_lambda)
 ESPHomeDumper.add_multi_representer(core.ID, ESPHomeDumper.represent_id)
 ESPHomeDumper.add_multi_representer(uuid.UUID, ESPHomeDumper.represent_stringify)
+
+
+# The characters and the spaces next to line breaks that make PyYAML and
+# libyaml choose a double quoted scalar, which they wrap differently
+_C_EMITTER_UNSUPPORTED = re.compile(
+    "[^\n\x20-\x7e\xa1-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd]| \n|\n "
+)
+
+
+class _CEmitterUnsupported(Exception):
+    """The data could be emitted differently by libyaml."""
+
+
+if CEmitter is not None:
+
+    class ESPHomeCDumper(CEmitter, ESPHomeDumper):
+        """ESPHomeDumper emitting with libyaml.
+
+        The output is the same as of ESPHomeDumper for mappings and sequences
+        whose keys are not empty and whose strings do not need a double
+        quoted scalar, which libyaml wraps differently, or a block scalar
+        keeping its line breaks. It raises _CEmitterUnsupported for any other
+        data.
+        """
+
+        # Like yaml.CDumper, the emitter of ESPHomeDumper is replaced by CEmitter
+        def __init__(  # pylint: disable=super-init-not-called,non-parent-init-called
+            self,
+            stream,
+            default_style=None,
+            default_flow_style=False,
+            sort_keys=True,
+            **kwargs,
+        ):
+            """Initialize the ESPHomeCDumper."""
+            CEmitter.__init__(self, stream, **kwargs)
+            yaml.representer.SafeRepresenter.__init__(
+                self,
+                default_style=default_style,
+                default_flow_style=default_flow_style,
+                sort_keys=sort_keys,
+            )
+            yaml.resolver.Resolver.__init__(self)
+
+        def represent_scalar(self, tag, value, style=None):
+            if _C_EMITTER_UNSUPPORTED.search(value):
+                raise _CEmitterUnsupported
+            # Lambdas that cannot be a block scalar are double quoted, and
+            # only PyYAML ends the document after one with kept line breaks
+            if style == "|" and (
+                not value or value[-1] == " " or value == "\n" or value[-2:] == "\n\n"
+            ):
+                raise _CEmitterUnsupported
+            # PyYAML never writes a scalar with an explicit tag plain
+            if style is None and not tag.startswith("tag:yaml.org,2002:"):
+                style = "'"
+            # libyaml only takes exact strings, not the ESPHomeDataBase ones
+            return super().represent_scalar(tag, str(value), style)
+
+        def represent_mapping(self, tag, mapping, flow_style=None):
+            node = super().represent_mapping(tag, mapping, flow_style)
+            for node_key, _ in node.value:
+                if isinstance(node_key, yaml.ScalarNode) and not node_key.value:
+                    raise _CEmitterUnsupported
+            return node
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""Micro benchmarks for ESPHome's config validation and code generation.
+
+Each benchmark runs a synthetic workload for several sizes, so that the scaling
+behavior (linear vs quadratic) can be seen at a glance.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# pylint: disable=wrong-import-position
+from esphome import config  # noqa: E402
+from esphome.core import CORE, ID  # noqa: E402
+from esphome.cpp_generator import MockObjClass  # noqa: E402
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def _print_result(name, size, duration, previous):
+    growth = "" if previous is None else f"  x{duration / previous:.2f}"
+    print(f"{name:<20} n={size:<8} {duration * 1000:10.1f} ms{growth}")
+
+
+def bench_id_pass(sizes):
+    """Validate configs with many declared, referenced and automatic IDs."""
+    hub = MockObjClass("bench::Hub", parents=[])
+    sensor = MockObjClass("bench::Sensor", parents=[])
+
+    def build(size):
+        CORE.reset()
+        result = config.Config()
+        result["hub"] = [{"id": ID("hub", True, hub)}]
+        result["sensor"] = [
+            {
+                "id": ID(f"sensor_{i}" if i % 2 else None, True, sensor),
+                "hub_id": ID(None, False, hub),
+                "source_id": ID(f"sensor_{i - 2}", False, sensor)
+                if i % 4 == 3
+                else None,
+            }
+            for i in range(size)
+        ]
+        return result
+
+    previous = None
+    for size in sizes:
+        result = build(size)
+        duration = _timed(config.IDPassValidationStep().run, result)
+        assert not result.errors, result.errors[0]
+        _print_result("id_pass", size, duration, previous)
+        previous = duration
+
+
+def bench_image_encoding(sizes):
+    """Encode square RGBA images of the given width as RGB565 with transparency."""
+    from PIL import Image
+
+    from esphome.components.image import encoding
+
+    previous = None
+    for size in sizes:
+        image = Image.frombytes("RGBA", (size, size), os.urandom(size * size * 4))
+        duration = _timed(encoding.encode, image, "RGB565", True, Image.Dither.NONE)
+        _print_result("image_encoding", size, duration, previous)
+        previous = duration
+
+
+def bench_animation_encoding(sizes):
+    """Encode 320x240 GIF animations with the given number of frames as RGB565."""
+    import tempfile
+
+    from PIL import Image
+
+    from esphome.components import animation
+
+    previous = None
+    for size in sizes:
+        frames = [
+            Image.frombytes("RGB", (320, 240), os.urandom(320 * 240 * 3))
+            for _ in range(size)
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "animation.gif")
+            frames[0].save(path, save_all=True, append_images=frames[1:])
+            duration = _timed(
+                animation._encode_animation,  # pylint: disable=protected-access
+                path,
+                size,
+                "RGB565",
+                False,
+                (320, 240),
+                None,
+            )
+        _print_result("animation_encoding", size, duration, previous)
+        previous = duration
+
+
+def bench_font_rendering(sizes):
+    """Render the given number of glyphs of Pillow's builtin font at size 48."""
+    import tempfile
+
+    from PIL import ImageFont
+
+    from esphome.components import font
+
+    font_bytes = ImageFont.load_default().font_bytes
+    previous = None
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "font.ttf")
+            with open(path, "wb") as f_handle:
+                f_handle.write(font_bytes)
+            config = {
+                "file": {"type": font.TYPE_LOCAL, "path": path},
+                "size": 48,
+                "glyphs": [chr(0x4E00 + i) for i in range(size)],
+            }
+            duration = _timed(
+                font._render_glyphs,  # pylint: disable=protected-access
+                config,
+                path,
+            )
+        _print_result("font_rendering", size, duration, previous)
+        previous = duration
+
+
+def bench_byte_array(sizes):
+    """Render PROGMEM byte arrays with the given number of KiB as C++ code."""
+    from esphome.cpp_generator import ByteArrayInitializer
+
+    previous = None
+    for size in sizes:
+        data = os.urandom(size * 1024)
+        duration = _timed(str, ByteArrayInitializer(data, multiline=True))
+        _print_result("byte_array", size, duration, previous)
+        previous = duration
+
+
+def bench_vscode_validate(sizes):
+    """Validate a config with the given number of sensors in an editor session.
+
+    The sensors are split over four included files with their names in the
+    secrets, one of the files is edited before each validation. The mean latency of the validations is reported.
+    """
+    import argparse as argparse_
+    import tempfile
+
+    from esphome import vscode
+
+    previous = None
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "secrets.yaml"), "w") as f_handle:
+                for i in range(size):
+                    f_handle.write(f"name_{i}: Sensor {i}\n")
+            os.mkdir(os.path.join(tmp_dir, "sensors"))
+            includes = []
+            for part in range(4):
+                includes.append(os.path.join(tmp_dir, "sensors", f"part{part}.yaml"))
+                with open(includes[-1], "w") as f_handle:
+                    for i in range(part, size, 4):
+                        f_handle.write(
+                            f"- platform: template\n"
+                            f"  name: !secret name_{i}\n"
+                            f"  lambda: return {i};\n"
+                        )
+            path = os.path.join(tmp_dir, "bench.yaml")
+            with open(path, "w") as f_handle:
+                f_handle.write(
+                    "esphome:\n  name: bench\nhost:\nlogger:\napi:\n"
+                    "sensor: !include_dir_merge_list sensors\n"
+                )
+
+            session = vscode.ValidationSession(
+                argparse_.Namespace(ace=False, configuration=tmp_dir, substitution=None)
+            )
+            session.validate(path)
+            durations = []
+            for edit in range(10):
+                with open(includes[0], "a") as f_handle:
+                    f_handle.write(f"- platform: template\n  name: Edit {edit}\n")
+                start = time.perf_counter()
+                result = session.validate(path)
+                durations.append(time.perf_counter() - start)
+                assert not result.yaml_errors, result.yaml_errors
+        duration = sum(durations) / len(durations)
+        _print_result("vscode_validate", size, duration, previous)
+        previous = duration
+
+
+# Benchmark name -> (function, default sizes)
+BENCHMARKS = {
+    "id_pass": (bench_id_pass, [1000, 2000, 4000, 8000]),
+    "image_encoding": (bench_image_encoding, [120, 240, 480, 960]),
+    "animation_encoding": (bench_animation_encoding, [15, 30, 60]),
+    "font_rendering": (bench_font_rendering, [1000, 2000, 4000]),
+    "byte_array": (bench_byte_array, [256, 1024, 4096]),
+    "vscode_validate": (bench_vscode_validate, [100, 200, 400]),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        choices=[[], *BENCHMARKS],
+        help="The benchmarks to run, all by default.",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        help="The workload sizes to run each benchmark with.",
+    )
+    args = parser.parse_args()
+    for name in args.benchmarks or BENCHMARKS:
+        func, default_sizes = BENCHMARKS[name]
+        func(args.sizes or default_sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Tests for the animation component."""
+import random
+
+import pytest
+from PIL import Image
+
+from esphome.components import animation
+
+
+def _reference_encode(path, image_type, transparent, resize):
+    """The original per-pixel frame encoder, kept to verify the bulk encoders against."""
+    image = Image.open(path)
+    width, height = image.size
+    frames = image.n_frames
+    if resize:
+        width, height = resize
+    data = []
+    for frame_index in range(frames):
+        image.seek(frame_index)
+        if image_type in ("BINARY", "TRANSPARENT_BINARY"):
+            if transparent:
+                alpha = image.split()[-1]
+                has_alpha = alpha.getextrema()[0] < 0xFF
+            frame = image.convert("1", dither=Image.Dither.NONE)
+            if resize:
+                frame = frame.resize([width, height])
+                if transparent:
+                    alpha = alpha.resize([width, height])
+            width8 = ((width + 7) // 8) * 8
+            frame_data = [0 for _ in range(height * width8 // 8)]
+            for x, y in [(i, j) for i in range(width) for j in range(height)]:
+                if transparent and has_alpha:
+                    if not alpha.getpixel((x, y)):
+                        continue
+                elif frame.getpixel((x, y)):
+                    continue
+                pos = x + y * width8
+                frame_data[pos // 8] |= 0x80 >> (pos % 8)
+            data += frame_data
+            continue
+
+        mode = "LA" if image_type == "GRAYSCALE" else "RGBA"
+        frame = image.convert(mode, dither=Image.Dither.NONE)
+        if resize:
+            frame = frame.resize([width, height])
+        for pixel in frame.getdata():
+            if image_type == "GRAYSCALE":
+                pix, a = pixel
+                if transparent:
+                    if pix == 1:
+                        pix = 0
+                    if a < 0x80:
+                        pix = 1
+                data.append(pix)
+            elif image_type == "RGBA":
+                data += pixel
+            elif image_type == "RGB24":
+                r, g, b, a = pixel
+                if transparent:
+                    if r == 0 and g == 0 and b == 1:
+                        b = 0
+                    if a < 0x80:
+                        r, g, b = 0, 0, 1
+                data += [r, g, b]
+            else:
+                r, g, b, a = pixel
+                rgb = ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
+                if transparent:
+                    if rgb == 0x0020:
+                        rgb = 0
+                    if a < 0x80:
+                        rgb = 0x0020
+                data += [rgb >> 8, rgb & 0xFF]
+    return bytes(data)
+
+
+@pytest.fixture(params=["gif", "png"])
+def animation_file(request, tmp_path):
+    rnd = random.Random(42)
+    size = (13, 9)
+    frames = []
+    for _ in range(5):
+        raw = bytes(
+            rnd.choice([0, 1, 0x20, 0x80, 0xFF]) for _ in range(size[0] * size[1] * 4)
+        )
+        frames.append(Image.frombytes("RGBA", size, raw))
+    path = tmp_path / f"animation.{request.param}"
+    frames[0].save(path, save_all=True, append_images=frames[1:], disposal=2)
+    return path
+
+
+@pytest.mark.parametrize(
+    "image_type", ["GRAYSCALE", "RGBA", "RGB24", "RGB565", "BINARY"]
+)
+@pytest.mark.parametrize("transparent", [False, True])
+@pytest.mark.parametrize("resize", [None, (7, 5)])
+def test_encode_animation__matches_reference(
+    animation_file, image_type, transparent, resize
+):
+    image = Image.open(animation_file)
+    size = resize or image.size
+
+    actual = animation._encode_animation(
+        animation_file, image.n_frames, image_type, transparent, size, resize
+    )
+
+    assert actual == _reference_encode(animation_file, image_type, transparent, resize)
+
+
+@pytest.mark.parametrize("image_type", ["RGB565", "BINARY"])
+def test_encode_animation__workers(monkeypatch, animation_file, image_type):
+    image = Image.open(animation_file)
+    args = (animation_file, image.n_frames, image_type, True, image.size, None)
+    expected = animation._encode_animation(*args)
+
+    monkeypatch.setenv(animation.ENV_ANIMATION_WORKERS, "2")
+
+    assert animation._encode_animation(*args) == expected
@@ -0,0 +1,131 @@
+"""Tests for the font component."""
+import pytest
+from PIL import ImageFont
+
+from esphome.components import font
+from esphome.const import CONF_FILE, CONF_GLYPHS, CONF_PATH, CONF_SIZE, CONF_TYPE
+from esphome.core import CORE
+from esphome.yaml_util import make_data_base
+
+GLYPHS = ["!", "%", "0", "A", "g", "j", "~", " ", "°", "é"]
+
+BDF_FONT = """STARTFONT 2.1
+FONT -test-fixed-medium-r-normal--8-80-75-75-c-50-iso10646-1
+SIZE 8 75 75
+FONTBOUNDINGBOX 5 8 0 -1
+STARTPROPERTIES 2
+FONT_ASCENT 7
+FONT_DESCENT 1
+ENDPROPERTIES
+CHARS 2
+STARTCHAR A
+ENCODING 65
+SWIDTH 500 0
+DWIDTH 5 0
+BBX 5 8 0 -1
+BITMAP
+20
+50
+88
+88
+F8
+88
+88
+00
+ENDCHAR
+STARTCHAR B
+ENCODING 66
+SWIDTH 500 0
+DWIDTH 5 0
+BBX 5 8 0 -1
+BITMAP
+F0
+88
+F0
+88
+88
+88
+F0
+00
+ENDCHAR
+ENDFONT
+"""
+
+
+def _reference_render(config, path):
+    """The original per-pixel glyph packer, kept to verify the bulk packer against."""
+    if config[CONF_FILE][CONF_TYPE] == font.TYPE_LOCAL_BITMAP:
+        wrapper = font.load_bitmap_font(path)
+    else:
+        wrapper = font.load_ttf_font(path, config[CONF_SIZE])
+    glyph_args = []
+    data = []
+    for glyph in config[CONF_GLYPHS]:
+        mask = wrapper.getmask(glyph, mode="1")
+        offset_x, offset_y = wrapper.getoffset(glyph)
+        width, height = mask.size
+        width8 = ((width + 7) // 8) * 8
+        glyph_data = [0] * (height * width8 // 8)
+        for y in range(height):
+            for x in range(width):
+                if not mask.getpixel((x, y)):
+                    continue
+                pos = x + y * width8
+                glyph_data[pos // 8] |= 0x80 >> (pos % 8)
+        glyph_args.append((len(data), offset_x, offset_y, width, height))
+        data += glyph_data
+    return bytes(data), glyph_args
+
+
+@pytest.fixture
+def ttf_path(tmp_path):
+    default = ImageFont.load_default()
+    if not isinstance(default, ImageFont.FreeTypeFont):
+        pytest.skip("Pillow has no builtin TrueType font")
+    path = tmp_path / "font.ttf"
+    path.write_bytes(default.font_bytes)
+    return path
+
+
+@pytest.mark.parametrize("size", [8, 20, 48])
+def test_render_glyphs__ttf_matches_reference(ttf_path, size):
+    config = {
+        CONF_FILE: {CONF_TYPE: font.TYPE_LOCAL, CONF_PATH: str(ttf_path)},
+        CONF_SIZE: size,
+        CONF_GLYPHS: GLYPHS,
+    }
+
+    data, glyph_args, _, _ = font._render_glyphs(config, ttf_path)
+
+    assert (data, glyph_args) == _reference_render(config, ttf_path)
+
+
+def test_render_glyphs__workers(monkeypatch, ttf_path):
+    config = {
+        CONF_FILE: {CONF_TYPE: font.TYPE_LOCAL, CONF_PATH: str(ttf_path)},
+        CONF_SIZE: make_data_base(20),
+        CONF_GLYPHS: [make_data_base(glyph) for glyph in GLYPHS],
+    }
+    expected = font._render_glyphs(config, ttf_path)
+
+    monkeypatch.setenv(font.ENV_FONT_WORKERS, "3")
+
+    assert font._render_glyphs(config, ttf_path) == expected
+
+
+def test_render_glyphs__bitmap_matches_reference(tmp_path):
+    CORE.config_path = str(tmp_path / "test.yaml")
+    path = tmp_path / "font.bdf"
+    path.write_text(BDF_FONT)
+    path = str(path)
+    config = {
+        CONF_FILE: {CONF_TYPE: font.TYPE_LOCAL_BITMAP, CONF_PATH: path},
+        CONF_GLYPHS: ["A", "B"],
+    }
+    try:
+        data, glyph_args, _, _ = font._render_glyphs(config, path)
+
+        assert data[:8] == bytes([0x20, 0x50, 0x88, 0x88, 0xF8, 0x88, 0x88, 0x00])
+        assert (data, glyph_args) == _reference_render(config, path)
+    finally:
+        CORE.reset()
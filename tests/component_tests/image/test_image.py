@@ -0,0 +1,133 @@
+"""Tests for the image component."""
+import random
+
+import pytest
+from PIL import Image
+
+from esphome.components.image import encoding
+
+
+def _reference_encode(image, image_type, transparent, dither):
+    """The original per-pixel encoder, kept to verify the bulk encoders against."""
+    width, height = image.size
+    if image_type == "GRAYSCALE":
+        image = image.convert("LA", dither=dither)
+        data = []
+        for g, a in image.getdata():
+            if transparent:
+                if g == 1:
+                    g = 0
+                if a < 0x80:
+                    g = 1
+            data.append(g)
+
+    elif image_type == "RGBA":
+        image = image.convert("RGBA")
+        data = []
+        for r, g, b, a in image.getdata():
+            data += [r, g, b, a]
+
+    elif image_type == "RGB24":
+        image = image.convert("RGBA")
+        data = []
+        for r, g, b, a in image.getdata():
+            if transparent:
+                if r == 0 and g == 0 and b == 1:
+                    b = 0
+                if a < 0x80:
+                    r = 0
+                    g = 0
+                    b = 1
+            data += [r, g, b]
+
+    elif image_type == "RGB565":
+        image = image.convert("RGBA")
+        data = []
+        for r, g, b, a in image.getdata():
+            rgb = ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
+            if transparent:
+                if rgb == 0x0020:
+                    rgb = 0
+                if a < 0x80:
+                    rgb = 0x0020
+            data += [rgb >> 8, rgb & 0xFF]
+
+    else:
+        if transparent:
+            alpha = image.split()[-1]
+            has_alpha = alpha.getextrema()[0] < 0xFF
+        image = image.convert("1", dither=dither)
+        width8 = ((width + 7) // 8) * 8
+        data = [0 for _ in range(height * width8 // 8)]
+        for y in range(height):
+            for x in range(width):
+                if transparent and has_alpha:
+                    if not alpha.getpixel((x, y)):
+                        continue
+                elif image.getpixel((x, y)):
+                    continue
+                pos = x + y * width8
+                data[pos // 8] |= 0x80 >> (pos % 8)
+
+    return bytes(data)
+
+
+def _random_image(mode, size, seed):
+    rnd = random.Random(seed)
+    channels = len(Image.new(mode, (1, 1)).getbands())
+    # Use a small set of values so that the transparency sentinels and
+    # threshold values are hit often
+    values = [0, 1, 0x20, 0x7F, 0x80, 0xC0, 0xFE, 0xFF]
+    raw = bytes(
+        rnd.choice(values) if rnd.random() < 0.5 else rnd.randrange(256)
+        for _ in range(size[0] * size[1] * channels)
+    )
+    if mode == "P":
+        image = Image.frombytes("L", size, raw)
+        image = image.convert("P")
+        return image
+    return Image.frombytes(mode, size, raw)
+
+
+IMAGE_TYPES = ["GRAYSCALE", "RGBA", "RGB24", "RGB565", "BINARY"]
+MODES = ["RGBA", "RGB", "LA", "L", "P", "1"]
+SIZES = [(1, 1), (7, 3), (16, 5), (33, 17)]
+
+
+@pytest.mark.parametrize("image_type", IMAGE_TYPES)
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("transparent", [False, True])
+@pytest.mark.parametrize("dither", [Image.Dither.NONE, Image.Dither.FLOYDSTEINBERG])
+def test_encode__matches_reference(image_type, mode, transparent, dither):
+    for seed, size in enumerate(SIZES):
+        image = _random_image(mode, size, seed)
+
+        expected = _reference_encode(image, image_type, transparent, dither)
+        actual = encoding.encode(image, image_type, transparent, dither)
+
+        assert actual == expected, f"{size} {mode}"
+
+
+def test_encode__transparency_sentinels():
+    image = Image.new("RGBA", (3, 1))
+    image.putdata([(0, 0, 1, 255), (0, 4, 0, 255), (10, 20, 30, 0)])
+
+    assert encoding.encode(image, "RGB24", True, Image.Dither.NONE) == bytes(
+        [0, 0, 0, 0, 4, 0, 0, 0, 1]
+    )
+    assert encoding.encode(image, "RGB565", True, Image.Dither.NONE) == bytes(
+        [0, 0, 0, 0, 0, 0x20]
+    )
+
+
+def test_encode__binary_row_padding():
+    image = Image.new("1", (10, 2), 0)
+
+    assert encoding.encode(image, "BINARY", False, Image.Dither.NONE) == bytes(
+        [0xFF, 0xC0, 0xFF, 0xC0]
+    )
+
+
+def test_encode__unsupported_type():
+    with pytest.raises(ValueError):
+        encoding.encode(Image.new("RGB", (1, 1)), "FOO", False, Image.Dither.NONE)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from esphome.core import CORE
+from esphome.dashboard.entries import DashboardEntry, EntryState
+from esphome.dashboard.status import mqtt
+
+
+class FakeEntries:
+    def __init__(self, entries: list[DashboardEntry]) -> None:
+        self.entries = entries
+        self.changes: list[tuple[str, EntryState]] = []
+
+    def get_by_name(self, name: str) -> set[DashboardEntry] | None:
+        return {entry for entry in self.entries if entry.name == name} or None
+
+    def async_all(self) -> list[DashboardEntry]:
+        return list(self.entries)
+
+    def async_set_state(self, entry: DashboardEntry, state: EntryState) -> None:
+        if entry.state != state:
+            entry.state = state
+            self.changes.append((entry.name, state))
+
+
+@pytest.fixture(autouse=True)
+def config_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(CORE, "config_path", str(tmp_path / "."))
+
+
+def _entry(name: str, no_mdns: bool) -> DashboardEntry:
+    entry = DashboardEntry(f"/config/{name}.yaml", (1, 1, 1.0, 1))
+    entry.storage = Mock(no_mdns=no_mdns)
+    entry.storage.name = name
+    return entry
+
+
+@pytest.fixture
+def entries(monkeypatch: pytest.MonkeyPatch) -> FakeEntries:
+    entries = FakeEntries([_entry(f"device{i}", True) for i in range(3)])
+    monkeypatch.setattr(mqtt, "DASHBOARD", Mock(entries=entries))
+    return entries
+
+
+def _payload(name: str) -> bytes:
+    return json.dumps({"name": name, "ip": "10.0.0.1"}).encode()
+
+
+@pytest.mark.asyncio
+async def test_discovery_batches(entries: FakeEntries) -> None:
+    status = mqtt.MqttStatusThread()
+    process_seen = Mock(wraps=status._async_process_seen)
+    status._async_process_seen = process_seen
+
+    for name in ("device0", "device1", "device0", "unknown"):
+        status._handle_discovery(_payload(name))
+    status._handle_discovery(b"")
+    status._handle_discovery(b"not json")
+    assert len(status._seen) == 3
+    await asyncio.sleep(0)
+
+    process_seen.assert_called_once()
+    assert status._seen == {}
+    assert set(status._last_seen) == {"device0", "device1", "unknown"}
+    assert entries.changes == [
+        ("device0", EntryState.ONLINE),
+        ("device1", EntryState.ONLINE),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_liveness_ttl(entries: FakeEntries) -> None:
+    status = mqtt.MqttStatusThread()
+    entries.entries.append(_entry("mdns", False))
+    now = time.monotonic()
+
+    status._last_seen = {"device0": now - 5, "device1": now - 100}
+    status._active_since = now - 100
+    status._async_check_liveness()
+    assert entries.changes == [
+        ("device1", EntryState.OFFLINE),
+        ("device2", EntryState.OFFLINE),
+    ]
+
+    # Devices get a full TTL to answer after the dashboard was opened again
+    entries.changes.clear()
+    entries.entries[0].state = EntryState.UNKNOWN
+    status._last_seen = {}
+    status._active_since = now
+    status._async_check_liveness()
+    assert entries.changes == []
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from unittest.mock import Mock
+
+from icmplib import Host
+import pytest
+import pytest_asyncio
+
+from esphome.core import CORE
+from esphome.dashboard.core import EventBus
+from esphome.dashboard.entries import DashboardEntry, EntryState
+from esphome.dashboard.status import ping
+
+
+class FakeEntries:
+    def __init__(self, entries: list[DashboardEntry]) -> None:
+        self.entries = {entry.path: entry for entry in entries}
+
+    def get(self, path: str) -> DashboardEntry | None:
+        return self.entries.get(path)
+
+    def async_all(self) -> list[DashboardEntry]:
+        return list(self.entries.values())
+
+    def async_set_state(self, entry: DashboardEntry, state: EntryState) -> None:
+        entry.state = state
+
+
+class FakePinger:
+    """Answer pings after a delay, keeping track of the concurrent pings."""
+
+    def __init__(self, offline: set[str]) -> None:
+        self.offline = offline
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.pinged: list[str] = []
+
+    async def async_ping(self, address: str, **kwargs) -> Host:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        self.pinged.append(address)
+        if address in self.offline:
+            return Host(address, 2, [])
+        return Host(address, 2, [1.0, 3.0])
+
+
+@pytest.fixture(autouse=True)
+def config_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(CORE, "config_path", str(tmp_path / "."))
+
+
+@pytest_asyncio.fixture
+async def dashboard(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    async def async_resolve(hostname: str) -> list[str] | Exception:
+        if hostname.startswith("unresolvable"):
+            return OSError("unresolvable")
+        return [hostname]
+
+    dashboard = Mock(
+        bus=EventBus(),
+        stop_event=threading.Event(),
+        ping_request=asyncio.Event(),
+    )
+    dashboard.resolver.async_resolve = async_resolve
+    monkeypatch.setattr(ping, "DASHBOARD", dashboard)
+
+    async def can_use_privileged() -> bool:
+        return False
+
+    monkeypatch.setattr(ping, "_can_use_icmp_lib_with_privilege", can_use_privileged)
+    return dashboard
+
+
+def _entry(name: str, address: str | None) -> DashboardEntry:
+    entry = DashboardEntry(f"/config/{name}.yaml", (1, 1, 1.0, 1))
+    entry.storage = Mock(address=address)
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_probes_are_bounded(
+    dashboard: Mock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    entries = [_entry(f"device{i}", f"10.0.0.{i}") for i in range(50)]
+    entries.append(_entry("unresolvable", "unresolvable.local"))
+    entries.append(_entry("no_address", None))
+    dashboard.entries = FakeEntries(entries)
+    pinger = FakePinger({"10.0.0.1", "10.0.0.2"})
+    monkeypatch.setattr(ping, "async_ping", pinger.async_ping)
+    monkeypatch.setattr(ping, "MAX_IN_FLIGHT", 5)
+
+    status = ping.PingStatus()
+    dashboard.ping_request.set()
+    task = asyncio.create_task(status.async_run())
+
+    async def probed_all() -> None:
+        while status.stats.probes < 51 or status._in_flight:
+            await asyncio.sleep(0.01)
+
+    try:
+        await asyncio.wait_for(probed_all(), 5)
+    finally:
+        dashboard.stop_event.set()
+        task.cancel()
+
+    assert pinger.max_in_flight == 5
+    assert status.stats.max_in_flight == 5
+    assert sorted(pinger.pinged) == sorted(f"10.0.0.{i}" for i in range(50))
+    assert status.stats.probes == 51
+    assert status.stats.timeouts == 2
+    assert status.stats.errors == 1
+    assert status.stats.average_latency == 2.0
+    assert entries[0].state == EntryState.ONLINE
+    assert entries[1].state == EntryState.OFFLINE
+    assert entries[50].state == EntryState.UNKNOWN
+    assert entries[51].state == EntryState.UNKNOWN
+
+
+@pytest.mark.asyncio
+async def test_intervals(dashboard: Mock) -> None:
+    entry = _entry("device", "10.0.0.1")
+    dashboard.entries = FakeEntries([entry])
+    status = ping.PingStatus()
+
+    def next_interval(state: EntryState) -> float:
+        status._deadlines.clear()
+        status._async_set_result(entry, state)
+        return status._intervals[entry]
+
+    assert next_interval(EntryState.ONLINE) == ping.ONLINE_INTERVAL
+    assert next_interval(EntryState.ONLINE) == ping.ONLINE_INTERVAL
+    # A changed state is confirmed quickly
+    assert next_interval(EntryState.OFFLINE) == ping.RECHECK_INTERVAL
+    # Hosts that stay offline are probed less and less often
+    intervals = [next_interval(EntryState.OFFLINE) for _ in range(8)]
+    assert intervals[:3] == [
+        ping.ONLINE_INTERVAL,
+        ping.ONLINE_INTERVAL * 2,
+        ping.ONLINE_INTERVAL * 4,
+    ]
+    assert intervals[-1] == ping.OFFLINE_MAX_INTERVAL
+    assert next_interval(EntryState.ONLINE) == ping.RECHECK_INTERVAL
+    assert next_interval(EntryState.ONLINE) == ping.ONLINE_INTERVAL
+
+
+@pytest.mark.asyncio
+async def test_probe_error_reschedules(
+    dashboard: Mock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    entry = _entry("device", "broken.local")
+    dashboard.entries = FakeEntries([entry])
+
+    async def async_resolve(hostname: str) -> list[str]:
+        raise RuntimeError("resolver failed")
+
+    dashboard.resolver.async_resolve = async_resolve
+    status = ping.PingStatus()
+    status._in_flight[entry] = Mock()
+
+    await status._async_probe(entry, False)
+
+    assert not status._in_flight
+    assert entry.state == EntryState.UNKNOWN
+    assert status.stats.errors == 1
+    # The host is probed again instead of dropping out
+    assert entry in status._deadlines
+    assert status._queue[0][2] is entry
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+import pytest_asyncio
+
+from esphome.core import CORE
+from esphome.dashboard import const, entries
+from esphome.dashboard.core import Event, EventBus
+from esphome.dashboard.entries import DashboardEntries
+from esphome.dashboard.util import inotify
+
+
+class EntriesTestHelper:
+    def __init__(self, entries: DashboardEntries, bus: EventBus) -> None:
+        self.entries = entries
+        self.events: asyncio.Queue[Event] = asyncio.Queue()
+        for event_type in (
+            const.EVENT_ENTRY_ADDED,
+            const.EVENT_ENTRY_UPDATED,
+            const.EVENT_ENTRY_REMOVED,
+        ):
+            bus.async_add_listener(event_type, self.events.put_nowait)
+
+    async def next_event(self) -> Event:
+        return await asyncio.wait_for(self.events.get(), 5)
+
+
+@pytest.fixture
+def config_dir(tmp_path: Path) -> Path:
+    CORE.config_path = os.path.join(str(tmp_path), ".")
+    yield tmp_path
+    CORE.reset()
+
+
+@pytest_asyncio.fixture
+async def helper(config_dir: Path) -> EntriesTestHelper:
+    bus = EventBus()
+    dashboard = Mock(bus=bus)
+    dashboard.settings.config_dir = str(config_dir)
+    entries = DashboardEntries(dashboard)
+    yield EntriesTestHelper(entries, bus)
+    entries.async_stop_watching()
+
+
+def _write_storage(config_dir: Path, filename: str, name: str) -> None:
+    storage_dir = config_dir / ".esphome" / "storage"
+    storage_dir.mkdir(parents=True, exist_ok=True)
+    (storage_dir / f"{filename}.json").write_text(
+        json.dumps({"storage_version": 1, "name": name})
+    )
+
+
+@pytest.mark.asyncio
+async def test_watch__added_updated_removed(
+    config_dir: Path, helper: EntriesTestHelper
+) -> None:
+    if not helper.entries.async_start_watching():
+        pytest.skip("inotify is not available")
+    (config_dir / "existing.yaml").write_text("")
+    await helper.entries.async_update_entries()
+    assert (await helper.next_event()).event_type == const.EVENT_ENTRY_ADDED
+
+    (config_dir / "new.yaml").write_text("")
+    event = await helper.next_event()
+    assert event.event_type == const.EVENT_ENTRY_ADDED
+    assert event.data["entry"].name == "new"
+
+    # The storage dir is created after the watch started
+    _write_storage(config_dir, "new.yaml", "renamed")
+    event = await helper.next_event()
+    assert event.event_type == const.EVENT_ENTRY_UPDATED
+    assert event.data["entry"].name == "renamed"
+    assert helper.entries.get_by_name("renamed") == {event.data["entry"]}
+
+    (config_dir / "new.yaml").unlink()
+    event = await helper.next_event()
+    assert event.event_type == const.EVENT_ENTRY_REMOVED
+    assert event.data["entry"].path == str(config_dir / "new.yaml")
+
+    # Files that are not configurations are ignored
+    (config_dir / "secrets.yaml").write_text("")
+    (config_dir / "notes.txt").write_text("")
+    await asyncio.sleep(0.1)
+    assert helper.events.empty()
+    assert [entry.name for entry in helper.entries.async_all()] == ["existing"]
+
+
+@pytest.mark.asyncio
+async def test_watch__requests_do_not_poll(
+    config_dir: Path, helper: EntriesTestHelper, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if not helper.entries.async_start_watching():
+        pytest.skip("inotify is not available")
+    await helper.entries.async_update_entries()
+    monkeypatch.setattr(
+        DashboardEntries, "_get_path_to_cache_key", Mock(side_effect=AssertionError)
+    )
+
+    await helper.entries.async_request_update_entries()
+
+
+@pytest.mark.asyncio
+async def test_polling_fallback(
+    config_dir: Path, helper: EntriesTestHelper, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(inotify, "_load_libc", lambda: None)
+    monkeypatch.setattr(entries, "POLL_INTERVAL", 0.01)
+
+    assert not helper.entries.async_start_watching()
+    assert not helper.entries.watching
+    assert helper.entries.polling
+    await helper.entries.async_update_entries()
+
+    # Changes are picked up without a request
+    (config_dir / "device.yaml").write_text("")
+    assert (await helper.next_event()).event_type == const.EVENT_ENTRY_ADDED
+    (config_dir / "device.yaml").unlink()
+    assert (await helper.next_event()).event_type == const.EVENT_ENTRY_REMOVED
+
+    # Requests do not scan the config dir
+    monkeypatch.setattr(entries, "POLL_INTERVAL", 3600)
+    await asyncio.sleep(0.05)
+    monkeypatch.setattr(
+        DashboardEntries, "_get_path_to_cache_key", Mock(side_effect=AssertionError)
+    )
+    await helper.entries.async_request_update_entries()
+    helper.entries.async_stop_watching()
+    assert not helper.entries.polling
+
+
+@pytest.mark.asyncio
+async def test_changes_processed_after_error(
+    config_dir: Path, helper: EntriesTestHelper, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if not helper.entries.async_start_watching():
+        pytest.skip("inotify is not available")
+    await helper.entries.async_update_entries()
+    get_path_to_cache_key = DashboardEntries._get_path_to_cache_key
+    monkeypatch.setattr(
+        DashboardEntries, "_get_path_to_cache_key", Mock(side_effect=OSError)
+    )
+    # The config dir was moved, listing it fails
+    helper.entries._async_path_changed(str(config_dir), None)
+    await asyncio.wait_for(helper.entries._changes_task, 5)
+    assert helper.entries._changes_task is None
+
+    monkeypatch.setattr(
+        DashboardEntries, "_get_path_to_cache_key", get_path_to_cache_key
+    )
+    (config_dir / "device.yaml").write_text("")
+    helper.entries._async_path_changed(str(config_dir), "device.yaml")
+    event = await helper.next_event()
+    assert event.event_type == const.EVENT_ENTRY_ADDED
+    assert event.data["entry"].name == "device"
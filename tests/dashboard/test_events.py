@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+import pytest_asyncio
+
+from esphome.core import CORE
+from esphome.dashboard import const, events
+from esphome.dashboard.core import EventBus
+from esphome.dashboard.entries import DashboardEntry, EntryState
+from esphome.dashboard.events import DashboardEventStream
+
+
+class EventStreamTestHelper:
+    def __init__(self, stream: DashboardEventStream, bus: EventBus) -> None:
+        self.stream = stream
+        self.bus = bus
+        self.messages: list[dict] = []
+
+    def receive(self, message: str) -> None:
+        self.messages.append(json.loads(message))
+
+    def fire(self, event_type: str, entry: DashboardEntry) -> None:
+        self.bus.async_fire(event_type, {"entry": entry})
+
+    async def flush(self) -> None:
+        await asyncio.sleep(events.DELTA_INTERVAL * 2)
+
+
+@pytest_asyncio.fixture
+async def helper(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> EventStreamTestHelper:
+    monkeypatch.setattr(events, "DELTA_INTERVAL", 0.01)
+    monkeypatch.setattr(CORE, "config_path", str(tmp_path / "."))
+    bus = EventBus()
+    dashboard = Mock(bus=bus, loop=asyncio.get_running_loop())
+    helper = EventStreamTestHelper(DashboardEventStream(dashboard), bus)
+    unsubscribe = helper.stream.async_subscribe(helper.receive)
+    yield helper
+    unsubscribe()
+
+
+def _entry(name: str, state: EntryState = EntryState.UNKNOWN) -> DashboardEntry:
+    entry = DashboardEntry(f"/config/{name}.yaml", (1, 1, 1.0, 1))
+    entry.state = state
+    return entry
+
+
+@pytest.mark.asyncio
+async def test_changes_are_batched(helper: EventStreamTestHelper) -> None:
+    added = _entry("added")
+    updated = _entry("updated", EntryState.ONLINE)
+    removed = _entry("removed")
+    online = _entry("online", EntryState.ONLINE)
+
+    helper.fire(const.EVENT_ENTRY_ADDED, added)
+    helper.fire(const.EVENT_ENTRY_UPDATED, updated)
+    helper.fire(const.EVENT_ENTRY_REMOVED, removed)
+    helper.fire(const.EVENT_ENTRY_STATE_CHANGED, online)
+    # The state of changed entries is part of the entry
+    helper.fire(const.EVENT_ENTRY_STATE_CHANGED, updated)
+    await helper.flush()
+
+    assert helper.messages == [
+        {
+            "event": "delta",
+            "data": {
+                "added": [{**added.to_dict(), "state": None}],
+                "updated": [{**updated.to_dict(), "state": True}],
+                "removed": ["removed.yaml"],
+                "states": {"online.yaml": True},
+            },
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_state_flaps_are_coalesced(helper: EventStreamTestHelper) -> None:
+    entries = [_entry(f"device{i}") for i in range(100)]
+    for state in (EntryState.ONLINE, EntryState.OFFLINE, EntryState.ONLINE):
+        for entry in entries:
+            entry.state = state
+            helper.fire(const.EVENT_ENTRY_STATE_CHANGED, entry)
+    await helper.flush()
+
+    assert len(helper.messages) == 1
+    states = helper.messages[0]["data"]["states"]
+    assert states == {entry.filename: True for entry in entries}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("event_types", "expected"),
+    [
+        ((const.EVENT_ENTRY_ADDED, const.EVENT_ENTRY_UPDATED), "added"),
+        ((const.EVENT_ENTRY_ADDED, const.EVENT_ENTRY_REMOVED), None),
+        (
+            (
+                const.EVENT_ENTRY_ADDED,
+                const.EVENT_ENTRY_REMOVED,
+                const.EVENT_ENTRY_ADDED,
+            ),
+            "added",
+        ),
+        ((const.EVENT_ENTRY_REMOVED, const.EVENT_ENTRY_ADDED), "updated"),
+        ((const.EVENT_ENTRY_UPDATED, const.EVENT_ENTRY_REMOVED), "removed"),
+    ],
+)
+async def test_entry_events_are_coalesced(
+    helper: EventStreamTestHelper, event_types: tuple[str, ...], expected: str | None
+) -> None:
+    entry = _entry("device")
+    for event_type in event_types:
+        helper.fire(event_type, entry)
+    await helper.flush()
+
+    if expected is None:
+        assert helper.messages == []
+    else:
+        assert list(helper.messages[0]["data"]) == [expected]
+
+
+@pytest.mark.asyncio
+async def test_no_listeners_without_subscribers(
+    helper: EventStreamTestHelper,
+) -> None:
+    second_messages: list[str] = []
+    second = helper.stream.async_subscribe(second_messages.append)
+    helper.fire(const.EVENT_ENTRY_ADDED, _entry("device"))
+    second()
+    # Pending changes are kept while there are subscribers
+    await helper.flush()
+    assert len(helper.messages) == 1
+    assert second_messages == []
+
+    helper.messages.clear()
+    helper.stream._async_unsubscribe(helper.receive)
+    helper.fire(const.EVENT_ENTRY_ADDED, _entry("other"))
+    await helper.flush()
+    assert helper.messages == []
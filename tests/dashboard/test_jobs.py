@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from typing import Any
+
+import pytest
+
+from esphome.dashboard import jobs
+from esphome.dashboard.jobs import JobScheduler, JobState
+
+
+def _command(*lines: str, sleep: float = 0.0) -> list[str]:
+    script = f"import time; print({chr(10).join(lines)!r}); time.sleep({sleep})"
+    return [sys.executable, "-c", script]
+
+
+class Client:
+    def __init__(self) -> None:
+        self.messages: list[dict[str, Any]] = []
+        self.exited = asyncio.Event()
+
+    def __call__(self, message: str) -> None:
+        self.messages.append(json.loads(message))
+        if self.messages[-1]["event"] == "exit":
+            self.exited.set()
+
+    @property
+    def output(self) -> str:
+        return "".join(m["data"] for m in self.messages if m["event"] == "line")
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_deduplicated() -> None:
+    scheduler = JobScheduler()
+    command = _command("one", "two", sleep=0.2)
+    first, second = Client(), Client()
+
+    job = scheduler.async_submit(command, "a.yaml", jobs.PRIORITY_BUILD)
+    job.async_subscribe(first)
+    await asyncio.sleep(0.1)
+    assert scheduler.async_submit(command, "a.yaml", jobs.PRIORITY_BUILD) is job
+    # A client attaching late gets the output so far
+    job.async_subscribe(second)
+
+    await asyncio.wait_for(second.exited.wait(), 5)
+    assert first.messages == second.messages
+    assert first.output == "one\ntwo\n"
+    assert first.messages[-1] == {"event": "exit", "code": 0}
+    # A finished job is not reused
+    new_job = scheduler.async_submit(command, "a.yaml", jobs.PRIORITY_BUILD)
+    assert new_job is not job
+    scheduler.async_cancel(new_job)
+    await asyncio.wait_for(new_job._task, 5)
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_scheduled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(jobs.ENV_MAX_JOBS, "2")
+    scheduler = JobScheduler()
+    started: list[str] = []
+    original_start = jobs.DashboardJob.async_start
+
+    def async_start(job: jobs.DashboardJob) -> None:
+        started.append(job.command[-1])
+        original_start(job)
+
+    monkeypatch.setattr(jobs.DashboardJob, "async_start", async_start)
+
+    clients = {}
+    for name, configuration, priority in (
+        ("a1", "a.yaml", jobs.PRIORITY_BUILD),
+        ("a2", "a.yaml", jobs.PRIORITY_BUILD),
+        ("b", "b.yaml", jobs.PRIORITY_BUILD),
+        ("c", "c.yaml", jobs.PRIORITY_BACKGROUND),
+        ("d", "d.yaml", jobs.PRIORITY_DEVICE),
+    ):
+        command = [*_command(name, sleep=0.1), name]
+        clients[name] = Client()
+        scheduler.async_submit(command, configuration, priority).async_subscribe(
+            clients[name]
+        )
+
+    # Only one job runs per configuration, the device job goes first
+    assert started == ["a1", "b"]
+    await asyncio.wait_for(
+        asyncio.gather(*(client.exited.wait() for client in clients.values())), 10
+    )
+    assert started == ["a1", "b", "d", "a2", "c"]
+    assert clients["d"].output == "Waiting for other builds to finish...\nd\n"
+    assert clients["a1"].output == "a1\n"
+
+
+@pytest.mark.asyncio
+async def test_job_cancelled_without_clients() -> None:
+    scheduler = JobScheduler()
+    running = scheduler.async_submit(_command("x", sleep=10), "a.yaml", 1)
+    queued = scheduler.async_submit(_command("y"), "b.yaml", 1)
+    unsubscribe_running = running.async_subscribe(Client())
+    unsubscribe_queued = queued.async_subscribe(Client())
+    assert queued.state == JobState.QUEUED
+
+    unsubscribe_queued()
+    assert queued.state == JobState.DONE
+    unsubscribe_running()
+    await asyncio.wait_for(running._task, 5)
+    assert running.returncode != 0
+
+
+@pytest.mark.asyncio
+async def test_job_slot_released_on_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    scheduler = JobScheduler()
+
+    async def _async_read_output(job: jobs.DashboardJob) -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(jobs.DashboardJob, "_async_read_output", _async_read_output)
+    client = Client()
+    failed = scheduler.async_submit(_command("x", sleep=10), "a.yaml", 1)
+    failed.async_subscribe(client)
+    await asyncio.wait_for(client.exited.wait(), 5)
+    assert failed.state == JobState.DONE
+    assert client.messages[-1] == {"event": "exit", "code": 1}
+
+    # A cancelled task releases its slot too
+    monkeypatch.undo()
+    cancelled = scheduler.async_submit(_command("y", sleep=10), "a.yaml", 1)
+    queued = scheduler.async_submit(_command("z"), "b.yaml", 1)
+    assert queued.state == JobState.QUEUED
+    await asyncio.sleep(0.1)
+    cancelled._task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(cancelled._task, 5)
+    assert cancelled.state == JobState.DONE
+    assert queued.state == JobState.RUNNING
+    await asyncio.wait_for(queued._task, 5)
+    assert queued.returncode == 0
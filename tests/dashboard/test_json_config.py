@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+from pathlib import Path
+import sys
+import types
+from unittest.mock import patch
+
+import pytest
+
+from esphome.dashboard import json_config
+from esphome.dashboard.json_config import JsonConfigRenderer, render_config_json
+
+CONFIG = """\
+substitutions:
+  devicename: kitchen
+esphome:
+  name: ${devicename}
+host:
+api:
+  password: !secret api_password
+sensor: !include sensors.yaml
+"""
+
+SENSORS = """\
+- platform: template
+  name: Temperature
+  lambda: return 1.0;
+  update_interval: 60s
+"""
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    (tmp_path / "secrets.yaml").write_text("api_password: hunter2\n")
+    (tmp_path / "sensors.yaml").write_text(SENSORS)
+    path = tmp_path / "kitchen.yaml"
+    path.write_text(CONFIG)
+    return path
+
+
+def test_render_config_json(config_path: Path) -> None:
+    key, data, external = render_config_json(str(config_path))
+
+    config = json.loads(data)
+    assert config["esphome"]["name"] == "kitchen"
+    # Secrets are shown
+    assert config["api"]["password"] == "hunter2"
+    sensor = config["sensor"][0]
+    assert sensor["lambda"] == "!lambda return 1.0;"
+    assert sensor["update_interval"] == "60s"
+    # Automatically generated ids are not shown
+    assert "id" not in sensor
+    assert not external
+    assert [path for path, _, _ in key] == [
+        str(config_path),
+        str(config_path.parent / "secrets.yaml"),
+        str(config_path.parent / "sensors.yaml"),
+    ]
+
+
+def test_render_config_json__invalid(config_path: Path) -> None:
+    config_path.write_text(CONFIG.replace("host:", "host:\n  unknown_option: 1"))
+
+    key, data, external = render_config_json(str(config_path))
+
+    assert data is None
+    assert not external
+    assert key[0][0] == str(config_path)
+
+
+@pytest.mark.asyncio
+async def test_renderer_cache(config_path: Path) -> None:
+    renderer = JsonConfigRenderer()
+    renderer._executor = ThreadPoolExecutor(1)
+    sensors = config_path.parent / "sensors.yaml"
+
+    with patch.object(
+        json_config, "render_config_json", wraps=render_config_json
+    ) as render:
+        first = await renderer.async_render(str(config_path))
+        assert await renderer.async_render(str(config_path)) == first
+        assert render.call_count == 1
+
+        # Changing an included file renders the config again
+        sensors.write_text(SENSORS.replace("Temperature", "Humidity"))
+        stat = sensors.stat()
+        os.utime(sensors, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = await renderer.async_render(str(config_path))
+        assert render.call_count == 2
+        assert json.loads(second)["sensor"][0]["name"] == "Humidity"
+
+    renderer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_renderer_workers(config_path: Path) -> None:
+    renderer = JsonConfigRenderer()
+    try:
+        data = await renderer.async_render(str(config_path))
+    finally:
+        renderer.shutdown()
+
+    assert json.loads(data)["esphome"]["name"] == "kitchen"
+
+
+def test_json_default() -> None:
+    class Custom:
+        def __str__(self) -> str:
+            return "custom"
+
+    assert json.dumps({"value": Custom()}, default=json_config._json_default) == (
+        '{"value": "custom"}'
+    )
+
+
+def test_external_component_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    source = tmp_path / "custom_components" / "my_component" / "__init__.py"
+    module = types.ModuleType("esphome.components.my_component")
+    module.__file__ = str(source)
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+
+    assert json_config._external_component_files() == [str(source)]
+
+
+@pytest.mark.asyncio
+async def test_renderer_replaces_workers_after_external_components(
+    config_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    renderer = JsonConfigRenderer()
+    executors = []
+
+    def get_executor() -> ThreadPoolExecutor:
+        if renderer._executor is None:
+            renderer._executor = ThreadPoolExecutor(1)
+            executors.append(renderer._executor)
+        return renderer._executor
+
+    monkeypatch.setattr(renderer, "_get_executor", get_executor)
+    results = [
+        # A worker that imported external components does not render anymore
+        ((), '{"external": false}', False),
+        (None, None, True),
+        # Rendering a config with external components replaces the workers
+        ((), '{"external": true}', True),
+    ]
+
+    with patch.object(json_config, "render_config_json", lambda _: results.pop()):
+        assert await renderer.async_render(str(config_path)) == '{"external": true}'
+        assert renderer._executor is None
+        renderer._cache.clear()
+        assert await renderer.async_render(str(config_path)) == '{"external": false}'
+
+    assert not results
+    assert len(executors) == 3
+    for executor in executors:
+        executor.shutdown()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from esphome.dashboard import output
+from esphome.dashboard.output import OutputRelay
+
+
+class Sink:
+    def __init__(self) -> None:
+        self.messages: list[dict[str, str]] = []
+
+    def __call__(self, message: str) -> None:
+        self.messages.append(json.loads(message))
+
+    @property
+    def data(self) -> list[str]:
+        return [message["data"] for message in self.messages]
+
+
+@pytest.mark.asyncio
+async def test_lines_are_batched() -> None:
+    sink = Sink()
+    relay = OutputRelay(sink)
+
+    relay.feed(b"one\ntw")
+    relay.feed(b"o\nthree")
+    assert sink.messages == []
+    await asyncio.sleep(output.FLUSH_INTERVAL * 2)
+    assert sink.messages == [{"event": "line", "data": "one\ntwo\n"}]
+
+    relay.close()
+    assert sink.data == ["one\ntwo\n", "three"]
+    assert relay.history_message() == json.dumps(
+        {"event": "line", "data": "one\ntwo\nthree"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_progress_lines_are_collapsed() -> None:
+    sink = Sink()
+    relay = OutputRelay(sink)
+
+    relay.feed(b"Uploading 10%\rUploading 50%\r")
+    # A carriage return at the end of a chunk can be the start of a newline
+    relay.feed(b"\nDone\r\n")
+    relay.feed(b"\xe2\x9c")
+    relay.feed(b"\x93\n")
+    relay.close()
+    assert sink.data == ["Uploading 50%\r\nDone\r\n✓\n"]
+
+    relay.feed(b"Uploading 10%\rUp")
+    relay.flush()
+    relay.feed(b"loading 90%\r")
+    relay.close()
+    assert sink.data[1:] == ["Uploading 10%\r", "Uploading 90%\r"]
+    # Only the latest progress update is kept for late clients
+    assert json.loads(relay.history_message())["data"].endswith("✓\nUploading 90%\r")
+
+
+@pytest.mark.asyncio
+async def test_history_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(output, "HISTORY_LINES", 3)
+    sink = Sink()
+    relay = OutputRelay(sink)
+    assert relay.history_message() is None
+
+    relay.feed(b"".join(b"%d\n" % i for i in range(10)))
+    relay.close()
+    assert sink.data == ["".join(f"{i}\n" for i in range(10))]
+    assert json.loads(relay.history_message())["data"] == "7\n8\n9\n"
@@ -1,19 +1,24 @@
 from __future__ import annotations
 
 import asyncio
+import gzip
 import json
 import os
-from unittest.mock import Mock
+from pathlib import Path
+import sys
+from unittest.mock import Mock, patch
 
 import pytest
 import pytest_asyncio
-from tornado.httpclient import AsyncHTTPClient, HTTPResponse
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError, HTTPResponse
 from tornado.httpserver import HTTPServer
 from tornado.ioloop import IOLoop
 from tornado.testing import bind_unused_port
+from tornado.websocket import websocket_connect
 
 from esphome.dashboard import web_server
 from esphome.dashboard.core import DASHBOARD
+from esphome.dashboard.entries import EntryState
 
 from .common import get_fixture_path
 
@@ -78,3 +83,183 @@ async def test_devices_page(dashboard: DashboardTestHelper) -> None:
     first_device = configured_devices[0]
     assert first_device["name"] == "pico"
     assert first_device["configuration"] == "pico.yaml"
+
+
+@pytest.mark.asyncio
+async def test_events_websocket(dashboard: DashboardTestHelper) -> None:
+    websocket = await websocket_connect(f"ws://127.0.0.1:{dashboard.port}/events")
+    try:
+        message = json.loads(await websocket.read_message())
+        assert message["event"] == "initial_state"
+        configured = message["data"]["configured"]
+        assert [device["configuration"] for device in configured] == ["pico.yaml"]
+        assert configured[0]["state"] is None
+
+        # Invalid messages are ignored
+        await websocket.write_message("{not json")
+        await websocket.write_message("[]")
+        await websocket.write_message(json.dumps({"type": "ping"}))
+
+        entry = DASHBOARD.entries.async_all()[0]
+        DASHBOARD.entries.async_set_state(entry, EntryState.OFFLINE)
+        DASHBOARD.entries.async_set_state(entry, EntryState.ONLINE)
+
+        message = json.loads(await websocket.read_message())
+        assert message == {"event": "delta", "data": {"states": {"pico.yaml": True}}}
+    finally:
+        websocket.close()
+
+
+@pytest.mark.asyncio
+async def test_compile_websocket(
+    dashboard: DashboardTestHelper, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        web_server, "DASHBOARD_COMMAND", [sys.executable, "-c", "print('compiled')"]
+    )
+    url = f"ws://127.0.0.1:{dashboard.port}/compile"
+    first = await websocket_connect(url)
+    second = await websocket_connect(url)
+    try:
+        spawn = json.dumps({"type": "spawn", "configuration": "pico.yaml"})
+        await first.write_message(spawn)
+        await second.write_message(spawn)
+        for websocket in (first, second):
+            messages = [json.loads(await websocket.read_message()) for _ in range(2)]
+            assert messages == [
+                {"event": "line", "data": "compiled\n"},
+                {"event": "exit", "code": 0},
+            ]
+    finally:
+        first.close()
+        second.close()
+
+
+@pytest.mark.asyncio
+async def test_validate_websocket(
+    dashboard: DashboardTestHelper, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    script = "import sys; sys.stdout.write('a\\nb\\rc\\n' * 3); sys.exit(3)"
+    monkeypatch.setattr(web_server, "DASHBOARD_COMMAND", [sys.executable, "-c", script])
+    websocket = await websocket_connect(f"ws://127.0.0.1:{dashboard.port}/validate")
+    try:
+        await websocket.write_message(
+            json.dumps({"type": "spawn", "configuration": "pico.yaml"})
+        )
+        messages = []
+        while not messages or messages[-1]["event"] != "exit":
+            messages.append(json.loads(await websocket.read_message()))
+    finally:
+        websocket.close()
+    # The output is batched, the exit comes after all of it
+    assert messages[-1] == {"event": "exit", "code": 3}
+    output = "".join(message["data"] for message in messages[:-1])
+    assert output == "a\nc\n" * 3
+
+
+@pytest.fixture
+def firmware(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    firmware = tmp_path / "firmware.bin"
+    firmware.write_bytes(os.urandom(200_000))
+    storage_json = Mock(firmware_bin_path=str(firmware))
+    storage_json.name = "pico"
+    monkeypatch.setattr(web_server.StorageJSON, "load", lambda path: storage_json)
+    return firmware
+
+
+@pytest.mark.asyncio
+async def test_download_binary(dashboard: DashboardTestHelper, firmware: Path) -> None:
+    response = await dashboard.fetch(
+        "/download.bin?configuration=pico.yaml&file=firmware.bin"
+    )
+    assert response.body == firmware.read_bytes()
+    assert response.headers["Content-Disposition"] == (
+        'attachment; filename="pico-firmware.bin"'
+    )
+    etag = response.headers["Etag"]
+
+    with pytest.raises(HTTPClientError) as exc_info:
+        await dashboard.fetch(
+            "/download.bin?configuration=pico.yaml&file=firmware.bin",
+            headers={"If-None-Match": etag},
+        )
+    assert exc_info.value.code == 304
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("header", "start", "end"),
+    [
+        ("bytes=10-19", 10, 20),
+        ("bytes=199990-", 199990, 200_000),
+        ("bytes=-5", 199995, 200_000),
+        ("bytes=0-999999", 0, 200_000),
+    ],
+)
+async def test_download_binary_range(
+    dashboard: DashboardTestHelper, firmware: Path, header: str, start: int, end: int
+) -> None:
+    response = await dashboard.fetch(
+        "/download.bin?configuration=pico.yaml&file=firmware.bin",
+        headers={"Range": header},
+    )
+    assert response.code == 206
+    assert response.headers["Content-Range"] == f"bytes {start}-{end - 1}/200000"
+    assert response.body == firmware.read_bytes()[start:end]
+
+
+@pytest.mark.asyncio
+async def test_download_binary_range_not_satisfiable(
+    dashboard: DashboardTestHelper, firmware: Path
+) -> None:
+    with pytest.raises(HTTPClientError) as exc_info:
+        await dashboard.fetch(
+            "/download.bin?configuration=pico.yaml&file=firmware.bin",
+            headers={"Range": "bytes=200000-"},
+        )
+    assert exc_info.value.code == 416
+
+
+@pytest.mark.asyncio
+async def test_download_binary_compressed(
+    dashboard: DashboardTestHelper, firmware: Path
+) -> None:
+    url = "/download.bin?configuration=pico.yaml&file=firmware.bin&compressed=1"
+    response = await dashboard.fetch(url)
+    assert gzip.decompress(response.body) == firmware.read_bytes()
+    assert response.headers["Content-Disposition"] == (
+        'attachment; filename="pico-firmware.bin.gz"'
+    )
+
+    # The compressed file is cached next to the firmware
+    with patch("esphome.dashboard.util.file.gzip.GzipFile") as gzip_file:
+        assert (await dashboard.fetch(url)).body == response.body
+    gzip_file.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_download_binary_extra_image(
+    dashboard: DashboardTestHelper,
+    firmware: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    bootloader = tmp_path / "packages" / "bootloader.bin"
+    bootloader.parent.mkdir()
+    bootloader.write_bytes(b"bootloader")
+    idedata = Mock(extra_flash_images=[Mock(path=str(bootloader))])
+    load_cached_idedata = Mock(return_value=idedata)
+    monkeypatch.setattr(
+        web_server.platformio_api, "load_cached_idedata", load_cached_idedata
+    )
+
+    response = await dashboard.fetch(
+        "/download.bin?configuration=pico.yaml&file=bootloader.bin"
+    )
+    assert response.body == b"bootloader"
+    load_cached_idedata.assert_called_once_with("pico")
+
+    load_cached_idedata.return_value = None
+    with pytest.raises(HTTPClientError) as exc_info:
+        await dashboard.fetch("/download.bin?configuration=pico.yaml&file=other.bin")
+    assert exc_info.value.code == 404
@@ -1,3 +1,4 @@
+import gzip
 import os
 from pathlib import Path
 from unittest.mock import patch
@@ -5,7 +6,7 @@ from unittest.mock import patch
 import py
 import pytest
 
-from esphome.dashboard.util.file import write_file, write_utf8_file
+from esphome.dashboard.util.file import gzip_file_cached, write_file, write_utf8_file
 
 
 def test_write_utf8_file(tmp_path: Path) -> None:
@@ -51,3 +52,25 @@ def test_write_utf8_file_fails_at_rename_and_remove(
         write_utf8_file(test_file, '{"some":"data"}', False)
 
     assert "File replacement cleanup failed" in caplog.text
+
+
+def test_gzip_file_cached(tmp_path: Path) -> None:
+    path = tmp_path / "firmware.bin"
+    path.write_bytes(b"firmware" * 1000)
+
+    gz_path = gzip_file_cached(str(path))
+    assert gz_path == f"{path}.gz"
+    assert gzip.decompress(Path(gz_path).read_bytes()) == path.read_bytes()
+
+    # Not compressed again while the file is unchanged
+    with patch("esphome.dashboard.util.file.gzip.GzipFile") as gzip_file:
+        assert gzip_file_cached(str(path)) == gz_path
+    gzip_file.assert_not_called()
+
+    # A changed file with the same modification time is detected by its size
+    stat = path.stat()
+    path.write_bytes(b"new firmware")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert gzip.decompress(Path(gzip_file_cached(str(path))).read_bytes()) == (
+        b"new firmware"
+    )
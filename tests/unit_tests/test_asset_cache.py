@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from esphome import asset_cache
+from esphome.core import CORE
+
+
+@pytest.fixture(autouse=True)
+def config_path(tmp_path):
+    CORE.config_path = str(tmp_path / "test.yaml")
+    yield
+    CORE.reset()
+
+
+def test_compute_key__depends_on_source_and_options():
+    key = asset_cache.compute_key("image", b"foo", {"type": "RGB565"})
+
+    assert key == asset_cache.compute_key("image", b"foo", {"type": "RGB565"})
+    assert key != asset_cache.compute_key("image", b"bar", {"type": "RGB565"})
+    assert key != asset_cache.compute_key("image", b"foo", {"type": "RGB24"})
+    assert key != asset_cache.compute_key("font", b"foo", {"type": "RGB565"})
+
+
+def test_compute_key__depends_on_version(monkeypatch):
+    key = asset_cache.compute_key("image", b"foo", {})
+
+    monkeypatch.setattr(asset_cache, "__version__", "1900.1.0")
+
+    assert key != asset_cache.compute_key("image", b"foo", {})
+
+
+def test_store_load():
+    key = asset_cache.compute_key("image", b"foo", {})
+    assert asset_cache.load(key) is None
+
+    asset_cache.store(key, b"\x00\n\xff", {"width": 1, "height": 3})
+
+    assert asset_cache.load(key) == (b"\x00\n\xff", {"width": 1, "height": 3})
+
+
+def test_load__corrupt_entry():
+    key = asset_cache.compute_key("image", b"foo", {})
+    path = asset_cache._cache_path(key)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not json\n")
+
+    assert asset_cache.load(key) is None
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setenv(asset_cache.ENV_ASSET_CACHE_SIZE, "0")
+    key = asset_cache.compute_key("image", b"foo", {})
+
+    asset_cache.store(key, b"data", {})
+
+    assert asset_cache.load(key) is None
+    assert not asset_cache._cache_path(key).exists()
+
+
+def test_evict__least_recently_used():
+    keys = [asset_cache.compute_key("image", bytes([i]), {}) for i in range(3)]
+    for i, key in enumerate(keys):
+        asset_cache.store(key, bytes(100), {})
+        os.utime(asset_cache._cache_path(key), (i, i))
+    # Loading marks the oldest entry as recently used
+    asset_cache.load(keys[0])
+
+    asset_cache.evict(250)
+
+    assert asset_cache.load(keys[0]) is not None
+    assert asset_cache.load(keys[1]) is None
+    assert asset_cache.load(keys[2]) is not None
@@ -0,0 +1,107 @@
+import pytest
+
+from esphome import config
+from esphome.core import CORE, ID
+from esphome.cpp_generator import MockObjClass
+
+
+@pytest.fixture(autouse=True)
+def reset_core():
+    CORE.reset()
+    yield
+    CORE.reset()
+
+
+Base = MockObjClass("foo::Base", parents=[])
+Derived = MockObjClass("foo::Derived", parents=[Base])
+Other = MockObjClass("foo::Other", parents=[])
+
+
+def _id_pass(result: config.Config) -> None:
+    config.IDPassValidationStep().run(result)
+
+
+def test_get_path_for_id():
+    result = config.Config()
+    result["foo"] = [{"id": ID("first", True, Base)}, {"id": ID("second", True, Base)}]
+    _id_pass(result)
+
+    assert result.get_path_for_id(ID("second")) == ["foo", 1, "id"]
+    with pytest.raises(KeyError):
+        result.get_path_for_id(ID("third"))
+
+
+def test_id_pass__duplicate_id():
+    result = config.Config()
+    result["foo"] = [{"id": ID("first", True, Base)}, {"id": ID("first", True, Base)}]
+    _id_pass(result)
+
+    assert len(result.errors) == 1
+    assert "ID first redefined! Check foo->0->id" in str(result.errors[0])
+
+
+def test_id_pass__automatic_names_match_resolve():
+    result = config.Config()
+    result["foo"] = [
+        {"id": ID("foo_derived", True, Derived)},
+        {"id": ID(None, True, Derived)},
+        {"id": ID(None, True, Derived)},
+        {"id": ID(None, True, Base)},
+        {"id": ID(None, True, Derived)},
+    ]
+    _id_pass(result)
+
+    assert [v[0].id for v in result.declare_ids] == [
+        "foo_derived",
+        "foo_derived_2",
+        "foo_derived_3",
+        "foo_base",
+        "foo_derived_4",
+    ]
+    assert result.get_path_for_id(ID("foo_derived_3")) == ["foo", 2, "id"]
+
+
+def test_id_pass__automatic_reference_by_type():
+    result = config.Config()
+    result["foo"] = [{"id": ID("base", True, Base)}, {"id": ID(None, True, Other)}]
+    result["bar"] = {"foo_id": ID(None, False, Base)}
+    _id_pass(result)
+
+    assert not result.errors
+    assert result["bar"]["foo_id"].id == "base"
+
+
+def test_id_pass__automatic_reference_inherited():
+    result = config.Config()
+    result["foo"] = [{"id": ID("derived", True, Derived)}]
+    result["bar"] = {"foo_id": ID(None, False, Base)}
+    _id_pass(result)
+
+    assert not result.errors
+    assert result["bar"]["foo_id"].id == "derived"
+    assert [v.id for v in result.get_declared_ids_for_type(Base)] == ["derived"]
+    assert result.get_declared_ids_for_type(Other) == []
+
+
+def test_id_pass__automatic_reference_too_many_candidates():
+    result = config.Config()
+    result["foo"] = [
+        {"id": ID("first", True, Base)},
+        {"id": ID("second", True, Derived)},
+    ]
+    result["bar"] = {"foo_id": ID(None, False, Base)}
+    _id_pass(result)
+
+    assert len(result.errors) == 1
+    assert "Too many candidates found for 'foo_id'" in str(result.errors[0])
+
+
+def test_id_pass__missing_reference():
+    result = config.Config()
+    result["foo"] = [{"id": ID("my_sensor", True, Base)}]
+    result["bar"] = {"foo_id": ID("my_sensr", False, Base)}
+    _id_pass(result)
+
+    assert len(result.errors) == 1
+    assert "Couldn't find ID 'my_sensr'" in str(result.errors[0])
+    assert 'These IDs look similar: "my_sensor".' in str(result.errors[0])
@@ -0,0 +1,158 @@
+import pytest
+
+from esphome import core, coroutine
+from esphome.coroutine import FakeEventLoop, coroutine_with_priority
+
+
+@pytest.fixture
+def target():
+    target = core.EsphomeCore()
+    target.build_path = "foo/build"
+    target.config_path = "foo/config"
+    return target
+
+
+def test_flush_tasks__priority_order(target):
+    order = []
+
+    @coroutine_with_priority(1.0)
+    async def low():
+        order.append("low")
+
+    @coroutine_with_priority(10.0)
+    async def high():
+        order.append("high")
+
+    target.add_job(low)
+    target.add_job(high)
+    target.flush_tasks()
+
+    assert order == ["high", "low"]
+
+
+def test_flush_tasks__waits_for_variable(target):
+    order = []
+    id_ = core.ID("foo", is_declaration=True)
+
+    async def consumer():
+        obj = await target.get_variable(core.ID("foo"))
+        order.append(("consumer", obj))
+
+    async def producer():
+        order.append("producer")
+        target.register_variable(id_, "bar")
+
+    target.add_job(consumer)
+    target.add_job(producer)
+    target.flush_tasks()
+
+    assert order == ["producer", ("consumer", "bar")]
+
+
+def test_flush_tasks__blocked_task_is_not_polled(target):
+    calls = []
+    id_ = core.ID("foo", is_declaration=True)
+
+    def waiting():
+        while True:
+            calls.append(None)
+            try:
+                return target.variables[id_]
+            except KeyError:
+                yield from target._get_variable_generator(id_)
+
+    async def consumer():
+        await core._FakeAwaitable(waiting())
+
+    async def busy():
+        for _ in range(100):
+            await core._FakeAwaitable(iter([None]))
+        target.register_variable(id_, "bar")
+
+    target.add_job(consumer)
+    target.add_job(busy)
+    target.flush_tasks()
+
+    assert len(calls) == 2
+
+
+def test_flush_tasks__circular_dependency(target):
+    async def first():
+        await target.get_variable(core.ID("second_id"))
+        target.register_variable(core.ID("first_id"), "first")
+
+    async def second():
+        await target.get_variable(core.ID("first_id"))
+        target.register_variable(core.ID("second_id"), "second")
+
+    target.add_job(first)
+    target.add_job(second)
+
+    with pytest.raises(core.EsphomeError) as exc:
+        target.flush_tasks()
+
+    message = str(exc.value)
+    assert message.startswith("Circular dependency detected!")
+    assert "first in" in message and "is waiting for second_id" in message
+    assert "second in" in message and "is waiting for first_id" in message
+
+
+def test_notify__unknown_key():
+    loop = FakeEventLoop()
+
+    loop.notify("foo")
+    loop.flush_tasks()
+
+
+def test_flush_tasks__polling_task_never_satisfied(target, monkeypatch):
+    monkeypatch.setattr(coroutine, "MAX_IDLE_ITERATIONS", 1000)
+    polls = []
+
+    def polling():
+        while "ready" not in polls:
+            polls.append(None)
+            yield
+
+    async def waiting():
+        await core._FakeAwaitable(polling())
+
+    target.add_job(waiting)
+
+    with pytest.raises(core.EsphomeError) as exc:
+        target.flush_tasks()
+
+    message = str(exc.value)
+    assert message.startswith("Circular dependency detected!")
+    assert "waiting in" in message and "is polling" in message
+    assert len(polls) == 1001
+
+
+def test_flush_tasks__polling_task_satisfied(target, monkeypatch):
+    monkeypatch.setattr(coroutine, "MAX_IDLE_ITERATIONS", 10)
+    state = []
+
+    def polling():
+        while not state:
+            yield
+
+    async def waiting():
+        await core._FakeAwaitable(polling())
+        state.append("done")
+
+    async def slow():
+        # Every finished step is progress, even if it takes many iterations
+        for i in range(50):
+            await target.get_variable(core.ID(f"step_{i}"))
+
+    async def steps():
+        for i in range(50):
+            target.register_variable(core.ID(f"step_{i}", is_declaration=True), i)
+            await core._FakeAwaitable(iter([None]))
+        state.append("ready")
+
+    target.add_job(waiting)
+    target.add_job(slow)
+    target.add_job(steps)
+    target.flush_tasks()
+
+    assert state == ["ready", "done"]
@@ -6,6 +6,7 @@ import pytest
 
 from esphome import cpp_generator as cg
 from esphome import cpp_types as ct
+from esphome.core import HexInt
 
 
 class TestExpressions:
@@ -131,6 +132,38 @@ class TestArrayInitializer:
         assert actual == "{\n  1,\n  2,\n  3,\n  4,\n}"
 
 
+class TestByteArrayInitializer:
+    def test_str__empty(self):
+        target = cg.ByteArrayInitializer(b"", multiline=True)
+
+        actual = str(target)
+
+        assert actual == "{}"
+
+    def test_str__not_multiline(self):
+        target = cg.ByteArrayInitializer(b"\x00\x01\xab\xff")
+
+        actual = str(target)
+
+        assert actual == "{0x00, 0x01, 0xAB, 0xFF}"
+
+    def test_str__multiline(self):
+        target = cg.ByteArrayInitializer(
+            bytes(range(5)), multiline=True, bytes_per_line=2
+        )
+
+        actual = str(target)
+
+        assert actual == "{\n  0x00, 0x01,\n  0x02, 0x03,\n  0x04,\n}"
+
+    def test_str__matches_array_initializer(self):
+        data = bytes(range(256))
+
+        actual = str(cg.ByteArrayInitializer(data))
+
+        assert actual == str(cg.ArrayInitializer(*[HexInt(x) for x in data]))
+
+
 class TestParameterListExpression:
     def test_str(self):
         target = cg.ParameterListExpression(
@@ -226,6 +259,8 @@ FAKE_ENUM_VALUE.enum_value = "foo"
         (cg.TimePeriodMinutes(minutes=42), cg.IntLiteral),
         ((1, 2, 3), cg.ArrayInitializer),
         ([1, 2, 3], cg.ArrayInitializer),
+        (b"\x01\x02", cg.ByteArrayInitializer),
+        (bytearray(b"\x01\x02"), cg.ByteArrayInitializer),
     ),
 )
 def test_safe_exp__allowed_values(obj, expected_type):
@@ -0,0 +1,150 @@
+import gzip
+import hashlib
+import io
+import os
+import socket
+import threading
+
+import pytest
+
+from esphome import espota2
+
+
+class FakeOTADevice(threading.Thread):
+    """Implements the device side of the OTA protocol on a local socket."""
+
+    def __init__(self, version, compression, password=None, ack_lag=0):
+        super().__init__(daemon=True)
+        self.version = version
+        self.compression = compression
+        self.password = password
+        # Number of further blocks to receive before acknowledging a block
+        self.ack_lag = ack_lag
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        self.data = None
+        self.md5 = None
+        self.error = None
+
+    def run(self):
+        try:
+            with self.server, self.server.accept()[0] as conn:
+                conn.settimeout(5)
+                self._handle(conn)
+        except Exception as err:  # pylint: disable=broad-except
+            self.error = err
+
+    def _recv(self, conn, amount):
+        data = b""
+        while len(data) < amount:
+            chunk = conn.recv(amount - len(data))
+            assert chunk, "connection closed"
+            data += chunk
+        return data
+
+    def _handle(self, conn):
+        assert list(self._recv(conn, 5)) == espota2.MAGIC_BYTES
+        conn.sendall(bytes([espota2.RESPONSE_OK, self.version]))
+
+        features = self._recv(conn, 1)[0]
+        if self.compression and features & espota2.FEATURE_SUPPORTS_COMPRESSION:
+            conn.sendall(bytes([espota2.RESPONSE_SUPPORTS_COMPRESSION]))
+        else:
+            conn.sendall(bytes([espota2.RESPONSE_HEADER_OK]))
+
+        if self.password is not None:
+            nonce = "0123456789abcdef0123456789abcdef"
+            conn.sendall(bytes([espota2.RESPONSE_REQUEST_AUTH]) + nonce.encode())
+            cnonce = self._recv(conn, 32)
+            result = self._recv(conn, 32).decode()
+            expected = hashlib.md5(
+                self.password.encode() + nonce.encode() + cnonce
+            ).hexdigest()
+            assert result == expected
+        conn.sendall(bytes([espota2.RESPONSE_AUTH_OK]))
+
+        size = int.from_bytes(self._recv(conn, 4), "big")
+        conn.sendall(bytes([espota2.RESPONSE_UPDATE_PREPARE_OK]))
+        self.md5 = self._recv(conn, 32).decode()
+        conn.sendall(bytes([espota2.RESPONSE_BIN_MD5_OK]))
+
+        data = bytearray()
+        acknowledged = 0
+        block = espota2.UPLOAD_BLOCK_SIZE
+        while len(data) < size:
+            data += conn.recv(min(1024, size - len(data)))
+            if self.version < espota2.OTA_VERSION_2_0:
+                continue
+            while acknowledged + block * (1 + self.ack_lag) <= len(data) or (
+                len(data) == size and acknowledged < size
+            ):
+                conn.sendall(bytes([espota2.RESPONSE_CHUNK_OK]))
+                acknowledged += block
+        self.data = bytes(data)
+
+        conn.sendall(bytes([espota2.RESPONSE_RECEIVE_OK]))
+        conn.sendall(bytes([espota2.RESPONSE_UPDATE_END_OK]))
+        assert self._recv(conn, 1)[0] == espota2.RESPONSE_OK
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(espota2.time, "sleep", lambda _: None)
+
+
+def _upload(device, firmware, password=None, window=1):
+    device.start()
+    with socket.create_connection(("127.0.0.1", device.port), timeout=5) as sock:
+        espota2.perform_ota(
+            sock, password, io.BytesIO(firmware), "firmware.bin", window=window
+        )
+    device.join(5)
+    assert device.error is None
+
+
+@pytest.mark.parametrize("version", [1, 2])
+@pytest.mark.parametrize("compression", [False, True])
+@pytest.mark.parametrize(
+    "size", [0, 1, espota2.UPLOAD_BLOCK_SIZE, 5 * espota2.UPLOAD_BLOCK_SIZE + 123]
+)
+def test_perform_ota(version, compression, size):
+    firmware = os.urandom(size // 2) + bytes(size - size // 2)
+    device = FakeOTADevice(version, compression)
+
+    _upload(device, firmware)
+
+    assert device.md5 == hashlib.md5(device.data).hexdigest()
+    if compression:
+        assert gzip.decompress(device.data) == firmware
+    else:
+        assert device.data == firmware
+
+
+def test_perform_ota__password():
+    firmware = os.urandom(20000)
+    device = FakeOTADevice(2, True, password="secret")
+
+    _upload(device, firmware, password="secret")
+
+    assert gzip.decompress(device.data) == firmware
+
+
+def test_perform_ota__password_missing():
+    device = FakeOTADevice(2, True, password="secret")
+    device.start()
+
+    with socket.create_connection(("127.0.0.1", device.port), timeout=5) as sock:
+        with pytest.raises(espota2.OTAError, match="no password given"):
+            espota2.perform_ota(sock, None, io.BytesIO(b"foo"), "firmware.bin")
+
+
+@pytest.mark.parametrize("window", [2, 4])
+def test_perform_ota__window(window):
+    firmware = os.urandom(10 * espota2.UPLOAD_BLOCK_SIZE + 1)
+    # The device only acknowledges a block once the rest of the window arrived,
+    # waiting for every acknowledgement would time out
+    device = FakeOTADevice(2, False, ack_lag=window - 1)
+
+    _upload(device, firmware, window=window)
+
+    assert device.data == firmware
@@ -1,3 +1,5 @@
+import threading
+
 import pytest
 
 from hypothesis import given
@@ -178,6 +180,57 @@ class Test_write_file_if_changed:
         assert dst.read_text() == text
 
 
+class Test_write_chunks_if_changed:
+    def test_src_and_dst_match(self, tmp_path):
+        dst = tmp_path / "file-a.txt"
+        dst.write_text("A files are unique.\n")
+        mtime = dst.stat().st_mtime_ns
+
+        changed = helpers.write_chunks_if_changed(dst, ["A files ", "are unique.\n"])
+
+        assert not changed
+        assert dst.stat().st_mtime_ns == mtime
+        assert list(tmp_path.iterdir()) == [dst]
+
+    def test_src_and_dst_do_not_match(self, tmp_path):
+        dst = tmp_path / "file-a.txt"
+        dst.write_text("B files are unique.\n")
+
+        changed = helpers.write_chunks_if_changed(dst, ["A files ", "are unique.\n"])
+
+        assert changed
+        assert dst.read_text() == "A files are unique.\n"
+        assert list(tmp_path.iterdir()) == [dst]
+
+    def test_dst_does_not_exist(self, tmp_path):
+        dst = tmp_path / "foo" / "file-a.txt"
+
+        changed = helpers.write_chunks_if_changed(
+            dst, iter(["A files ", "are ünique.\n"])
+        )
+
+        assert changed
+        assert dst.read_text(encoding="utf-8") == "A files are ünique.\n"
+
+
+def test_file_lock(tmp_path):
+    path = tmp_path / "foo" / "file.lock"
+    events = []
+
+    def locker():
+        with helpers.file_lock(path):
+            events.append("thread")
+
+    with helpers.file_lock(path):
+        thread = threading.Thread(target=locker)
+        thread.start()
+        thread.join(0.2)
+        events.append("main")
+    thread.join()
+
+    assert events == ["main", "thread"]
+
+
 class Test_copy_file_if_changed:
     def test_src_and_dst_match(self, tmp_path, fixture_path):
         src = fixture_path / "helpers" / "file-a.txt"
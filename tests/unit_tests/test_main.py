@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from argparse import Namespace
+import json
+import os
+from pathlib import Path
+
+import click
+import pytest
+
+from esphome import __main__ as main
+from esphome.const import ENV_PLATFORMIO_LOCK
+from esphome.core import CORE
+from esphome.resolver import Resolver
+
+
+def _write_device(config_dir: Path, name: str, address: str) -> None:
+    (config_dir / f"{name}.yaml").write_text("")
+    storage_dir = config_dir / ".esphome" / "storage"
+    storage_dir.mkdir(parents=True, exist_ok=True)
+    (storage_dir / f"{name}.yaml.json").write_text(
+        json.dumps({"storage_version": 1, "name": name, "address": address})
+    )
+
+
+@pytest.fixture
+def config_dirs(tmp_path: Path) -> list[Path]:
+    dirs = [tmp_path / "one", tmp_path / "two"]
+    for config_dir in dirs:
+        config_dir.mkdir()
+    _write_device(dirs[0], "a", "a.local")
+    _write_device(dirs[0], "b", "192.168.1.2")
+    _write_device(dirs[1], "a", "other.local")
+    return dirs
+
+
+@pytest.fixture
+def resolved(monkeypatch: pytest.MonkeyPatch) -> dict[str, list[str]]:
+    resolved = {}
+
+    def resolve_many(resolver: Resolver, hosts: list[str]) -> None:
+        resolved.setdefault(resolver.path, []).extend(hosts)
+
+    monkeypatch.setattr(Resolver, "resolve_many", resolve_many)
+    monkeypatch.setattr(Resolver, "save", lambda resolver: None)
+    return resolved
+
+
+def test_update_all_resolves_per_config_dir(
+    config_dirs: list[Path],
+    resolved: dict[str, list[str]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    commands = []
+
+    def run_external_process(*cmd: str) -> int:
+        commands.append(cmd)
+        return 0
+
+    monkeypatch.setattr(main, "run_external_process", run_external_process)
+    monkeypatch.setattr(CORE, "config_path", None)
+    args = Namespace(
+        configuration=[str(d) for d in config_dirs],
+        jobs=1,
+        upload_jobs=1,
+        log_dir=None,
+    )
+
+    assert main.command_update_all(args) == 0
+    assert CORE.config_path is None
+    assert [cmd[2:4] for cmd in commands] == [
+        ("run", str(config_dirs[0] / "a.yaml")),
+        ("run", str(config_dirs[0] / "b.yaml")),
+        ("run", str(config_dirs[1] / "a.yaml")),
+    ]
+    # Each device is resolved with the cache of its own data directory
+    assert {path: set(hosts) for path, hosts in resolved.items()} == {
+        str(config_dirs[0] / ".esphome" / "addresses.json"): {"a.local"},
+        str(config_dirs[1] / ".esphome" / "addresses.json"): {"other.local"},
+    }
+
+
+def test_update_all_parallel(
+    config_dirs: list[Path],
+    resolved: dict[str, list[str]],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    one_a, one_b, two_a = (
+        str(config_dirs[0] / "a.yaml"),
+        str(config_dirs[0] / "b.yaml"),
+        str(config_dirs[1] / "a.yaml"),
+    )
+    steps = []
+    logs = {}
+    locks = set()
+
+    def run_logged_process(log_file, *cmd: str) -> int:
+        step, f = cmd[2:4]
+        steps.append((step, f))
+        logs.setdefault(f, set()).add(log_file.name)
+        locks.add(os.environ.get(ENV_PLATFORMIO_LOCK))
+        if step == "upload" and f == two_a:
+            raise OSError("upload failed")
+        return 1 if step == "compile" and f == one_b else 0
+
+    monkeypatch.setattr(main, "_run_logged_process", run_logged_process)
+    monkeypatch.delenv(ENV_PLATFORMIO_LOCK, raising=False)
+    log_dir = tmp_path / "logs"
+    args = Namespace(
+        configuration=[str(d) for d in config_dirs],
+        jobs=2,
+        upload_jobs=1,
+        log_dir=str(log_dir),
+    )
+
+    # b failed to compile, the upload of the second a raised
+    assert main.command_update_all(args) == 2
+    assert sorted(steps) == [
+        ("compile", one_a),
+        ("compile", one_b),
+        ("compile", two_a),
+        ("upload", one_a),
+        ("upload", two_a),
+    ]
+    for f in (one_a, two_a):
+        assert steps.index(("compile", f)) < steps.index(("upload", f))
+    # Every device has its own log, compile and upload share it
+    assert logs == {
+        one_a: {str(log_dir / "a.log")},
+        one_b: {str(log_dir / "b.log")},
+        two_a: {str(log_dir / "a-2.log")},
+    }
+    assert locks == {str(log_dir / "platformio.lock")}
+    summary = click.unstyle(capsys.readouterr().out).split("SUMMARY")[-1]
+    assert f"{one_a}: SUCCESS" in summary
+    assert f"{one_b}: FAILED" in summary
+    assert f"{two_a}: FAILED" in summary
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from esphome import resolver
+from esphome.core import EsphomeError
+from esphome.resolver import Resolver
+
+
+class FakeZeroconf:
+    def __init__(self, addresses: dict[str, str]) -> None:
+        self.addresses = addresses
+        self.queries: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def async_resolve_host(self, host: str, timeout: float) -> str | None:
+        self.queries.append(host)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.addresses.get(host)
+
+
+@pytest.fixture
+def dns(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    queries = []
+
+    async def async_resolve(name: str) -> list[str]:
+        queries.append(name)
+        if name == "example.com":
+            return ["93.184.216.34"]
+        raise resolver.NameLookupError(name)
+
+    monkeypatch.setattr(resolver, "async_resolve", async_resolve)
+    return queries
+
+
+@pytest.mark.asyncio
+async def test_resolve_many(dns: list[str]) -> None:
+    cache = Resolver()
+    cache.aiozc = FakeZeroconf({"a.local": "10.0.0.1", "b.local": "10.0.0.2"})
+    hosts = ["a.local", "b.local", "offline.local", "example.com", "10.0.0.9"]
+
+    results, again = await asyncio.gather(
+        cache.async_resolve_many(hosts), cache.async_resolve_many(hosts)
+    )
+
+    assert results == again
+    assert results["a.local"] == ["10.0.0.1"]
+    assert results["b.local"] == ["10.0.0.2"]
+    assert results["example.com"] == ["93.184.216.34"]
+    assert results["10.0.0.9"] == ["10.0.0.9"]
+    assert isinstance(results["offline.local"], EsphomeError)
+    assert "Did not respond" in str(results["offline.local"])
+    # The names are resolved concurrently and only once
+    assert sorted(cache.aiozc.queries) == ["a.local", "b.local", "offline.local"]
+    assert cache.aiozc.max_in_flight == 3
+    # Only the .local name that did not answer falls back to DNS
+    assert sorted(dns) == ["example.com", "offline.local"]
+
+    # The results, including the error, are cached
+    await cache.async_resolve_many(hosts)
+    assert len(cache.aiozc.queries) == 3
+    await cache.async_resolve("a.local", refresh=True)
+    assert len(cache.aiozc.queries) == 4
+
+
+@pytest.mark.asyncio
+async def test_negative_results_expire_first(
+    dns: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    now = 1000.0
+    monkeypatch.setattr(resolver.time, "time", lambda: now)
+    cache = Resolver()
+    cache.aiozc = FakeZeroconf({"a.local": "10.0.0.1"})
+    await cache.async_resolve_many(["a.local", "offline.local"])
+
+    now += resolver.NEGATIVE_TTL + 1
+    assert cache.get_cached("a.local") == ["10.0.0.1"]
+    assert cache.get_cached("offline.local") is None
+    now += resolver.DEFAULT_TTL
+    assert cache.get_cached("a.local") is None
+
+
+@pytest.mark.asyncio
+async def test_resolve_without_mdns(dns: list[str]) -> None:
+    cache = Resolver()
+    cache.mdns = False
+    cache.aiozc = FakeZeroconf({"a.local": "10.0.0.1"})
+
+    result = await cache.async_resolve("a.local")
+
+    assert isinstance(result, EsphomeError)
+    assert cache.aiozc.queries == []
+    assert dns == ["a.local"]
+
+
+def test_persisted_cache(tmp_path: Path, dns: list[str]) -> None:
+    path = tmp_path / resolver.CACHE_FILE
+    cache = Resolver(str(path))
+    cache.aiozc = FakeZeroconf({"a.local": "10.0.0.1"})
+
+    assert cache.resolve("example.com") == "93.184.216.34"
+    with pytest.raises(EsphomeError, match="Did not respond"):
+        cache.resolve("offline.local")
+    cache.resolve_many(["a.local"])
+    cache.save()
+    # Errors are not persisted
+    assert set(json.loads(path.read_text())["hosts"]) == {"example.com", "a.local"}
+
+    # Another process starts with a warm cache
+    warm = Resolver(str(path))
+    warm.load()
+    assert warm.resolve("a.local") == "10.0.0.1"
+    assert warm.get_cached("offline.local") is None
+    assert dns == ["example.com", "offline.local"]
+    # Nothing is written when nothing changed
+    path.unlink()
+    warm.save()
+    assert not path.exists()
@@ -0,0 +1,124 @@
+import copy
+import logging
+
+import pytest
+
+from esphome.components import substitutions
+from esphome.core import Lambda
+from esphome.util import OrderedDict
+
+
+def _config():
+    return OrderedDict(
+        [
+            ("esphome", OrderedDict(name="${name}", comment="$later")),
+            (
+                "sensor",
+                [
+                    OrderedDict(
+                        [
+                            ("platform", "template"),
+                            ("name", "${name} $unit"),
+                            ("lambda", Lambda("return ${value};")),
+                        ]
+                    )
+                ],
+            ),
+            ("${component}", OrderedDict(id="$name")),
+            (
+                "substitutions",
+                OrderedDict(
+                    [
+                        ("later", "${name}_later"),
+                        ("name", "${base}"),
+                        ("base", "device"),
+                        ("unit", "${unit}!"),
+                        ("value", "1"),
+                        ("component", "logger"),
+                    ]
+                ),
+            ),
+        ]
+    )
+
+
+def _do_passes(config, passes, command_line_substitutions=None):
+    """Substitute like the implementation with one traversal per pass."""
+
+    def expand(value, table):
+        # The substituted values are not searched again
+        return substitutions.cv.VARIABLE_PROG.sub(
+            lambda m: table.get(m.group(1).strip("{}"), m.group(0)), value
+        )
+
+    def walk(item, table):
+        if isinstance(item, list):
+            for i, it in enumerate(item):
+                item[i] = walk(it, table)
+        elif isinstance(item, dict):
+            for key in list(item):
+                item[key] = walk(item[key], table)
+                if (new := expand(key, table)) != key:
+                    item[new] = item.pop(key)
+        elif isinstance(item, Lambda):
+            item.value = expand(item.value, table)
+        elif isinstance(item, str):
+            return expand(item, table)
+        return item
+
+    for _ in range(passes):
+        table = {**config["substitutions"], **(command_line_substitutions or {})}
+        for key, value in table.items():
+            table[key] = expand(value, table)
+        rest = OrderedDict((k, v) for k, v in config.items() if k != "substitutions")
+        config.clear()
+        config["substitutions"] = table
+        config.update(walk(rest, table))
+    return config
+
+
+@pytest.mark.parametrize("passes", [1, 2])
+def test_substitution_passes(passes):
+    config = _config()
+    substitutions.do_substitution_pass(config, None, passes=passes)
+
+    expected = _do_passes(_config(), passes)
+    assert list(config) == ["substitutions", "esphome", "sensor", "logger"]
+    assert config["sensor"][0].pop("lambda").value == "return 1;"
+    assert expected["sensor"][0].pop("lambda").value == "return 1;"
+    assert config == expected
+    assert config["esphome"]["comment"] == (
+        "device_later" if passes == 2 else "${base}_later"
+    )
+    # A substitution using itself is not resolved
+    assert config["sensor"][0]["name"].startswith("device ${unit}!!")
+
+
+def test_command_line_substitutions():
+    config = _config()
+    substitutions.do_substitution_pass(config, {"name": "cli", "unit": "V"}, passes=2)
+
+    assert config["substitutions"]["name"] == "cli"
+    assert config["esphome"]["comment"] == "cli_later"
+    assert config["sensor"][0]["name"] == "cli V"
+    assert config["logger"] == {"id": "cli"}
+
+
+def test_missing_substitution_warning(caplog):
+    config = OrderedDict(
+        [
+            ("substitutions", OrderedDict(name="device")),
+            ("wifi", OrderedDict(ssid="$missing", password="pa$$word")),
+        ]
+    )
+    unchanged = copy.deepcopy(config)
+    with caplog.at_level(logging.WARNING):
+        substitutions.do_substitution_pass(config, None)
+
+    assert config == unchanged
+    assert len(caplog.records) == 1
+    assert "see wifi->ssid" in caplog.records[0].getMessage()
+
+    caplog.clear()
+    substitutions.do_substitution_pass(config, None, ignore_missing=True)
+    assert not caplog.records
@@ -0,0 +1,32 @@
+import argparse
+
+from esphome import vscode
+
+CONFIG = """\
+esphome:
+  name: test
+host:
+sensor: !include sensors.yaml
+"""
+
+
+def test_validation_session(tmp_path):
+    (tmp_path / "test.yaml").write_text(CONFIG)
+    sensors = tmp_path / "sensors.yaml"
+    sensors.write_text("- platform: template\n  name: Temperature\n")
+    session = vscode.ValidationSession(
+        argparse.Namespace(ace=True, configuration=str(tmp_path), substitution=None)
+    )
+
+    result = session.validate("test.yaml")
+    assert result.yaml_errors == []
+    assert result.validation_errors == []
+
+    # The changed file and the file including it are parsed again
+    sensors.write_text("- platform: template\n  name: Temperature\n  invalid: 1\n")
+    result = session.validate("test.yaml")
+    assert session.parse_cache.misses == 4
+    assert result.yaml_errors == []
+    [error] = result.validation_errors
+    assert error["range"]["document"] == str(sensors)
+    assert "invalid" in error["message"]
@@ -1,6 +1,13 @@
+import logging
+import os
+import pickle
+from unittest.mock import patch
+
+import yaml
+
 from esphome import yaml_util
 from esphome.components import substitutions
-from esphome.core import EsphomeError
+from esphome.core import ID, EsphomeError, Lambda
 
 
 def test_include_with_vars(fixture_path):
@@ -42,3 +49,330 @@ def test_loading_a_missing_file(fixture_path):
         yaml_util.load_yaml(yaml_file)
     except EsphomeError as err:
         assert "missing.yaml" in str(err)
+
+
+def test_parse_cache(tmp_path):
+    """Unchanged files are not parsed again and the cached data is not modified."""
+    (tmp_path / "secrets.yaml").write_text("password: hunter2\n")
+    (tmp_path / "sensors.yaml").write_text("- platform: template\n  name: a\n")
+    (tmp_path / "main.yaml").write_text(
+        "api:\n  password: !secret password\nsensor: !include sensors.yaml\n"
+    )
+    main = str(tmp_path / "main.yaml")
+    cache = yaml_util.YAMLParseCache()
+
+    with yaml_util.use_parse_cache(cache):
+        first = yaml_util.load_yaml(main)
+    assert first == yaml_util.load_yaml(main)
+    assert cache.misses == 3
+    first["sensor"][0]["name"] = "modified"
+
+    with yaml_util.use_parse_cache(cache):
+        second = yaml_util.load_yaml(main)
+    assert cache.misses == 3
+    assert second["sensor"][0]["name"] == "a"
+    assert second["sensor"].esp_range.start_mark.document == main
+    assert yaml_util.is_secret("hunter2") == "password"
+
+    # Changing an included file parses it and the files including it again
+    (tmp_path / "sensors.yaml").write_text("- platform: template\n  name: b\n")
+    with yaml_util.use_parse_cache(cache):
+        third = yaml_util.load_yaml(main)
+    assert cache.misses == 5
+    assert third["sensor"][0]["name"] == "b"
+    assert third["api"]["password"] == "hunter2"
+
+
+def test_parse_cache_env_var(tmp_path, monkeypatch):
+    """A file reading an environment variable is parsed again when it changes."""
+    (tmp_path / "main.yaml").write_text("esphome:\n  name: !env_var DEVNAME\n")
+    main = str(tmp_path / "main.yaml")
+    cache = yaml_util.YAMLParseCache()
+
+    monkeypatch.setenv("DEVNAME", "first")
+    with yaml_util.use_parse_cache(cache):
+        assert yaml_util.load_yaml(main)["esphome"]["name"] == "first"
+    monkeypatch.setenv("DEVNAME", "second")
+    with yaml_util.use_parse_cache(cache):
+        assert yaml_util.load_yaml(main)["esphome"]["name"] == "second"
+    assert cache.misses == 2
+    with yaml_util.use_parse_cache(cache):
+        assert yaml_util.load_yaml(main)["esphome"]["name"] == "second"
+    assert cache.misses == 2
+
+
+def test_parse_cache_include_dir(tmp_path):
+    """Adding a file to an included directory parses the including file again."""
+    (tmp_path / "sensors").mkdir()
+    (tmp_path / "sensors" / "a.yaml").write_text("- platform: template\n")
+    (tmp_path / "main.yaml").write_text("sensor: !include_dir_merge_list sensors\n")
+    main = str(tmp_path / "main.yaml")
+    cache = yaml_util.YAMLParseCache()
+
+    with yaml_util.use_parse_cache(cache):
+        assert len(yaml_util.load_yaml(main)["sensor"]) == 1
+    (tmp_path / "sensors" / "b.yaml").write_text("- platform: template\n")
+    with yaml_util.use_parse_cache(cache):
+        assert len(yaml_util.load_yaml(main)["sensor"]) == 2
+    # Only the new file and the including file are parsed
+    assert cache.hits == 1
+    assert cache.misses == 4
+
+
+def test_load_once_per_load(tmp_path, caplog):
+    """Files included many times are parsed once per load and stay isolated."""
+    (tmp_path / "secrets.yaml").write_text("password: hunter2\nssid: home\n")
+    (tmp_path / "sensor.yaml").write_text("platform: template\nname: ${name}\n")
+    (tmp_path / "empty.yaml").write_text("")
+    (tmp_path / "main.yaml").write_text(
+        "api:\n"
+        "  password: !secret password\n"
+        "wifi:\n"
+        "  ssid: !secret ssid\n"
+        "sensor:\n"
+        "  - !include {file: sensor.yaml, vars: {name: a}}\n"
+        "  - !include {file: sensor.yaml, vars: {name: b}}\n"
+        "  - !include sensor.yaml\n"
+        "empty:\n"
+        "  - !include empty.yaml\n"
+        "  - !include empty.yaml\n"
+    )
+    main = str(tmp_path / "main.yaml")
+
+    with caplog.at_level(logging.DEBUG, logger=yaml_util.__name__):
+        config = yaml_util.load_yaml(main)
+
+    assert [sensor["name"] for sensor in config["sensor"]] == ["a", "b", "${name}"]
+    assert config["wifi"]["ssid"] == "home"
+    assert config["empty"] == [{}, {}]
+    assert config["empty"][0] is not config["empty"][1]
+    # main.yaml, secrets.yaml, sensor.yaml and empty.yaml are parsed once
+    assert f"Loaded {main}, 4 of 8 files were parsed" in caplog.text
+
+    # Every load parses the files again
+    (tmp_path / "sensor.yaml").write_text("platform: template\nname: c\n")
+    assert yaml_util.load_yaml(main)["sensor"][2]["name"] == "c"
+
+
+def test_yaml_cache(tmp_path, monkeypatch):
+    """Parsed files are kept on disk until a file they depend on changes."""
+    monkeypatch.setenv(yaml_util.ENV_YAML_CACHE, "1")
+    monkeypatch.setenv("SENSOR_NAME", "env")
+    (tmp_path / "secrets.yaml").write_text("password: hunter2\n")
+    (tmp_path / "packages").mkdir()
+    (tmp_path / "packages" / "sensors.yaml").write_text(
+        "sensor:\n"
+        "  - platform: template\n"
+        "    name: !env_var SENSOR_NAME\n"
+        "    lambda: !lambda return 1;\n"
+    )
+    (tmp_path / "binary_sensors").mkdir()
+    (tmp_path / "binary_sensors" / "a.yaml").write_text("- platform: template\n")
+    (tmp_path / "main.yaml").write_text(
+        "packages:\n"
+        "  sensors: !include packages/sensors.yaml\n"
+        "binary_sensor: !include_dir_merge_list binary_sensors\n"
+        "api:\n"
+        "  password: !secret password\n"
+    )
+    main = str(tmp_path / "main.yaml")
+    monkeypatch.setattr(yaml_util.CORE, "config_path", main)
+    parsed = []
+    load_yaml_stream = yaml_util._load_yaml_stream
+
+    def _load_yaml_stream(fname, stream):
+        parsed.append(os.path.relpath(fname, tmp_path))
+        return load_yaml_stream(fname, stream)
+
+    monkeypatch.setattr(yaml_util, "_load_yaml_stream", _load_yaml_stream)
+
+    first = yaml_util.load_yaml(main)
+    assert len(parsed) == 4
+    (cache_file,) = (tmp_path / ".esphome" / yaml_util.YAML_CACHE_DIR).iterdir()
+    assert cache_file.stat().st_mode & 0o777 == 0o600
+    # The files holding secrets are parsed by every load
+    assert b"hunter2" not in cache_file.read_bytes()
+
+    parsed.clear()
+    yaml_util._SECRET_VALUES.clear()
+    second = yaml_util.load_yaml(main)
+    assert sorted(parsed) == ["main.yaml", "secrets.yaml"]
+    assert second["binary_sensor"] == first["binary_sensor"]
+    package = second["packages"]["sensors"]
+    sensor = package["sensor"][0]
+    assert sensor["name"] == "env"
+    assert isinstance(sensor["lambda"], Lambda)
+    assert sensor["lambda"].esp_range.start_mark.line == 3
+    assert str(sensor.esp_range.start_mark.document).endswith("sensors.yaml")
+    assert second["api"]["password"] == "hunter2"
+    assert yaml_util.is_secret("hunter2") == "password"
+
+    def load_changed(path, text):
+        parsed.clear()
+        path.write_text(text)
+        return yaml_util.load_yaml(main)
+
+    config = load_changed(tmp_path / "secrets.yaml", "password: changed\n")
+    assert config["api"]["password"] == "changed"
+    assert sorted(parsed) == ["main.yaml", "secrets.yaml"]
+
+    config = load_changed(
+        tmp_path / "binary_sensors" / "b.yaml", "- platform: template\n"
+    )
+    assert len(config["binary_sensor"]) == 2
+    assert sorted(parsed) == [
+        os.path.join("binary_sensors", "b.yaml"),
+        "main.yaml",
+        "secrets.yaml",
+    ]
+
+    parsed.clear()
+    monkeypatch.setenv("SENSOR_NAME", "changed")
+    config = yaml_util.load_yaml(main)
+    assert config["packages"]["sensors"]["sensor"][0]["name"] == "changed"
+    assert sorted(parsed) == [
+        "main.yaml",
+        os.path.join("packages", "sensors.yaml"),
+        "secrets.yaml",
+    ]
+
+    # A different ESPHome version does not use the cache
+    parsed.clear()
+    monkeypatch.setattr(yaml_util, "__version__", "0.0.0")
+    yaml_util.load_yaml(main)
+    assert len(parsed) == 5
+
+
+class _RunCode:
+    def __reduce__(self):
+        return os.remove, (self.path,)
+
+
+def test_yaml_cache_untrusted(tmp_path, monkeypatch):
+    """A cache that could have been modified never runs code."""
+    monkeypatch.setenv(yaml_util.ENV_YAML_CACHE, "1")
+    (tmp_path / "main.yaml").write_text("esphome:\n  name: test\n")
+    main = str(tmp_path / "main.yaml")
+    monkeypatch.setattr(yaml_util.CORE, "config_path", main)
+    cache_path = yaml_util._yaml_cache_path(main)
+    yaml_util.load_yaml(main)
+
+    canary = tmp_path / "canary"
+    canary.write_text("")
+    payload = _RunCode()
+    payload.path = str(canary)
+    with open(cache_path, "wb") as f_handle:
+        pickle.dump((yaml_util._yaml_cache_header(), payload), f_handle)
+    os.chmod(cache_path, 0o600)
+    assert yaml_util.load_yaml(main) == {"esphome": {"name": "test"}}
+    assert canary.exists()
+
+    # Files other users can write are not read at all
+    os.chmod(cache_path, 0o666)
+    with patch.object(yaml_util, "_YAMLCacheUnpickler") as unpickler:
+        assert yaml_util.load_yaml(main) == {"esphome": {"name": "test"}}
+    unpickler.assert_not_called()
+
+
+def test_provenance_table(tmp_path, monkeypatch):
+    (tmp_path / "secrets.yaml").write_text("password: hunter2\n")
+    (tmp_path / "sensor.yaml").write_text(
+        "platform: template\nlambda: |-\n  return 1;\n"
+    )
+    (tmp_path / "main.yaml").write_text(
+        "wifi:\n"
+        "  password: !secret password\n"
+        "sensor:\n"
+        "  - !include sensor.yaml\n"
+        "  - !include sensor.yaml\n"
+        "  - platform: template\n"
+        "    lambda: !lambda return 2;\n"
+        "    accuracy_decimals: 2\n"
+    )
+    main = str(tmp_path / "main.yaml")
+    monkeypatch.setattr(yaml_util.CORE, "config_path", main)
+    monkeypatch.setattr(yaml_util, "_PROVENANCE", None)
+    monkeypatch.setenv(yaml_util.ENV_YAML_PROVENANCE_TABLE, "1")
+
+    def line(value):
+        doc_range = yaml_util.get_document_range(value)
+        return (
+            os.path.basename(doc_range.start_mark.document),
+            doc_range.start_mark.line,
+        )
+
+    cache = yaml_util.YAMLParseCache()
+    for _ in range(2):
+        table = yaml_util.reset_provenance()
+        with yaml_util.use_parse_cache(cache):
+            config = yaml_util.load_yaml(main)
+        assert len(table) > 0
+
+        sensors = config["sensor"]
+        assert type(config) is yaml_util.OrderedDict
+        assert type(sensors) is list
+        assert type(config["wifi"]["password"]) is str
+        assert sensors[0] is not sensors[1]
+        assert line(sensors[1]) == ("main.yaml", 4)
+        assert line(sensors[1]["lambda"]) == ("sensor.yaml", 1)
+        assert yaml_util.get_content_offset(sensors[1]["lambda"]) == 1
+        assert line(sensors[2]["lambda"]) == ("main.yaml", 6)
+        key = next(key for key in sensors[2] if key == "accuracy_decimals")
+        assert line(key) == ("main.yaml", 7)
+        # Numbers are not recorded
+        assert yaml_util.get_document_range(sensors[2]["accuracy_decimals"]) is None
+        assert yaml_util.is_secret("hunter2") == "password"
+        assert "password: !secret 'password'" in yaml_util.dump(config)
+        # Derived values keep the range of the value they were made from
+        copied = yaml_util.make_data_base(
+            Lambda(sensors[0]["lambda"]), sensors[0]["lambda"]
+        )
+        assert line(copied) == ("sensor.yaml", 1)
+        assert yaml_util.get_content_offset(copied) == 1
+    assert cache.hits > 0
+
+    restored = pickle.loads(pickle.dumps((sensors, table)))
+    monkeypatch.setattr(yaml_util, "_PROVENANCE", restored[1])
+    assert line(restored[0][2]["lambda"]) == ("main.yaml", 6)
+
+
+def test_dump(monkeypatch):
+    def reference(data):
+        return yaml.dump(
+            data,
+            default_flow_style=False,
+            allow_unicode=True,
+            Dumper=yaml_util.ESPHomeDumper,
+        )
+
+    monkeypatch.setitem(yaml_util._SECRET_VALUES, "hunter2", "password")
+    config = {
+        "wifi": {
+            "ssid": "my network",
+            "password": yaml_util.make_data_base("hunter2"),
+        },
+        "sensor": [
+            {
+                "platform": "template",
+                "name": "Temperature: 'inside'",
+                "lambda": Lambda("return 1;"),
+                "filters": [{"multiply": 1.5}, {"offset": -2}],
+            },
+            {"platform": "template", "id": ID("sensor_2"), "update_interval": None},
+        ],
+        "text_sensor": [{"platform": "version", "name": "123", "unit": "°C"}],
+    }
+    assert yaml_util.dump(config) == reference(config)
+    assert "password: !secret 'password'" in yaml_util.dump(config)
+    assert "hunter2" in yaml_util.dump(config, show_secrets=True)
+    # Without a provenance table only the loaded secrets are hidden
+    monkeypatch.setitem(yaml_util._SECRET_VALUES, "hunter2", "password")
+    assert yaml_util.dump({"password": "hunter2"}) == "password: hunter2\n"
+
+    # Emitted by PyYAML
+    for value in ("tab\there", "end \n", "\n", "", Lambda("a\n\n"), Lambda("a ")):
+        data = {"key": [value], "": 1}
+        assert yaml_util.dump(data) == reference(data)
+        data = {"key": value}
+        assert yaml_util.dump(data) == reference(data)
+    assert yaml_util.dump("plain") == reference("plain")